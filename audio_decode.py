@@ -0,0 +1,227 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Whisper and Pyannote both expect 16kHz mono audio
+SAMPLE_RATE = 16000
+
+# Format pygame playback uses (matches pygame.mixer.init in main.py)
+PLAYBACK_SAMPLE_RATE = 44100
+PLAYBACK_CHANNELS = 2
+
+# How many decoded files to keep (16kHz mono float32 is ~230 MB per hour of audio)
+DEFAULT_MAX_ENTRIES = 2
+
+# Read size for the ffmpeg stdout pipe
+PIPE_CHUNK_BYTES = 1 << 20
+
+
+def no_window_flags():
+    """creationflags for ffmpeg/ffprobe subprocesses: no console window pops up on Windows."""
+    return subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+
+def decode_pcm(video_path, sample_rate=SAMPLE_RATE, playback_wav=None):
+    """
+    Decodes the audio track of a media file to mono float32 PCM in memory.
+    ffmpeg writes raw samples to a pipe and we collect them in a single bytearray,
+    which NumPy then wraps directly (no extra copy, and the array stays writable
+    so torch.from_numpy can share it too).
+    If playback_wav is given, the same ffmpeg run also writes a 44.1kHz stereo
+    16-bit WAV there, so the source is only demuxed and decoded once.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-y",
+        "-i", video_path,
+        "-vn",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-f", "f32le",
+        "-acodec", "pcm_f32le",
+        "pipe:1",
+    ]
+    if playback_wav:
+        # Second output from the same decode
+        cmd += [
+            "-vn",
+            "-acodec", "pcm_s16le",
+            "-ar", str(PLAYBACK_SAMPLE_RATE),
+            "-ac", str(PLAYBACK_CHANNELS),
+            playback_wav,
+        ]
+
+    print(f"Decoding audio from {video_path} (in memory)...")
+    # stderr goes to a temp file so a chatty ffmpeg can never block on a full pipe
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err,
+                                creationflags=no_window_flags())
+        buf = bytearray()
+        while True:
+            chunk = proc.stdout.read(PIPE_CHUNK_BYTES)
+            if not chunk:
+                break
+            buf += chunk
+        proc.stdout.close()
+        returncode = proc.wait()
+
+        if returncode != 0:
+            err.seek(0)
+            message = err.read().decode(errors="replace")
+            print("FFmpeg error:", message)
+            raise RuntimeError(f"ffmpeg failed to decode audio from {video_path}")
+
+    # Drop a trailing partial sample (should not happen, but keeps frombuffer happy)
+    usable = len(buf) - (len(buf) % 4)
+    return np.frombuffer(memoryview(buf)[:usable], dtype=np.float32)
+
+
+def file_identity(path):
+    """Identity of a file on disk: (absolute path, size, mtime). Changes if the file is replaced."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return (path, st.st_size, st.st_mtime_ns)
+
+
+def playback_wav_path(video_path):
+    """Temp WAV path used for pygame playback of a given video."""
+    # Use unique name for each video to prevent conflicts
+    hash_name = hashlib.md5(video_path.encode()).hexdigest()[:8]
+    return os.path.join(tempfile.gettempdir(), f"video_audio_{hash_name}.wav")
+
+
+class DecodedAudio:
+    """Result of one decode: 16kHz mono PCM for the models and an optional playback WAV."""
+
+    def __init__(self, key, pcm=None, playback_wav=None):
+        self.key = key
+        self.pcm = pcm
+        self.playback_wav = playback_wav
+        self.error = None
+        self.ready = threading.Event()
+
+    @property
+    def duration(self):
+        return len(self.pcm) / SAMPLE_RATE if self.pcm is not None else 0.0
+
+
+class AudioDecodeCache:
+    """
+    Shares decoded audio between the video player and the transcriber
+    (the player only uses it with the AUDIO_PLAYBACK=wav backend, see audio_playback.py).
+    Entries are keyed by file identity, so the player and a transcription job asking
+    for the same file get the result of a single ffmpeg run. Callers that arrive while
+    a decode is running wait for it instead of starting their own.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # identity -> DecodedAudio
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, video_path, playback=False):
+        """
+        Returns a DecodedAudio for video_path, decoding it if needed.
+        playback=True also makes sure the 44.1kHz stereo WAV exists.
+        """
+        key = file_identity(video_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = False
+            if entry is None or (playback and entry.ready.is_set() and not entry.playback_wav):
+                # Either never decoded, or decoded without a playback WAV; do a (single) decode now
+                entry = DecodedAudio(key)
+                self._entries[key] = entry
+                owner = True
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._entries.move_to_end(key)
+            evicted = self._pop_over_limit()
+
+        for old in evicted:
+            self._remove_files(old)
+
+        if owner:
+            try:
+                wav = playback_wav_path(video_path) if playback else None
+                entry.pcm = decode_pcm(video_path, SAMPLE_RATE, playback_wav=wav)
+                entry.playback_wav = wav
+            except Exception as e:
+                entry.error = e
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            raise entry.error
+        if playback and not entry.playback_wav:
+            # We waited on a decode that was started without playback output
+            return self.get(video_path, playback=True)
+        return entry
+
+    def discard(self, video_path):
+        """Drop any cached decode of video_path and delete its playback WAV."""
+        with self._lock:
+            doomed = [k for k in self._entries if k[0] == os.path.abspath(video_path)]
+            entries = [self._entries.pop(k) for k in doomed]
+        for entry in entries:
+            self._remove_files(entry)
+
+    def release(self, video_path):
+        """
+        A transcription is done with the PCM of video_path: drop it unless a player using the
+        WAV backend holds the entry (it has a playback WAV, and the player discards it on close).
+        Streamed playback never reads the cache, so otherwise the buffer would just stay
+        resident (~230 MB per hour of audio) until evicted.
+        """
+        path = os.path.abspath(video_path)
+        with self._lock:
+            for key in [k for k, entry in self._entries.items()
+                        if k[0] == path and entry.ready.is_set() and not entry.playback_wav]:
+                del self._entries[key]
+
+    def _pop_over_limit(self):
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            _, entry = self._entries.popitem(last=False)
+            evicted.append(entry)
+        return evicted
+
+    def _remove_files(self, entry):
+        if entry.playback_wav and os.path.exists(entry.playback_wav):
+            try:
+                os.remove(entry.playback_wav)
+            except OSError:
+                pass  # Still open by the mixer (Windows); it is overwritten on next decode
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_audio_cache():
+    """Returns the process-wide audio decode cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AudioDecodeCache()
+        return _default_cache
+
+
+def to_waveform_dict(audio, sample_rate=SAMPLE_RATE):
+    """Wraps a mono float32 buffer in the {'waveform', 'sample_rate'} dict Pyannote accepts."""
+    import torch
+    waveform = torch.from_numpy(audio).unsqueeze(0)  # (channel, time), shares memory
+    return {"waveform": waveform, "sample_rate": sample_rate}
@@ -0,0 +1,284 @@
+import os
+import queue
+import subprocess
+import threading
+import time
+
+import pygame
+
+from audio_decode import PLAYBACK_SAMPLE_RATE, PLAYBACK_CHANNELS, no_window_flags
+
+# Size of one decoded chunk handed to the mixer (small first chunk = playback starts fast)
+CHUNK_SECONDS = 0.25
+
+# Decoded chunks buffered ahead of the mixer (bounded: memory stays at a few hundred KB)
+QUEUE_CHUNKS = 16
+
+# Mixer channel reserved for the player (sound effects can't steal it)
+PLAYER_CHANNEL = 0
+
+# Feeder poll interval; a chunk is always queued behind the playing one, so this only has
+# to be shorter than CHUNK_SECONDS
+FEED_INTERVAL = 0.02
+
+_BYTES_PER_SECOND = PLAYBACK_SAMPLE_RATE * PLAYBACK_CHANNELS * 2  # s16le
+
+
+def playback_backend():
+    """
+    'stream' (default) or 'wav' (decode the whole track to a temp WAV first).
+    Only 'wav' goes through the shared decode cache: with it, opening a file also decodes
+    the 16kHz PCM a later transcription of that file reuses. Streaming decodes just the
+    played range (again on every play/seek), so a transcription does its own full decode.
+    That costs one extra decode per transcribed file but no wait and no temp WAV
+    (~600 MB per hour) when a file is opened.
+    """
+    return os.getenv("AUDIO_PLAYBACK", "stream")
+
+
+def open_audio(video_path):
+    """Playback audio for a video with the configured backend (the WAV backend blocks while decoding)."""
+    if playback_backend() == "wav":
+        return WavFileAudio(video_path)
+    return StreamedAudio(video_path)
+
+
+class StreamedAudio:
+    """
+    Plays a file's audio without extracting it first: ffmpeg decodes from the requested
+    offset into a pipe, a reader thread cuts the PCM into small chunks in a bounded queue,
+    and a feeder thread keeps one chunk queued behind the playing one on a mixer Channel.
+    Seeking restarts ffmpeg at the new offset (-ss before -i is a fast input seek), so
+    playback starts within a fraction of a second anywhere in a long file and nothing is
+    written to disk.
+    position() counts the samples actually played, so it is the clock video syncs to.
+    """
+
+    def __init__(self, video_path):
+        self.video_path = video_path
+        self.volume = 1.0
+        self._lock = threading.Lock()
+        self._session = None  # the running _StreamSession (one per play)
+        if pygame.mixer.get_num_channels() <= PLAYER_CHANNEL:
+            pygame.mixer.set_num_channels(PLAYER_CHANNEL + 1)
+        pygame.mixer.set_reserved(PLAYER_CHANNEL + 1)
+        self._channel = pygame.mixer.Channel(PLAYER_CHANNEL)
+
+    def play(self, start_secs):
+        self.stop()
+        session = _StreamSession(self.video_path, start_secs, self._channel, self.volume)
+        with self._lock:
+            self._session = session
+        session.start()
+
+    def pause(self):
+        # Resuming goes through play(offset), so pausing is just stopping the decode
+        self.stop()
+
+    def stop(self):
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.stop()
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self._channel.set_volume(volume)
+
+    def position(self):
+        """Seconds into the file that are audible now, or None if nothing is playing."""
+        with self._lock:
+            session = self._session
+        return session.position() if session is not None else None
+
+    def close(self):
+        self.stop()
+
+
+class _StreamSession:
+    """One ffmpeg decode + feed from a start offset until stopped or the track ends."""
+
+    def __init__(self, video_path, start_secs, channel, volume):
+        self.video_path = video_path
+        self.start_secs = max(0.0, start_secs)
+        self.channel = channel
+        self.volume = volume
+        self.chunks = queue.Queue(maxsize=QUEUE_CHUNKS)
+        self.stopped = threading.Event()
+        self.proc = None
+
+        # Playback clock: seconds of audio fully played, plus the chunk playing now
+        self._clock_lock = threading.Lock()
+        self._played = 0.0
+        self._current = None   # (length seconds, perf_counter when it started)
+        self._queued = None    # length of the chunk queued behind it
+
+    def start(self):
+        cmd = [
+            "ffmpeg", "-nostdin", "-v", "error",
+            "-ss", f"{self.start_secs:.3f}",
+            "-i", self.video_path,
+            "-vn", "-sn",
+            "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ar", str(PLAYBACK_SAMPLE_RATE), "-ac", str(PLAYBACK_CHANNELS),
+            "pipe:1",
+        ]
+        try:
+            self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                         creationflags=no_window_flags())
+        except OSError as e:
+            # No audio then; position() stays None and the player runs on its wall clock
+            print(f"Cannot start audio stream for {self.video_path}: {e}")
+            self.stopped.set()
+            return
+        threading.Thread(target=self._read, name="audio-reader", daemon=True).start()
+        threading.Thread(target=self._feed, name="audio-feeder", daemon=True).start()
+
+    def stop(self):
+        # Under the clock lock so the feeder can't start a chunk after this
+        with self._clock_lock:
+            self.stopped.set()
+            try:
+                self.channel.stop()
+            except pygame.error:
+                pass  # Mixer already shut down
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+
+    def position(self):
+        with self._clock_lock:
+            if self._current is None:
+                return None
+            length, started = self._current
+            return self.start_secs + self._played + min(time.perf_counter() - started, length)
+
+    def _read(self):
+        """ffmpeg stdout -> chunk queue (blocks when the queue is full, which throttles ffmpeg)."""
+        chunk_bytes = int(CHUNK_SECONDS * _BYTES_PER_SECOND) // 4 * 4
+        try:
+            while not self.stopped.is_set():
+                data = self.proc.stdout.read(chunk_bytes)
+                if len(data) < 4:
+                    break
+                data = data[:len(data) // 4 * 4]  # whole stereo frames only
+                while not self.stopped.is_set():
+                    try:
+                        self.chunks.put(data, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+        except (OSError, ValueError):
+            pass  # Pipe closed by stop()
+        finally:
+            self._put_end()
+            self.proc.stdout.close()
+            self.proc.wait()
+
+    def _put_end(self):
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(None, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _feed(self):
+        """Keeps a chunk queued behind the playing one and advances the playback clock."""
+        ended = False
+        try:
+            while not self.stopped.is_set():
+                busy = self.channel.get_busy()
+                with self._clock_lock:
+                    if self._current is not None:
+                        length, started = self._current
+                        if self._queued is not None and self.channel.get_queue() is None:
+                            # The queued chunk took over (exactly when the previous one ended)
+                            self._played += length
+                            self._current = (self._queued, started + length)
+                            self._queued = None
+                        elif not busy:
+                            # Underrun or end of track: the playing chunk finished, nothing behind it
+                            self._played += length
+                            self._current = None
+
+                if ended and not busy:
+                    return
+
+                if not ended and self._queued is None:
+                    try:
+                        data = self.chunks.get(timeout=FEED_INTERVAL)
+                    except queue.Empty:
+                        continue
+                    if data is None:
+                        ended = True
+                        continue
+                    sound = pygame.mixer.Sound(buffer=data)
+                    length = len(data) / _BYTES_PER_SECOND
+                    with self._clock_lock:
+                        if self.stopped.is_set():
+                            return
+                        if self._current is None:
+                            self.channel.play(sound)
+                            self.channel.set_volume(self.volume)
+                            self._current = (length, time.perf_counter())
+                        else:
+                            self.channel.queue(sound)
+                            self._queued = length
+                    continue
+
+                time.sleep(FEED_INTERVAL)
+        except pygame.error as e:
+            print(f"Audio stream stopped: {e}")
+        finally:
+            with self._clock_lock:
+                self._current = None
+
+
+class WavFileAudio:
+    """
+    Previous backend: the whole track is decoded to a 44.1kHz stereo WAV in the temp dir
+    (through the shared audio decode cache) and played with pygame.mixer.music.
+    """
+
+    def __init__(self, video_path):
+        from audio_decode import get_audio_cache
+        self.video_path = video_path
+        self.volume = 1.0
+        self._start_secs = 0.0
+        self.audio_file = get_audio_cache().get(video_path, playback=True).playback_wav
+        if not self.audio_file or not os.path.exists(self.audio_file):
+            raise RuntimeError("no playback file produced")
+        pygame.mixer.music.load(self.audio_file)
+
+    def play(self, start_secs):
+        pygame.mixer.music.play(start=start_secs)
+        pygame.mixer.music.set_volume(self.volume)
+        # get_pos() resets to 0 on play()
+        self._start_secs = start_secs
+
+    def pause(self):
+        pygame.mixer.music.pause()
+
+    def stop(self):
+        pygame.mixer.music.stop()
+
+    def set_volume(self, volume):
+        self.volume = volume
+        pygame.mixer.music.set_volume(volume)
+
+    def position(self):
+        if not pygame.mixer.music.get_busy():
+            return None
+        # get_pos() returns ms played since last play()
+        audio_pos_ms = pygame.mixer.music.get_pos()
+        if audio_pos_ms < 0:
+            return None
+        return self._start_secs + audio_pos_ms / 1000.0
+
+    def close(self):
+        try:
+            pygame.mixer.music.stop()
+            pygame.mixer.music.unload()
+        finally:
+            from audio_decode import get_audio_cache
+            get_audio_cache().discard(self.video_path)
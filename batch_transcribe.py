@@ -0,0 +1,214 @@
+"""
+Headless batch transcription (no GUI).
+
+Examples:
+    python batch_transcribe.py D:\\Recordings --jobs 2 -o D:\\Transcripts
+    python batch_transcribe.py "D:\\Recordings\\*.mp4" --formats json,srt --num-speakers 3
+    python batch_transcribe.py D:\\Archive --formats json,vtt,jsonl
+
+Files whose JSON output already exists (for the same media and settings) are skipped,
+so an interrupted overnight batch can simply be re-run.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".m4v", ".webm", ".wav", ".mp3", ".m4a", ".flac")
+
+_print_lock = threading.Lock()
+
+
+def log(msg):
+    with _print_lock:
+        print(msg, flush=True)
+
+
+def collect_inputs(patterns, recursive=False):
+    """Expands directories and glob patterns into a sorted, de-duplicated list of media files."""
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            if recursive:
+                for root, _, files in os.walk(pattern):
+                    found.extend(os.path.join(root, f) for f in files)
+            else:
+                found.extend(os.path.join(pattern, f) for f in os.listdir(pattern))
+        elif os.path.isfile(pattern):
+            found.append(pattern)
+        else:
+            found.extend(glob.glob(pattern, recursive=recursive))
+
+    videos = {os.path.abspath(p) for p in found
+              if os.path.isfile(p) and p.lower().endswith(VIDEO_EXTENSIONS)}
+    return sorted(videos)
+
+
+def media_duration(path):
+    """Duration in seconds from ffprobe (0 if unknown)."""
+    import ffmpeg
+    try:
+        return float(ffmpeg.probe(path)["format"]["duration"])
+    except Exception:
+        return 0.0
+
+
+def output_base(video_path, output_dir):
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(output_dir or os.path.dirname(video_path), name)
+
+
+def is_done(json_path, cache_key):
+    """True if a previous run already wrote output for this exact media + settings."""
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)["meta"].get("cache_key") == cache_key
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def process_one(video_path, args):
+    """Transcribes one file and writes its outputs. Returns a timing record."""
+    from audio_decode import get_audio_cache
+    from export_utils import export_to_json, export_transcript, get_exporter
+    from result_cache import make_cache_key, media_fingerprint
+    from transcribe import VideoTranscriber
+
+    record = {"file": video_path, "status": "ok", "media_seconds": media_duration(video_path),
+              "wall_seconds": 0.0}
+    base = output_base(video_path, args.output_dir)
+    json_path = base + ".json"
+
+    # Models are shared through the registry, so this is cheap after the first file
+    transcriber = VideoTranscriber(model_size=args.model, use_cuda=not args.cpu,
+                                   beam_size=args.beam_size, num_workers=args.jobs,
+                                   cpu_shards=args.shards, word_timestamps=args.word_timestamps)
+    cache_key = make_cache_key(media_fingerprint(video_path), transcriber.cache_config(args.num_speakers))
+
+    if not args.force and is_done(json_path, cache_key):
+        record["status"] = "skipped"
+        log(f"[SKIP] {os.path.basename(video_path)} (already done)")
+        return record
+
+    log(f"[START] {os.path.basename(video_path)}")
+    started = time.perf_counter()
+    try:
+        segments = transcriber.process_video(video_path, num_speakers=args.num_speakers,
+                                             use_cache=not args.no_cache)
+    finally:
+        # Headless runs never reuse the decode for playback, so free it right away
+        get_audio_cache().discard(video_path)
+    record["wall_seconds"] = time.perf_counter() - started
+
+    os.makedirs(os.path.dirname(base) or ".", exist_ok=True)
+    # Registered exporters (srt, vtt, jsonl, pdf) stream the segments to disk
+    for fmt in sorted(args.formats - {"json"}):
+        export_transcript(fmt, base + get_exporter(fmt).extension, segments)
+    if transcriber.last_run_stats.get("diarization_failed"):
+        # No JSON, so the next run of the batch retries this file
+        record["status"] = "partial"
+        log(f"[PARTIAL] {os.path.basename(video_path)}: diarization failed, written without speakers")
+        return record
+    # JSON is written last: its presence marks the file as done for resume
+    export_to_json(json_path, segments, meta={
+        "source": video_path,
+        "cache_key": cache_key,
+        "duration": record["media_seconds"],
+        "config": transcriber.cache_config(args.num_speakers),
+    })
+
+    rtf = record["wall_seconds"] / record["media_seconds"] if record["media_seconds"] else 0
+    log(f"[DONE] {os.path.basename(video_path)}: {len(segments)} segments, "
+        f"{record['wall_seconds']:.1f}s wall, RTF {rtf:.3f}")
+    return record
+
+
+def print_summary(records, wall_seconds):
+    """Per-file timing table plus aggregate throughput."""
+    print("\n" + "=" * 78)
+    print(f"{'File':<40} {'Status':<8} {'Media':>9} {'Wall':>9} {'RTF':>7}")
+    print("-" * 78)
+    for r in records:
+        name = os.path.basename(r["file"])
+        if len(name) > 39:
+            name = name[:36] + "..."
+        rtf = f"{r['wall_seconds'] / r['media_seconds']:.3f}" if r["media_seconds"] and r["wall_seconds"] else "-"
+        print(f"{name:<40} {r['status']:<8} {r['media_seconds']:>8.0f}s {r['wall_seconds']:>8.1f}s {rtf:>7}")
+    print("-" * 78)
+
+    processed = [r for r in records if r["status"] in ("ok", "partial")]
+    media_hours = sum(r["media_seconds"] for r in processed) / 3600
+    wall_hours = wall_seconds / 3600
+    throughput = media_hours / wall_hours if wall_hours > 0 else 0
+    failed = sum(1 for r in records if r["status"] == "failed")
+    skipped = sum(1 for r in records if r["status"] == "skipped")
+    partial = sum(1 for r in records if r["status"] == "partial")
+    print(f"Processed {len(processed)} files ({skipped} skipped, {failed} failed, {partial} without speakers)")
+    print(f"Media: {media_hours:.2f} h | Wall: {wall_hours:.2f} h | "
+          f"Throughput: {throughput:.2f} media-hours per wall-hour")
+    print("=" * 78)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe videos without the GUI.")
+    parser.add_argument("inputs", nargs="+", help="Video files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="Where to write outputs (default: next to each video)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Files processed in parallel")
+    parser.add_argument("--formats", default="json,srt",
+                        help="Comma-separated output formats (json plus any of: srt, vtt, jsonl, pdf)")
+    parser.add_argument("--model", default="medium", help="Whisper model size")
+    parser.add_argument("--beam-size", type=int, default=5)
+    parser.add_argument("--num-speakers", type=int, default=None, help="Speaker count hint")
+    parser.add_argument("--cpu", action="store_true", help="Do not use CUDA")
+    parser.add_argument("--shards", default="1",
+                        help="CPU only: worker processes per file for long recordings (number or 'auto')")
+    parser.add_argument("--word-timestamps", action="store_true",
+                        help="Attribute speakers per word and split segments at speaker changes")
+    parser.add_argument("--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("--force", action="store_true", help="Re-process files that already have output")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the transcript result cache")
+    args = parser.parse_args(argv)
+    args.formats = {f.strip().lower() for f in args.formats.split(",") if f.strip()}
+    from export_utils import EXPORTERS
+    unknown = args.formats - set(EXPORTERS) - {"json"}
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    args.jobs = max(1, args.jobs)
+    if args.shards != "auto":
+        args.shards = max(1, int(args.shards))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    videos = collect_inputs(args.inputs, recursive=args.recursive)
+    if not videos:
+        print("No video files found.")
+        return 1
+
+    print(f"Found {len(videos)} files, running {args.jobs} at a time.")
+    started = time.perf_counter()
+    records = []
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(process_one, path, args): path for path in videos}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                records.append(future.result())
+            except Exception as e:
+                log(f"[FAILED] {os.path.basename(path)}: {e}")
+                records.append({"file": path, "status": "failed", "media_seconds": 0.0, "wall_seconds": 0.0})
+
+    records.sort(key=lambda r: r["file"])
+    print_summary(records, time.perf_counter() - started)
+    return 1 if any(r["status"] in ("failed", "partial") for r in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
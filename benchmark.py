@@ -0,0 +1,527 @@
+"""
+Benchmarks for the transcript hot paths, using synthetic transcripts and stub models.
+
+    python benchmark.py                              # run, save bench_results.json
+    python benchmark.py --sizes 1000,10000           # pick transcript sizes
+    python benchmark.py --baseline old.json          # compare, exit 1 on regression
+    python benchmark.py --only speaker_mapping,pdf   # subset of cases
+
+No Whisper/Pyannote models are loaded. GUI cases use a real Tk Text widget when a
+display is available, otherwise a small stand-in that mimics the Text API.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from segment_store import SegmentStore
+
+DEFAULT_SIZES = [1000, 10000, 50000, 200000]
+DEFAULT_OUTPUT = "bench_results.json"
+
+WORDS = ("the quick brown fox jumps over a lazy dog while we discuss budget numbers for "
+         "next quarter and plan the rollout schedule with the team").split()
+
+
+# ----- Synthetic data -----
+
+def make_transcript(n, n_speakers=4, seed=0):
+    """n Whisper-like segments: 1-8s long, small gaps, 3-25 words each."""
+    rng = random.Random(seed)
+    t = 0.0
+    segments = []
+    for _ in range(n):
+        duration = rng.uniform(1.0, 8.0)
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 25)))
+        segments.append({
+            "start": round(t, 3),
+            "end": round(t + duration, 3),
+            "text": text,
+            "speaker": f"SPEAKER_{rng.randrange(n_speakers):02d}",
+        })
+        t += duration + rng.uniform(0.0, 1.5)
+    return segments
+
+
+def add_words(segments):
+    """Whisper-like word timestamps: each segment's words spread evenly over its duration."""
+    for seg in segments:
+        tokens = seg["text"].split()
+        step = (seg["end"] - seg["start"]) / len(tokens)
+        seg["words"] = [
+            {"start": seg["start"] + i * step, "end": seg["start"] + (i + 0.9) * step, "word": " " + tok}
+            for i, tok in enumerate(tokens)
+        ]
+    return segments
+
+
+def make_turns(segments, n_speakers=4, seed=1):
+    """Pyannote-like speaker turns covering the same time span, with some overlap."""
+    rng = random.Random(seed)
+    end_time = segments[-1]["end"] if segments else 0.0
+    turns = []
+    t = 0.0
+    while t < end_time:
+        duration = rng.uniform(0.5, 12.0)
+        turns.append({"start": t, "end": t + duration, "speaker": f"SPEAKER_{rng.randrange(n_speakers):02d}"})
+        t += duration - rng.uniform(0.0, 0.3)
+    return turns
+
+
+# ----- Stubs -----
+
+class StubSegment:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class StubAnnotation:
+    """Mimics pyannote.core.Annotation.itertracks(yield_label=True)."""
+
+    def __init__(self, turns):
+        self.turns = turns
+
+    def itertracks(self, yield_label=False):
+        for i, turn in enumerate(self.turns):
+            yield StubSegment(turn["start"], turn["end"]), i, turn["speaker"]
+
+
+class StubPipeline:
+    """Diarization 'model' that returns precomputed turns."""
+
+    def __init__(self, turns):
+        self.annotation = StubAnnotation(turns)
+
+    def __call__(self, audio, **kwargs):
+        return self.annotation
+
+
+class StubText:
+    """Minimal stand-in for tk.Text (enough for the transcript view and following highlight)."""
+
+    def __init__(self):
+        self.delete()
+
+    def configure(self, **kwargs):
+        pass
+
+    def delete(self, *args):
+        self.lines = [""]
+        self.tags = {}
+
+    def tag_config(self, tag, **kwargs):
+        self.tags.setdefault(tag, [])
+
+    def insert(self, index, *args):
+        # Same calling convention as tk.Text: text, tags, text, tags, ...
+        for text, tags in zip(args[0::2], list(args[1::2]) + [()]):
+            start = (len(self.lines), len(self.lines[-1]))
+            parts = text.split("\n")
+            self.lines[-1] += parts[0]
+            self.lines.extend(parts[1:])
+            end = (len(self.lines), len(self.lines[-1]))
+            for tag in ((tags,) if isinstance(tags, str) else tags):
+                self.tags.setdefault(tag, []).append((start, end))
+
+    def tag_add(self, tag, start, end):
+        self.tags.setdefault(tag, []).append((start, end))
+
+    def tag_remove(self, tag, *args):
+        self.tags[tag] = []
+
+    def index(self, expr):
+        if expr.startswith("end"):
+            return f"{len(self.lines)}.0"
+        if expr.startswith("@"):
+            # Pretend the first screen line is the top of the widget
+            return "1.0"
+        return expr.partition(" ")[0]
+
+    def yview(self, *args):
+        return (0.0, 0.05)
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def yview_scroll(self, number, what):
+        pass
+
+    def winfo_height(self):
+        return 600
+
+    def winfo_exists(self):
+        return True
+
+    def after_idle(self, func, *args):
+        func(*args)
+
+
+class StubWidget:
+    def configure(self, **kwargs):
+        pass
+
+
+class StubEntry(StubWidget):
+    def __init__(self, text=""):
+        self.text = text
+
+    def get(self):
+        return self.text
+
+
+class StubVideoPlayer:
+    def __init__(self):
+        self.decoder = True
+        self.fps = 30.0
+        self.current_frame = 0
+
+    def seek(self, seconds):
+        pass
+
+
+def make_text_widget(use_tk):
+    """Real Tk Text if asked for and a display exists, else StubText."""
+    if use_tk:
+        try:
+            import tkinter
+            root = tkinter.Tk()
+            root.withdraw()
+            return tkinter.Text(root), "tk"
+        except Exception:
+            pass
+    return StubText(), "stub"
+
+
+def make_bench_app(segments, use_tk):
+    """
+    Object carrying the TranscriptionApp methods under test, without building the window.
+    """
+    import main
+
+    class BenchApp:
+        render_transcript = main.TranscriptionApp.render_transcript
+        on_segments_streamed = main.TranscriptionApp.on_segments_streamed
+        _format_segment = main.TranscriptionApp._format_segment
+        _update_following_highlight = main.TranscriptionApp._update_following_highlight
+        _clear_following_highlight = main.TranscriptionApp._clear_following_highlight
+        format_time = main.TranscriptionApp.format_time
+        _run_search = main.TranscriptionApp._run_search
+        _update_search_label = main.TranscriptionApp._update_search_label
+        search_step = main.TranscriptionApp.search_step
+
+        def after(self, ms, func=None, *args):
+            return None
+
+    app = BenchApp()
+    app.transcript_box, backend = make_text_widget(use_tk)
+    app.transcript_view = main.VirtualTranscriptView(app.transcript_box, app._format_segment,
+                                                     speaker_colors=main.SPEAKER_COLORS)
+    app.transcript_data = main.SegmentStore.from_dicts(segments)
+    app.speaker_names = {}
+    app._speakers_pending = False
+    app.following_mode = False
+    app._last_highlighted_index = -1
+    app._time_index = main.SegmentTimeIndex()
+    app.video_player = StubVideoPlayer()
+    app.lbl_status = StubWidget()
+    app.btn_follow = StubWidget()
+    app.entry_search = StubEntry()
+    app.lbl_search = StubWidget()
+    app._search_index = main.TranscriptSearchIndex()
+    app._search_hits = []
+    app._search_pos = -1
+    app._search_job = None
+    app._search_source = None
+    return app, backend
+
+
+# ----- Timing -----
+
+def time_it(func, repeat, setup=None):
+    """Returns wall times (seconds) of `repeat` runs; setup() runs untimed before each."""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    return times
+
+
+# ----- Cases -----
+# Each case takes (n, args) and returns (list_of_times, extra_info_dict)
+
+def bench_speaker_mapping(n, args):
+    """VideoTranscriber.diarize speaker overlap mapping (stub pipeline)."""
+    from speaker_assignment import SpeakerTimeline, assign_speakers
+    segments = make_transcript(n)
+    turns = make_turns(segments)
+
+    try:
+        from transcribe import VideoTranscriber
+        transcriber = VideoTranscriber.__new__(VideoTranscriber)
+        transcriber.diarization_pipeline = StubPipeline(turns)
+        transcriber.word_timestamps = False
+        run = lambda: transcriber.diarize(None, segments)
+        target = "VideoTranscriber.diarize"
+    except ImportError:
+        # Model libraries not installed: time the same mapping engine directly
+        run = lambda: assign_speakers(segments, SpeakerTimeline.from_turns(turns))
+        target = "speaker_assignment"
+    return time_it(run, args.repeat), {"turns": len(turns), "target": target}
+
+
+def bench_word_mapping(n, args):
+    """Word-level speaker attribution + re-splitting at speaker changes (n segments, ~14 words each)."""
+    from speaker_assignment import SpeakerTimeline, assign_word_speakers
+    segments = add_words(make_transcript(n))
+    turns = make_turns(segments)
+    timeline = SpeakerTimeline.from_turns(turns)
+    words = sum(len(seg["words"]) for seg in segments)
+    out = assign_word_speakers(segments, timeline)
+    times = time_it(lambda: assign_word_speakers(segments, timeline), args.repeat)
+    return times, {"turns": len(turns), "words": words, "output_segments": len(out)}
+
+
+def bench_stream_segments(n, args):
+    """TranscriptionApp.on_segments_streamed receiving the whole transcript in 50-segment batches."""
+    segments = make_transcript(n)
+    app, backend = make_bench_app([], args.tk)
+
+    def setup():
+        app.transcript_view.show_message("")
+        app.transcript_data = SegmentStore()
+
+    def run():
+        for i in range(0, len(segments), 50):
+            app.on_segments_streamed(segments[i:i + 50])
+
+    return time_it(run, args.repeat, setup), {"backend": backend}
+
+
+def bench_render_transcript(n, args):
+    """TranscriptionApp.render_transcript re-rendering the transcript already shown (e.g. after a rename)."""
+    segments = make_transcript(n)
+    app, backend = make_bench_app(segments, args.tk)
+    app.render_transcript()
+    return time_it(app.render_transcript, args.repeat), {"backend": backend}
+
+
+def bench_scroll_jump(n, args, jumps=200):
+    """Scrollbar jumps to random positions (each one re-renders the window around the target)."""
+    segments = make_transcript(n)
+    app, backend = make_bench_app(segments, args.tk)
+    app.render_transcript()
+    rng = random.Random(3)
+    targets = [rng.random() for _ in range(jumps)]
+
+    def run():
+        for fraction in targets:
+            app.transcript_view._on_scrollbar("moveto", fraction)
+
+    times = time_it(run, args.repeat)
+    return [t / jumps for t in times], {"backend": backend, "unit": "per jump"}
+
+
+def bench_following_lookup(n, args, lookups=500):
+    """Segment lookup + highlight in _update_following_highlight at random playback positions."""
+    segments = make_transcript(n)
+    app, backend = make_bench_app(segments, args.tk)
+    app.render_transcript()
+    app.following_mode = True
+
+    rng = random.Random(2)
+    end_time = segments[-1]["end"]
+    frames = [int(rng.uniform(0, end_time) * app.video_player.fps) for _ in range(lookups)]
+
+    def run():
+        for frame in frames:
+            app.video_player.current_frame = frame
+            app._update_following_highlight()
+
+    times = time_it(run, args.repeat)
+    # Report per-lookup time
+    return [t / lookups for t in times], {"backend": backend, "unit": "per lookup"}
+
+
+def bench_pdf(n, args):
+    """export_utils.export_to_pdf to a temp file."""
+    from export_utils import export_to_pdf
+    segments = make_transcript(n)
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        times = time_it(lambda: export_to_pdf(path, segments, {}), args.repeat)
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+    return times, {"pdf_bytes": size}
+
+
+
+def bench_export_text(n, args):
+    """Streaming SRT + WebVTT + JSONL exporters to temp files."""
+    from export_utils import export_transcript
+    segments = make_transcript(n)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        def run():
+            for fmt in ("srt", "vtt", "jsonl"):
+                export_transcript(fmt, os.path.join(tmp_dir, "out." + fmt), segments)
+        times = time_it(run, args.repeat)
+        size = sum(os.path.getsize(os.path.join(tmp_dir, f)) for f in os.listdir(tmp_dir))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return times, {"bytes": size}
+
+
+def bench_search(n, args, queries=("budget", "quick brown", '"next quarter"', "rol", "the team")):
+    """Full-text search: indexing the transcript, then each query + jump to the first hit."""
+    segments = make_transcript(n)
+    app, backend = make_bench_app(segments, args.tk)
+    app.render_transcript()
+
+    build = time_it(lambda: (app._search_index.clear(), app._search_index.sync(app.transcript_data)),
+                    args.repeat)
+
+    def run():
+        for query in queries:
+            app.entry_search.text = query
+            app._run_search()
+            app.search_step(1)
+
+    times = time_it(run, args.repeat)
+    # Report per-query time; indexing is reported separately
+    return [t / len(queries) for t in times], {"backend": backend, "unit": "per query",
+                                               "index_build_s": round(min(build), 4),
+                                               "hits": len(app._search_hits)}
+
+
+def bench_segment_store(n, args):
+    """Building a columnar SegmentStore from n segment dicts (memory reported vs the dicts)."""
+    segments = make_transcript(n)
+    store = SegmentStore.from_dicts(segments)
+    dict_bytes = sum(sys.getsizeof(seg) + sum(sys.getsizeof(v) for v in seg.values()) for seg in segments)
+    times = time_it(lambda: SegmentStore.from_dicts(segments), args.repeat)
+    return times, {"store_bytes": store.nbytes, "dict_bytes": dict_bytes}
+
+
+CASES = {
+    "speaker_mapping": bench_speaker_mapping,
+    "word_mapping": bench_word_mapping,
+    "stream_segments": bench_stream_segments,
+    "render_transcript": bench_render_transcript,
+    "scroll_jump": bench_scroll_jump,
+    "following_lookup": bench_following_lookup,
+    "pdf": bench_pdf,
+    "export_text": bench_export_text,
+    "segment_store": bench_segment_store,
+    "search": bench_search,
+}
+
+# PDF export of 200k segments takes minutes; cap it unless asked
+CASE_MAX_SIZE = {"pdf": 50000}
+
+
+# ----- Reporting -----
+
+def compare(results, baseline, tolerance):
+    """Returns a list of (case, n, old, new, ratio) that got slower than tolerance allows."""
+    old = {(r["case"], r["n"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        prev = old.get((r["case"], r["n"]))
+        if not prev or not prev.get("median_s"):
+            continue
+        ratio = r["median_s"] / prev["median_s"]
+        r["baseline_median_s"] = prev["median_s"]
+        r["ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append((r["case"], r["n"], prev["median_s"], r["median_s"], ratio))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark transcript hot paths with synthetic data.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated transcript sizes (segments)")
+    parser.add_argument("--only", default=None, help=f"Comma-separated cases: {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (min/median reported)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write JSON results")
+    parser.add_argument("--baseline", default=None, help="Previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown vs baseline before failing (0.2 = 20%%)")
+    parser.add_argument("--tk", action="store_true", help="Use a real Tk Text widget for GUI cases")
+    parser.add_argument("--no-cap", action="store_true", help="Run slow cases at every size")
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    args.cases = [c.strip() for c in args.only.split(",")] if args.only else list(CASES)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+
+    for case in args.cases:
+        func = CASES[case]
+        for n in args.sizes:
+            if not args.no_cap and n > CASE_MAX_SIZE.get(case, n):
+                continue
+            try:
+                times, info = func(n, args)
+            except ImportError as e:
+                print(f"{case:<20} n={n:<7} SKIPPED ({e})")
+                break
+            record = {
+                "case": case,
+                "n": n,
+                "min_s": min(times),
+                "median_s": statistics.median(times),
+                "repeat": len(times),
+                **info,
+            }
+            results.append(record)
+            print(f"{case:<20} n={n:<7} median {record['median_s'] * 1000:10.3f} ms   "
+                  f"min {record['min_s'] * 1000:10.3f} ms")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    payload = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+    print(f"Results written to {args.output}")
+
+    if regressions:
+        print("\nREGRESSIONS:")
+        for case, n, old, new, ratio in regressions:
+            print(f"  {case} n={n}: {old * 1000:.3f} ms -> {new * 1000:.3f} ms ({ratio:.2f}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
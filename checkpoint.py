@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+import weakref
+
+# How often (wall clock) completed segments are written to the sidecar file
+CHECKPOINT_INTERVAL_SECONDS = 30
+
+CHECKPOINT_SUFFIX = ".transcript-checkpoint.json"
+
+_open_checkpoints = weakref.WeakSet()
+
+
+def checkpoint_path(video_path):
+    """
+    Sidecar file next to the video. Falls back to cache/checkpoints if the video's
+    folder is not writable (e.g. a read-only share).
+    """
+    sidecar = video_path + CHECKPOINT_SUFFIX
+    folder = os.path.dirname(os.path.abspath(video_path))
+    if os.access(folder, os.W_OK):
+        return sidecar
+    fallback_dir = os.path.join(os.getcwd(), "cache", "checkpoints")
+    os.makedirs(fallback_dir, exist_ok=True)
+    return os.path.join(fallback_dir, os.path.basename(sidecar))
+
+
+class TranscriptCheckpoint:
+    """
+    Periodically saves completed Whisper segments and the audio offset they cover,
+    so a crashed or closed job can resume by transcribing only the remaining audio.
+    The cache key (media hash + settings) guards against resuming with different settings.
+    """
+
+    def __init__(self, video_path, cache_key, interval_seconds=CHECKPOINT_INTERVAL_SECONDS):
+        self.path = checkpoint_path(video_path)
+        self.cache_key = cache_key
+        self.interval_seconds = interval_seconds
+        self.segments = []
+        self.audio_offset = 0.0
+        self._last_save = time.monotonic()
+        self._dirty = False
+        self._lock = threading.Lock()
+        _open_checkpoints.add(self)
+
+    def load(self):
+        """
+        Restores a previous checkpoint for the same media + settings.
+        Returns True if there was something to resume.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("cache_key") != self.cache_key:
+            return False
+
+        with self._lock:
+            self.segments = data.get("segments", [])
+            self.audio_offset = float(data.get("audio_offset", 0.0))
+        return bool(self.segments)
+
+    def add(self, segment):
+        """Records a completed segment and saves if the interval has passed."""
+        with self._lock:
+            self.segments.append(dict(segment))
+            self.audio_offset = max(self.audio_offset, segment["end"])
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.interval_seconds
+        if due:
+            self.save()
+
+    def save(self):
+        """Writes the sidecar file atomically (temp file + rename)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "cache_key": self.cache_key,
+                "audio_offset": self.audio_offset,
+                "segments": list(self.segments),
+                "saved_at": time.time(),
+            }
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write checkpoint {self.path}: {e}")
+
+    def remove(self):
+        """Deletes the sidecar once the job completed."""
+        _open_checkpoints.discard(self)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def flush_open_checkpoints():
+    """Saves every checkpoint still in progress (called on app shutdown)."""
+    for ckpt in list(_open_checkpoints):
+        ckpt.save()
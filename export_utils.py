@@ -1,15 +1,76 @@
+import json
+import os
+
 from reportlab.lib.pagesizes import LETTER
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from job_queue import JobCancelled
+
+# Fonts and layout of the PDF transcript
+PDF_TEXT_FONT = ("Helvetica", 10)
+PDF_LINE_HEIGHT = 14
+PDF_BLOCK_GAP = 20
+
+# Progress is reported every this many segments
+PDF_PROGRESS_EVERY = 200
 
-def export_to_pdf(output_path, transcript_data, speaker_names):
+
+class _WidthCache:
+    """
+    Memoized stringWidth per word for one font. Transcripts reuse a small vocabulary,
+    so after the first pages almost every measurement is a dict lookup.
+    """
+
+    def __init__(self, font_name, font_size):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.widths = {}
+        self.space = stringWidth(" ", font_name, font_size)
+
+    def __call__(self, word):
+        width = self.widths.get(word)
+        if width is None:
+            width = self.widths[word] = stringWidth(word, self.font_name, self.font_size)
+        return width
+
+
+def wrap_words(text, max_width, measure):
+    """Greedy word wrap by measured width. A word wider than the line gets a line of its own."""
+    lines = []
+    current = []
+    current_width = 0.0
+    for word in text.split():
+        width = measure(word)
+        if current and current_width + measure.space + width > max_width:
+            lines.append(" ".join(current))
+            current = []
+            current_width = 0.0
+        current_width += (measure.space if current else 0.0) + width
+        current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def export_to_pdf(output_path, transcript_data, speaker_names, progress_callback=None, cancel_event=None):
     """
     Generates a PDF from the transcript.
-    transcript_data: list of {start, end, text, speaker}
+    transcript_data: iterable of {start, end, text, speaker}
     speaker_names: dict of {raw_speaker_label: display_name}
+    progress_callback(done, total) is called every PDF_PROGRESS_EVERY segments (total is None
+    for iterators without a length). Setting cancel_event raises JobCancelled and writes nothing.
+    Pages are compressed as they are finished (pageCompression), which keeps memory low
+    for very long transcripts.
     """
-    c = canvas.Canvas(output_path, pagesize=LETTER)
+    try:
+        total = len(transcript_data)
+    except TypeError:
+        total = None
+
+    c = canvas.Canvas(output_path, pagesize=LETTER, pageCompression=1)
     width, height = LETTER
     
     # Title
@@ -18,18 +79,26 @@ def export_to_pdf(output_path, transcript_data, speaker_names):
     c.line(inch, height - 0.75*inch, width - inch, height - 0.75*inch)
     
     y = height - 1.2 * inch
+    text_start_x = inch + 1.5*inch
+    text_width = width - inch - text_start_x
+    measure = _WidthCache(*PDF_TEXT_FONT)
     
-    for item in transcript_data:
+    done = -1
+    for done, item in enumerate(transcript_data):
+        if done % PDF_PROGRESS_EVERY == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                raise JobCancelled()
+            if progress_callback and done:
+                progress_callback(done, total)
+
         start_time = format_time(item['start'])
         raw_speaker = item.get('speaker', 'Unknown')
         display_name = speaker_names.get(raw_speaker, raw_speaker)
-        text_content = item['text']
         
         # Check for page break
         if y < inch:
             c.showPage()
             y = height - inch
-            c.setFont("Helvetica", 10)
 
         # Draw Timestamp
         c.setFont("Helvetica-Oblique", 8)
@@ -41,41 +110,188 @@ def export_to_pdf(output_path, transcript_data, speaker_names):
         c.setFillColor(colors.black)
         c.drawString(inch + 0.6*inch, y, f"{display_name}:")
         
-        # Draw Text (Simple wrap logic for prototype)
-        # For a robust app, use ReportLab Platypus Paragraphs, but this is simpler for now.
-        c.setFont("Helvetica", 10)
-        text_start_x = inch + 1.5*inch
-        
-        # Very basic wrapping by char count (not ideal but works for plain text)
-        max_chars = 80
-        words = text_content.split()
-        current_line = ""
-        
-        # Initial line offset
+        # Draw Text, wrapped by the real glyph widths of the font
+        c.setFont(*PDF_TEXT_FONT)
         current_y = y
-        
-        for word in words:
-            if len(current_line) + len(word) + 1 < max_chars:
-                current_line += word + " "
-            else:
-                c.drawString(text_start_x, current_y, current_line)
-                current_y -= 14
-                current_line = word + " "
-                
+        for i, line in enumerate(wrap_words(item['text'], text_width, measure)):
+            if i:
+                current_y -= PDF_LINE_HEIGHT
                 # Check page break inside text block
                 if current_y < inch:
                     c.showPage()
                     current_y = height - inch
-                    c.setFont("Helvetica", 10)
-        
-        # Draw last line
-        if current_line:
-            c.drawString(text_start_x, current_y, current_line)
+                    c.setFont(*PDF_TEXT_FONT)
+            c.drawString(text_start_x, current_y, line)
             
         # Move Y down for next block
-        y = current_y - 20 
+        y = current_y - PDF_BLOCK_GAP
 
+    if cancel_event is not None and cancel_event.is_set():
+        raise JobCancelled()
     c.save()
+    if progress_callback:
+        progress_callback(total if total is not None else done + 1, total)
+
+def export_to_json(output_path, transcript_data, speaker_names=None, meta=None):
+    """
+    Writes the transcript as JSON: {"meta": {...}, "segments": [{start, end, text, speaker}]}.
+    Speaker labels are kept raw; speaker_names (if any) is stored alongside.
+    """
+    payload = {
+        "meta": meta or {},
+        "speaker_names": speaker_names or {},
+        "segments": [dict(seg) for seg in transcript_data],
+    }
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+
+# Segments formatted per write() call by the streaming text exporters
+CHUNK_SEGMENTS = 500
+
+# File buffer of the streaming text exporters
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+class Exporter:
+    """A registered output format: export(output_path, segments, speaker_names, progress_callback, cancel_event)."""
+
+    def __init__(self, name, extension, label, export):
+        self.name = name
+        self.extension = extension
+        self.label = label
+        self.export = export
+
+
+EXPORTERS = {}  # format name -> Exporter
+
+
+def register_exporter(name, extension, label):
+    """Decorator that adds an export function to the registry under `name`."""
+    def decorator(func):
+        EXPORTERS[name] = Exporter(name, extension, label, func)
+        return func
+    return decorator
+
+
+def get_exporter(name):
+    try:
+        return EXPORTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{name}' (available: {', '.join(sorted(EXPORTERS))})")
+
+
+def exporter_for_path(path):
+    """Exporter whose extension matches path (None if no format uses it)."""
+    extension = os.path.splitext(path)[1].lower()
+    for exporter in EXPORTERS.values():
+        if exporter.extension == extension:
+            return exporter
+    return None
+
+
+def export_transcript(format_name, output_path, segments, speaker_names=None,
+                      progress_callback=None, cancel_event=None):
+    """Writes segments (any iterable of segment dicts) with the named exporter."""
+    get_exporter(format_name).export(output_path, segments, speaker_names or {},
+                                     progress_callback=progress_callback, cancel_event=cancel_event)
+
+
+def stream_text(output_path, segments, speaker_names, format_item, header="",
+                progress_callback=None, cancel_event=None):
+    """
+    Writes one formatted string per segment, joined and written CHUNK_SEGMENTS at a time
+    through a large file buffer. Only one chunk is held in memory, so a generator over a
+    huge transcript exports in constant memory. A cancelled export removes the partial file.
+    format_item(number, item, display_name) -> str, number counts from 1.
+    """
+    try:
+        total = len(segments)
+    except TypeError:
+        total = None
+
+    done = 0
+    try:
+        with open(output_path, "w", encoding="utf-8", newline="\n", buffering=WRITE_BUFFER_BYTES) as f:
+            f.write(header)
+            chunk = []
+            for done, item in enumerate(segments, start=1):
+                raw_speaker = item.get('speaker', 'Unknown')
+                chunk.append(format_item(done, item, speaker_names.get(raw_speaker, raw_speaker)))
+                if len(chunk) >= CHUNK_SEGMENTS:
+                    f.write("".join(chunk))
+                    chunk.clear()
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise JobCancelled()
+                    if progress_callback:
+                        progress_callback(done, total)
+            f.write("".join(chunk))
+    except JobCancelled:
+        os.remove(output_path)
+        raise
+    if progress_callback:
+        progress_callback(done, total)
+
+
+def text_exporter(name, extension, label, header=""):
+    """Registers a per-segment formatter as a streaming text exporter."""
+    def decorator(format_item):
+        def export(output_path, segments, speaker_names, progress_callback=None, cancel_event=None):
+            stream_text(output_path, segments, speaker_names, format_item, header,
+                        progress_callback=progress_callback, cancel_event=cancel_event)
+        register_exporter(name, extension, label)(export)
+        return format_item
+    return decorator
+
+
+@text_exporter("srt", ".srt", "SubRip subtitles")
+def format_srt_cue(number, item, display_name):
+    """SubRip cue, prefixed with the speaker name."""
+    return (f"{number}\n"
+            f"{format_srt_time(item['start'])} --> {format_srt_time(item['end'])}\n"
+            f"{display_name}: {item['text']}\n\n")
+
+
+@text_exporter("vtt", ".vtt", "WebVTT subtitles", header="WEBVTT\n\n")
+def format_vtt_cue(number, item, display_name):
+    """WebVTT cue with the speaker as a voice span (<v Name>)."""
+    return (f"{format_vtt_time(item['start'])} --> {format_vtt_time(item['end'])}\n"
+            f"<v {_vtt_escape(display_name)}>{_vtt_escape(item['text'])}\n\n")
+
+
+@text_exporter("jsonl", ".jsonl", "JSON Lines")
+def format_jsonl_line(number, item, display_name):
+    """One JSON object per segment (raw fields plus the display name of the speaker)."""
+    record = dict(item)
+    record["speaker_name"] = display_name
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+@register_exporter("pdf", ".pdf", "PDF document")
+def _export_pdf(output_path, segments, speaker_names, progress_callback=None, cancel_event=None):
+    export_to_pdf(output_path, segments, speaker_names,
+                  progress_callback=progress_callback, cancel_event=cancel_event)
+
+
+def export_to_srt(output_path, transcript_data, speaker_names=None):
+    """
+    Writes the transcript as SubRip subtitles, prefixing each cue with the speaker name.
+    """
+    export_transcript("srt", output_path, transcript_data, speaker_names)
+
+def _vtt_escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def format_vtt_time(seconds):
+    """Format seconds as HH:MM:SS.mmm (WebVTT timestamp)."""
+    return format_srt_time(seconds).replace(",", ".")
+
+def format_srt_time(seconds):
+    """Format seconds as HH:MM:SS,mmm (SRT timestamp)."""
+    total_ms = int(round(seconds * 1000))
+    s, ms = divmod(total_ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
 
 def format_time(seconds):
     m, s = divmod(seconds, 60)
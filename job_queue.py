@@ -0,0 +1,190 @@
+import itertools
+import os
+import threading
+import time
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 1
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when it has been cancelled (checked between segments)."""
+
+
+class TranscriptionJob:
+    """One queued video. The scheduler owns state changes; the GUI only reads it."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, video_path, num_speakers=None, priority=PRIORITY_NORMAL):
+        self.id = next(self._ids)
+        self.video_path = video_path
+        self.num_speakers = num_speakers
+        self.priority = priority
+        self.order = self.id  # position among equal-priority jobs (lower runs first)
+        self.status = QUEUED
+        self.progress = 0
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def name(self):
+        return os.path.basename(self.video_path)
+
+    @property
+    def is_active(self):
+        return self.status in (QUEUED, RUNNING)
+
+
+class JobScheduler:
+    """
+    Runs queued transcription jobs one at a time on a background thread.
+    All jobs share the models loaded in the process-wide registry.
+    run_job(job) does the work and returns the result; on_update(job) is called
+    (from the worker thread) whenever a job changes state.
+    """
+
+    def __init__(self, run_job, on_update=None):
+        self.run_job = run_job
+        self.on_update = on_update
+        self._jobs = []  # every job, in submit order
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._worker, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    # ----- Queue operations (any thread) -----
+
+    def submit(self, video_path, num_speakers=None, priority=PRIORITY_NORMAL):
+        job = TranscriptionJob(video_path, num_speakers, priority)
+        with self._cond:
+            self._jobs.append(job)
+            self._cond.notify()
+        self._notify(job)
+        return job
+
+    def cancel(self, job_id):
+        """Queued jobs are dropped right away; a running job stops at its next checkpoint."""
+        with self._cond:
+            job = self._find(job_id)
+            if not job or not job.is_active:
+                return
+            job.cancel_event.set()
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        self._notify(job)
+
+    def set_priority(self, job_id, priority):
+        with self._cond:
+            job = self._find(job_id)
+            if job and job.status == QUEUED:
+                job.priority = priority
+        self._notify(job)
+
+    def move(self, job_id, delta):
+        """Moves a queued job up (delta < 0) or down (delta > 0) in the run order."""
+        with self._cond:
+            queued = self._queued()
+            job = self._find(job_id)
+            if job not in queued:
+                return
+            index = queued.index(job)
+            target = index + delta
+            if not 0 <= target < len(queued):
+                return
+            other = queued[target]
+            # Moving across a priority boundary adopts the neighbour's priority
+            job.priority = other.priority
+            job.order, other.order = other.order, job.order
+        self._notify(job)
+
+    def remove_finished(self):
+        with self._cond:
+            self._jobs = [j for j in self._jobs if j.is_active]
+
+    def jobs(self):
+        """Snapshot: running job first, then queued in run order, then finished (newest first)."""
+        with self._cond:
+            running = [j for j in self._jobs if j.status == RUNNING]
+            finished = sorted((j for j in self._jobs if not j.is_active),
+                              key=lambda j: j.finished_at or 0, reverse=True)
+            return running + self._queued() + finished
+
+    def get(self, job_id):
+        with self._cond:
+            return self._find(job_id)
+
+    def has_running(self):
+        with self._cond:
+            return any(j.status == RUNNING for j in self._jobs)
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            for job in self._jobs:
+                job.cancel_event.set()
+            self._cond.notify_all()
+
+    # ----- Internals -----
+
+    def _find(self, job_id):
+        for job in self._jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def _queued(self):
+        queued = [j for j in self._jobs if j.status == QUEUED]
+        queued.sort(key=lambda j: (-j.priority, j.order))
+        return queued
+
+    def _notify(self, job):
+        if self.on_update and job is not None:
+            try:
+                self.on_update(job)
+            except Exception as e:
+                print(f"Job update callback failed: {e}")
+
+    def _next_job(self):
+        with self._cond:
+            while not self._stopped:
+                queued = self._queued()
+                if queued:
+                    job = queued[0]
+                    job.status = RUNNING
+                    job.started_at = time.time()
+                    return job
+                self._cond.wait()
+            return None
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._notify(job)
+
+            try:
+                job.result = self.run_job(job)
+                job.status = DONE
+                job.progress = 100
+            except JobCancelled:
+                job.status = CANCELLED
+            except Exception as e:
+                job.error = str(e)
+                job.status = FAILED
+                print(f"Job {job.id} ({job.name}) failed: {e}")
+            job.finished_at = time.time()
+            self._notify(job)
@@ -0,0 +1,141 @@
+import os
+import subprocess
+import threading
+
+import numpy as np
+
+from audio_decode import no_window_flags
+from result_cache import media_fingerprint
+
+# Bump when the stored format changes
+INDEX_VERSION = 1
+
+
+def default_index_dir():
+    return os.path.join(os.getcwd(), "cache", "keyframes")
+
+
+class KeyframeIndex:
+    """
+    Presentation timestamps of every video packet (sorted, so position i is frame i) and
+    the frame numbers of the keyframes. Built once per file with a demux-only ffprobe pass
+    (no decoding) and cached on disk by content hash.
+    """
+
+    def __init__(self, frame_times, keyframes):
+        self.frame_times = np.asarray(frame_times, dtype=np.float64)
+        self.keyframes = np.asarray(keyframes, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.frame_times)
+
+    def keyframe_before(self, frame_index):
+        """Frame number of the last keyframe at or before frame_index (0 if none)."""
+        i = np.searchsorted(self.keyframes, frame_index, side="right") - 1
+        return int(self.keyframes[i]) if i >= 0 else 0
+
+    def keyframe_after(self, frame_index):
+        """Frame number of the first keyframe at or after frame_index (None if none)."""
+        i = np.searchsorted(self.keyframes, frame_index, side="left")
+        return int(self.keyframes[i]) if i < len(self.keyframes) else None
+
+    def seek_plan(self, current_index, target_index):
+        """
+        Cheapest way to reach target_index: returns (seek_to, frames_to_grab).
+        Decoding forward from the current position wins if no keyframe lies in between;
+        otherwise seek to the last keyframe before the target. seek_to is None for "don't seek".
+        """
+        keyframe = self.keyframe_before(target_index)
+        if current_index <= target_index and current_index >= keyframe:
+            return None, target_index - current_index
+        return keyframe, target_index - keyframe
+
+    def save(self, path):
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, version=INDEX_VERSION,
+                            frame_times=self.frame_times, keyframes=self.keyframes)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                raise ValueError("old keyframe index format")
+            return cls(data["frame_times"], data["keyframes"])
+
+
+def probe_keyframes(video_path):
+    """
+    One demux pass with ffprobe over the first video stream's packets (pts + flags).
+    Packets come in decode order, so they are sorted by pts to get display order.
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=print_section=0",
+        video_path,
+    ]
+    proc = subprocess.run(cmd, capture_output=True, creationflags=no_window_flags())
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffprobe failed on {video_path}: {proc.stderr.decode(errors='replace')}")
+
+    times = []
+    key_flags = []
+    for line in proc.stdout.decode(errors="replace").splitlines():
+        pts, _, flags = line.partition(",")
+        if not pts or pts == "N/A":
+            continue
+        times.append(float(pts))
+        key_flags.append("K" in flags)
+
+    times = np.asarray(times, dtype=np.float64)
+    key_flags = np.asarray(key_flags, dtype=bool)
+    order = np.argsort(times, kind="mergesort")
+    times = times[order] - (times.min() if len(times) else 0.0)  # frame 0 at t=0, like OpenCV
+    keyframes = np.flatnonzero(key_flags[order])
+    return KeyframeIndex(times, keyframes)
+
+
+class KeyframeIndexCache:
+    """On-disk cache of keyframe indexes (cache/keyframes/<content hash>.npz)."""
+
+    def __init__(self, index_dir=None):
+        self.index_dir = index_dir or default_index_dir()
+        self._lock = threading.Lock()
+        self._memory = {}  # path -> KeyframeIndex for files opened this session
+
+    def get(self, video_path):
+        """Returns the index, building and storing it on first use (blocking; call from a worker)."""
+        key = os.path.abspath(video_path)
+        with self._lock:
+            index = self._memory.get(key)
+        if index is not None:
+            return index
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        path = os.path.join(self.index_dir, media_fingerprint(video_path) + ".npz")
+        try:
+            index = KeyframeIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            print(f"Building keyframe index for {video_path}...")
+            index = probe_keyframes(video_path)
+            try:
+                index.save(path)
+            except OSError as e:
+                print(f"Could not save keyframe index {path}: {e}")
+        with self._lock:
+            self._memory[key] = index
+        return index
+
+
+_index_cache = None
+_index_cache_lock = threading.Lock()
+
+
+def get_keyframe_cache():
+    global _index_cache
+    with _index_cache_lock:
+        if _index_cache is None:
+            _index_cache = KeyframeIndexCache()
+        return _index_cache
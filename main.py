@@ -1,3 +1,4 @@
+import bisect
 import sys
 import os
 
@@ -7,34 +8,46 @@ os.environ["HF_HOME"] = os.path.join(os.getcwd(), "models", "huggingface_cache")
 
 import threading
 import queue
-import tempfile
+import time
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import cv2
+from PIL import ImageTk
 import faulthandler
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "1"
 import pygame
 
+from playback_index import SegmentTimeIndex
+from segment_store import SegmentStore
+from search_index import TranscriptSearchIndex
+from transcript_view import VirtualTranscriptView
+from job_queue import (JobScheduler, JobCancelled, QUEUED, RUNNING, DONE, FAILED, CANCELLED,
+                       PRIORITY_NORMAL, PRIORITY_HIGH)
+
 # CRITICAL FIX: Disable TQDM Monitor Thread
 import tqdm
 tqdm.tqdm.monitor_interval = 0
 
-# ENABLE FAULTHANDLER FOR SEGFAULTS
-crash_log_file = open("crash_dump.log", "w")
-faulthandler.enable(file=crash_log_file)
-
-# REDIRECT OUTPUT TO LOG FILE
+# Log files are opened by setup_logging() when the GUI starts, not on import:
+# spawned shard workers re-import this module as __mp_main__ and benchmark.py imports it
 log_file_path = "app.log"
-log_file = open(log_file_path, 'w', buffering=1)
-sys.stdout = log_file
-sys.stderr = log_file
+log_file = None
+crash_log_file = None
+
+def setup_logging():
+    global log_file, crash_log_file
+    # ENABLE FAULTHANDLER FOR SEGFAULTS
+    crash_log_file = open("crash_dump.log", "w")
+    faulthandler.enable(file=crash_log_file)
+    
+    # REDIRECT OUTPUT TO LOG FILE
+    log_file = open(log_file_path, 'w', buffering=1)
+    sys.stdout = log_file
+    sys.stderr = log_file
 
 def log_debug(msg):
     try:
         print(f"[DEBUG] {msg}")
         sys.stdout.flush()
-        log_file.flush()
     except:
         pass
 
@@ -42,8 +55,8 @@ def flush_log():
     try:
         sys.stdout.flush()
         sys.stderr.flush()
-        log_file.flush()
-        os.fsync(log_file.fileno())
+        if log_file:
+            os.fsync(log_file.fileno())
     except:
         pass
 
@@ -66,7 +79,7 @@ class VideoPlayer(ctk.CTkFrame):
         super().__init__(parent, **kwargs)
         
         self.video_path = None
-        self.cap = None
+        self.decoder = None  # background FrameDecoder (owns the cv2.VideoCapture)
         self.is_playing = False
         self.current_frame = 0
         self.total_frames = 0
@@ -74,12 +87,16 @@ class VideoPlayer(ctk.CTkFrame):
         self.frame_delay = 33  # ms between frames
         self.volume = 1.0  # 0.0 to 1.0
         self._seeking = False  # Prevent update conflicts during seek
+        self._scrubbing = False  # Seek slider is being dragged (preview only, seek on release)
+        self.thumbnails = None  # ThumbnailStrip for scrub previews (built in the background)
+        self.using_proxy = False  # Decoding a low-resolution proxy instead of the source
+        self._proxy_ready = None  # (video_path, proxy_path) handed over by the proxy thread
+        self._proxy_job = None
+        self._proxy_cancel = None  # Event that stops this file's proxy transcode (set on close)
         
         # Audio state
-        self._audio_file = None  # Temporary audio file path
+        self.audio = None  # StreamedAudio (or WavFileAudio), see audio_playback.py
         self._audio_loaded = False
-        self._audio_start_offset = 0  # Video time offset when audio started
-        self._audio_paused = False  # Track if audio was specifically paused
         
         # Initialize pygame mixer for audio
         try:
@@ -92,6 +109,11 @@ class VideoPlayer(ctk.CTkFrame):
         
         self._photo_image = None
         self._update_job = None
+        self._await_job = None
+        
+        # Playback clock (used when there is no audio to follow)
+        self._clock_start_secs = 0.0
+        self._clock_started_at = 0.0
         
         # Main layout
         self.grid_rowconfigure(0, weight=1)
@@ -104,6 +126,8 @@ class VideoPlayer(ctk.CTkFrame):
         
         # Click to play/pause
         self.canvas.bind("<Button-1>", lambda e: self._toggle_playback())
+        # The decoder scales frames to the canvas size on its own thread
+        self.canvas.bind("<Configure>", self._on_canvas_resize)
         
         # Controls frame
         controls_frame = ctk.CTkFrame(self, fg_color="transparent", height=80)
@@ -125,6 +149,12 @@ class VideoPlayer(ctk.CTkFrame):
                                           command=self._on_seek_slider)
         self.seek_slider.set(0)
         self.seek_slider.grid(row=0, column=2, sticky="ew", padx=5, pady=5)
+        self.seek_slider.bind("<ButtonRelease-1>", self._on_seek_release)
+        
+        # Scrub preview (thumbnail + time shown above the slider while dragging)
+        self.scrub_preview = ctk.CTkLabel(self, text="", compound="top", fg_color="#212121",
+                                           corner_radius=6, font=("Segoe UI", 11))
+        self._scrub_photo = None
         
         # Volume frame (column 3)
         volume_frame = ctk.CTkFrame(controls_frame, fg_color="transparent")
@@ -142,18 +172,15 @@ class VideoPlayer(ctk.CTkFrame):
         """Load a video file and extract audio."""
         self.stop()
         self._cleanup_audio()
-        
-        if self.cap:
-            self.cap.release()
+        self.close()
             
         self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
-        
-        if not self.cap.isOpened():
-            raise RuntimeError(f"Cannot open video: {video_path}")
+        # Lazy import (the decoder thread starts straight away and decodes frame 0)
+        from video_decoder import FrameDecoder
+        self.decoder = FrameDecoder(video_path, target_size=self._display_size())
             
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.total_frames = self.decoder.total_frames
+        self.fps = self.decoder.fps
         self.frame_delay = max(1, int(1000 / self.fps))
         self.current_frame = 0
         
@@ -165,214 +192,288 @@ class VideoPlayer(ctk.CTkFrame):
         self._audio_thread.daemon = True
         self._audio_thread.start()
         
-        # Show first frame
-        self._show_frame()
+        # Scrub thumbnails are generated (or loaded from the disk cache) in the background
+        self.thumbnails = None
+        threading.Thread(target=self._load_thumbnails, args=(video_path, self.decoder), daemon=True).start()
+        
+        # Heavy sources (4K, high bitrate) get a small proxy transcode; we switch to it once it exists
+        self.using_proxy = False
+        self._proxy_ready = None
+        duration = self.total_frames / self.fps if self.fps > 0 else 0
+        from proxy_media import needs_proxy
+        if needs_proxy(video_path, self.decoder.frame_height, duration):
+            self._proxy_cancel = threading.Event()
+            threading.Thread(target=self._load_proxy, args=(video_path, self.fps, self._proxy_cancel),
+                             daemon=True).start()
+            self._proxy_job = self.after(500, self._poll_proxy)
+        
+        # Show first frame (as soon as the decoder has it)
+        self._await_frame(0)
         self._update_time_display()
         log_debug(f"Video loaded: {video_path}, {self.total_frames} frames, {self.fps} fps")
         
+    def _load_thumbnails(self, video_path, decoder):
+        try:
+            from thumbnail_strip import get_thumbnail_cache
+            duration = decoder.total_frames / decoder.fps if decoder.fps > 0 else 0
+            strip = get_thumbnail_cache().get(video_path, duration, decoder.frame_width, decoder.frame_height)
+            # Still the same video?
+            if self.video_path == video_path and len(strip):
+                self.thumbnails = strip
+                log_debug(f"Scrub thumbnails ready: {len(strip)} frames every {strip.interval:.1f}s")
+        except Exception as e:
+            log_debug(f"Thumbnail strip failed: {e}")
+        
+    def _load_proxy(self, video_path, fps, cancel_event):
+        try:
+            from proxy_media import get_proxy_cache
+            proxy_path = get_proxy_cache().get(video_path, fps, cancel_event=cancel_event)
+            if proxy_path and self.video_path == video_path:
+                self._proxy_ready = (video_path, proxy_path)
+        except JobCancelled:
+            log_debug(f"Proxy transcode cancelled: {video_path}")
+        except Exception as e:
+            log_debug(f"Proxy transcode failed: {e}")
+            
+    def _poll_proxy(self):
+        """Tk thread: switch to the proxy as soon as the background transcode has finished."""
+        self._proxy_job = None
+        if not self.decoder or self.using_proxy:
+            return
+        ready = self._proxy_ready
+        if ready is None:
+            self._proxy_job = self.after(500, self._poll_proxy)
+            return
+        self._proxy_ready = None
+        video_path, proxy_path = ready
+        if video_path == self.video_path:
+            self._switch_to_proxy(proxy_path)
+            
+    def _switch_to_proxy(self, proxy_path):
+        """Swap the source decoder for one on the proxy, keeping position and play state."""
+        from video_decoder import FrameDecoder
+        try:
+            proxy = FrameDecoder(proxy_path, target_size=self._display_size())
+        except Exception as e:
+            log_debug(f"Cannot open proxy {proxy_path}: {e}")
+            return
+        
+        # Same frame rate is required so frame numbers (slider, clock, seeks) stay valid
+        if abs(proxy.fps - self.fps) > 0.01 or abs(proxy.total_frames - self.total_frames) > self.fps:
+            log_debug(f"Proxy does not match source ({proxy.total_frames} frames @ {proxy.fps} fps), not using it")
+            proxy.close()
+            return
+        
+        source = self.decoder
+        proxy.set_playing(self.is_playing)
+        proxy.seek(self.current_frame)
+        self.decoder = proxy
+        self.using_proxy = True
+        source.close()
+        if not self.is_playing:
+            self._await_frame(self.current_frame)
+        log_debug(f"Switched playback to proxy: {proxy_path}")
+        
+    def close(self):
+        """Stop the decoder thread and release the video."""
+        if self._await_job:
+            self.after_cancel(self._await_job)
+            self._await_job = None
+        if self._proxy_job:
+            self.after_cancel(self._proxy_job)
+            self._proxy_job = None
+        if self._proxy_cancel:
+            # Another file (or none) is shown: stop its transcode so the next one can start
+            self._proxy_cancel.set()
+            self._proxy_cancel = None
+        self._proxy_ready = None
+        self.using_proxy = False
+        if self.decoder:
+            self.decoder.close()
+            self.decoder = None
+        self.thumbnails = None
+        self._scrubbing = False
+        self.scrub_preview.place_forget()
+        
     def _extract_audio(self, video_path):
-        """Extract audio from video to a temporary file for playback."""
+        """Open the audio for playback (streamed from the file by default, nothing extracted)."""
         if not self._mixer_initialized:
             return
             
         try:
-            import subprocess
-            
-            # Create temp file for audio
-            # Use unique name for each video to prevent conflicts
-            import hashlib
-            hash_name = hashlib.md5(video_path.encode()).hexdigest()[:8]
-            # SWITCH TO WAV for accurate seeking
-            self._audio_file = os.path.join(tempfile.gettempdir(), f"video_audio_{hash_name}.wav")
+            # Lazy import (the WAV backend needs numpy for the decode cache)
+            from audio_playback import open_audio
             
             # Check if current video path still matches (user typically didn't change it yet, but good practice)
             if self.video_path != video_path:
                 return
-
-            # Use ffmpeg to extract audio as WAV (uncompressed PCM)
-            # This ensures sample-accurate seeking compared to VBR MP3
-            cmd = [
-                "ffmpeg", "-y",  # Overwrite
-                "-i", video_path,
-                "-vn",  # No video
-                "-acodec", "pcm_s16le", # Uncompressed 16-bit PCM
-                "-ar", "44100", # 44.1kHz
-                "-ac", "2",     # Stereo
-                self._audio_file
-            ]
-            
-            log_debug(f"Starting audio extraction for {video_path}...")
-            
-            # Run ffmpeg (this blocks the thread, but not the UI now)
-            result = subprocess.run(cmd, capture_output=True, text=True, 
-                                   creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
-            
-            # Verify we're still on the same video before loading
+            
+            # Streaming backend: instant. WAV backend: blocks this thread (not the UI) while decoding.
+            audio = open_audio(video_path)
+            audio.set_volume(self.volume)
+            
+            # Verify we're still on the same video before using it
             if self.video_path != video_path:
-                log_debug("Video changed during extraction, discarding audio.")
+                log_debug("Video changed while opening audio, discarding it.")
+                audio.close()
                 return
-
-            if os.path.exists(self._audio_file):
-                # We need to queue this back to the main thread ideally, but mixer operations 
-                # are generally thread-safe for loading.
-                pygame.mixer.music.load(self._audio_file)
-                pygame.mixer.music.set_volume(self.volume)
-                self._audio_loaded = True
-                log_debug(f"Audio extracted and loaded: {self._audio_file}")
-            else:
-                log_debug(f"Audio extraction failed: {result.stderr}")
-                self._audio_loaded = False
+            
+            self.audio = audio
+            self._audio_loaded = True
+            log_debug(f"Audio ready ({type(audio).__name__}) for {video_path}")
+            
+            # Playback may have started before the audio was ready
+            if self.is_playing:
+                self.after(0, self._resync_audio)
                 
         except Exception as e:
-            log_debug(f"Error extracting audio: {e}")
+            log_debug(f"Error opening audio: {e}")
             self._audio_loaded = False
             
+    def _resync_audio(self):
+        if self.is_playing and self._audio_loaded:
+            self.audio.play(self.current_frame / self.fps if self.fps > 0 else 0)
+            
     def _cleanup_audio(self):
-        """Clean up temporary audio file."""
+        """Stop the audio stream (or unload and delete the temp WAV)."""
         try:
-            if self._audio_loaded:
-                pygame.mixer.music.stop()
-            if self._audio_file and os.path.exists(self._audio_file):
-                try:
-                    os.remove(self._audio_file)
-                except:
-                    pass
-            self._audio_file = None
-            self._audio_loaded = False
+            if self.audio is not None:
+                self.audio.close()
         except:
             pass
+        self.audio = None
+        self._audio_loaded = False
         
-    def _show_frame(self):
-        """Display the current frame."""
-        if not self.cap:
-            return
-            
-        ret, frame = self.cap.read()
-        if not ret:
-            self.is_playing = False
-            return
-            
-        self.current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-        
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Resize to fit widget while maintaining aspect ratio
+    def _display_size(self):
+        """Box the decoder scales frames into (None until the canvas has a real size)."""
         canvas_width = self.canvas.winfo_width() - 20
         canvas_height = self.canvas.winfo_height() - 20
-        
         if canvas_width > 100 and canvas_height > 100:
-            h, w = frame_rgb.shape[:2]
-            scale = min(canvas_width / w, canvas_height / h)
-            new_w, new_h = int(w * scale), int(h * scale)
-            frame_rgb = cv2.resize(frame_rgb, (new_w, new_h))
-        
-        # Convert to PIL Image and then to PhotoImage
-        image = Image.fromarray(frame_rgb)
+            return canvas_width, canvas_height
+        return None
+        
+    def _on_canvas_resize(self, event=None):
+        if self.decoder:
+            self.decoder.set_target_size(self._display_size())
+        
+    def _show_frame(self, frame_index=None, allow_ahead=False):
+        """
+        Display the decoded frame due at frame_index (default: current frame).
+        Only blits: decoding, colour conversion and scaling happen on the decoder thread.
+        Returns True if a frame was shown.
+        """
+        if not self.decoder:
+            return False
+        
+        item = self.decoder.take(self.current_frame if frame_index is None else frame_index, allow_ahead)
+        if item is None:
+            return False
+        index, image = item
+        self.current_frame = index
+        
+        # Convert to PhotoImage (must happen on the Tk thread) and update canvas
         self._photo_image = ImageTk.PhotoImage(image)
-        
-        # Update canvas
         self.canvas.configure(image=self._photo_image, text="")
         
         # Update UI if not seeking (to prevent feedback loop)
         if not self._seeking:
             self.seek_slider.set(self.current_frame)
             self._update_time_display()
+        return True
+        
+    def _await_frame(self, frame_index, attempts=200):
+        """While paused: show the frame at frame_index once the decoder has produced it."""
+        self._await_job = None
+        if self.is_playing or not self.decoder:
+            return
+        if self._show_frame(frame_index, allow_ahead=True):
+            return
+        if attempts > 0:
+            self._await_job = self.after(15, self._await_frame, frame_index, attempts - 1)
+        
+    def _clock_frame(self):
+        """Frame that should be on screen now: audio position if audio is playing, else wall clock."""
+        if self._audio_loaded:
+            # Samples actually played (hardware clock), None until audio is flowing
+            audio_pos = self.audio.position()
+            if audio_pos is not None:
+                return int(audio_pos * self.fps)
+        elapsed = time.perf_counter() - self._clock_started_at
+        return int((self._clock_start_secs + elapsed) * self.fps)
+        
+    def _start_clock(self, seconds):
+        self._clock_start_secs = seconds
+        self._clock_started_at = time.perf_counter()
         
     def _update_loop(self):
-        """Main video playback loop with audio sync."""
-        if not self.is_playing:
+        """Main video playback loop with audio sync (blits whatever frame is due)."""
+        self._update_job = None
+        if not self.is_playing or not self.decoder:
             return
             
-        # Audio-driven sync
-        if self._audio_loaded and pygame.mixer.music.get_busy():
-            # Use mixer.music.get_pos() for hardware-clock sync
-            # get_pos() returns ms played since last play()
-            audio_pos_ms = pygame.mixer.music.get_pos()
-            
-            if audio_pos_ms >= 0:
-                elapsed = audio_pos_ms / 1000.0
-                expected_time = self._audio_start_offset + elapsed
-                expected_frame = int(expected_time * self.fps)
-            
-            # If video is lagging behind audio
-            if expected_frame > self.current_frame:
-                # Catch up by skipping frames
-                # If lag is large (> 5 frames), just jump to it
-                if expected_frame - self.current_frame > 5:
-                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, expected_frame)
-                    # Check where we actually landed (keyframe snap)
-                    actual_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-                    
-                    # If we snapped to before our target, grab frames to catch up
-                    # Limit to 50 frames to prevent freeze
-                    if actual_frame < expected_frame:
-                         frames_to_skip = min(expected_frame - actual_frame, 50)
-                         for _ in range(frames_to_skip):
-                             self.cap.grab()
-                         actual_frame += frames_to_skip
-                         
-                    self.current_frame = actual_frame
-                else:
-                    # Small lag, fast forward
-                    while self.current_frame < expected_frame:
-                        self.cap.grab()
-                        self.current_frame += 1
-            
-            # If video is ahead of audio
-            elif expected_frame < self.current_frame:
-                # Wait for audio to catch up
-                delay_ms = int((self.current_frame - expected_frame) / self.fps * 1000)
-                if delay_ms > 10:
-                    # Reschedule loop with delay
-                    self._update_job = self.after(min(delay_ms, 100), self._update_loop)
-                    return
-
-        self._show_frame()
+        # Audio-driven sync: the decoder skips or seeks to keep up with this clock,
+        # and take() drops frames that are already late
+        expected_frame = self._clock_frame()
+        self.decoder.set_clock(expected_frame)
+        self._show_frame(expected_frame)
         
-        if self.is_playing and self.current_frame < self.total_frames:
-            self._update_job = self.after(self.frame_delay, self._update_loop)
-        else:
+        if self.decoder.finished() or expected_frame >= self.total_frames:
             self.is_playing = False
+            self.decoder.set_playing(False)
             self.btn_play.configure(text="▶")
             if self._audio_loaded:
-                pygame.mixer.music.stop()
+                self.audio.stop()
+            return
+        
+        # Poll at twice the frame rate so a frame is never shown more than half a frame late
+        self._update_job = self.after(max(5, self.frame_delay // 2), self._update_loop)
                 
     def _on_seek_slider(self, value):
         """Handle seek slider movement."""
-        if not self.cap:
+        if not self.decoder:
             return
-        self._seeking = True
         frame_num = int(float(value))
-        frame_num = max(0, min(frame_num, self.total_frames - 1))
-        # Video seek
-        # Video seek
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-        
-        # PRECISION SEEK: Check where we actually landed
-        actual_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
         
-        # If we landed significantly before target (keyframe snap), forward to target
-        if actual_frame < frame_num:
-            frames_to_skip = min(frame_num - actual_frame, 300) # Limit 300 frames (~10s)
-            for _ in range(frames_to_skip):
-                self.cap.grab()
+        if self.thumbnails is not None:
+            # Scrubbing: show the cached thumbnail now, do the real seek on release
+            self._scrubbing = True
+            self._seeking = True
+            self._show_scrub_preview(frame_num)
+            return
         
-        # IMPORTANT: _show_frame will update self.current_frame to the ACTUAL position
-        self._show_frame()
+        # No thumbnails yet: seek directly (asynchronous, the decoder does the work)
+        self._seeking = True
+        self._seek_frame(frame_num)
         self._update_time_display()
+        self._seeking = False
         
-        # Sync audio to actual video position
-        if self._audio_loaded and self.is_playing:
-            # Use actual current frame for audio sync to prevent drift
-            seek_secs = self.current_frame / self.fps if self.fps > 0 else 0
-            pygame.mixer.music.play(start=seek_secs)
-            pygame.mixer.music.set_volume(self.volume)
-            
-            # Reset sync timers
-            # get_pos() resets to 0 on play()
-            self._audio_start_offset = seek_secs
-            
+    def _show_scrub_preview(self, frame_num):
+        seconds = frame_num / self.fps if self.fps > 0 else 0
+        image = self.thumbnails.image_at(seconds)
+        if image is None:
+            return
+        self._scrub_photo = ImageTk.PhotoImage(image)
+        self.scrub_preview.configure(image=self._scrub_photo, text=self._format_time(seconds))
+        
+        # Above the slider, following the handle
+        fraction = frame_num / max(self.total_frames, 1)
+        slider_x = self.seek_slider.winfo_x() + self.seek_slider.master.winfo_x()
+        x = slider_x + fraction * self.seek_slider.winfo_width()
+        y = self.seek_slider.master.winfo_y()
+        self.scrub_preview.place(x=x, y=y, anchor="s")
+        self.scrub_preview.lift()
+        
+        total_secs = self.total_frames / self.fps if self.fps > 0 else 0
+        self.time_label.configure(text=f"{self._format_time(seconds)} / {self._format_time(total_secs)}")
+        
+    def _on_seek_release(self, event=None):
+        """End of a scrub: hide the preview and seek for real."""
+        if not self._scrubbing:
+            return
+        self._scrubbing = False
+        self.scrub_preview.place_forget()
+        self._seek_frame(int(float(self.seek_slider.get())))
+        self._update_time_display()
         self._seeking = False
         
     def _on_volume_change(self, value):
@@ -387,11 +488,11 @@ class VideoPlayer(ctk.CTkFrame):
             self.volume_icon.configure(text="🔊")
         # Update audio volume
         if self._audio_loaded:
-            pygame.mixer.music.set_volume(self.volume)
+            self.audio.set_volume(self.volume)
         
     def _update_time_display(self):
         """Update the time display label."""
-        if not self.cap:
+        if not self.decoder:
             return
         current_secs = self.current_frame / self.fps if self.fps > 0 else 0
         total_secs = self.total_frames / self.fps if self.fps > 0 else 0
@@ -409,7 +510,7 @@ class VideoPlayer(ctk.CTkFrame):
             
     def _toggle_playback(self):
         """Toggle video play/pause."""
-        if not self.cap:
+        if not self.decoder:
             return
             
         if self.is_playing:
@@ -419,19 +520,18 @@ class VideoPlayer(ctk.CTkFrame):
 
     def play(self):
         """Start playback with audio."""
-        if not self.cap:
+        if not self.decoder:
             return
         self.is_playing = True
         self.btn_play.configure(text="⏸")
         
+        current_secs = self.current_frame / self.fps if self.fps > 0 else 0
+        self._start_clock(current_secs)
+        self.decoder.set_playing(True)
+        
         # Start audio from current position
         if self._audio_loaded:
-            current_secs = self.current_frame / self.fps if self.fps > 0 else 0
-            pygame.mixer.music.play(start=current_secs)
-            pygame.mixer.music.set_volume(self.volume)
-            
-            # Sync initialization
-            self._audio_start_offset = current_secs
+            self.audio.play(current_secs)
             
         self._update_loop()
         
@@ -442,59 +542,49 @@ class VideoPlayer(ctk.CTkFrame):
         if self._update_job:
             self.after_cancel(self._update_job)
             self._update_job = None
+        if self.decoder:
+            self.decoder.set_playing(False)
         # Pause audio
         if self._audio_loaded:
-            pygame.mixer.music.pause()
+            self.audio.pause()
             
     def stop(self):
         """Stop playback and reset position."""
         self.pause()
-        if self.cap:
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            self.current_frame = 0
+        if self.decoder:
+            self._seek_frame(0)
             self.seek_slider.set(0)
             self._update_time_display()
         # Stop audio
         if self._audio_loaded:
-            pygame.mixer.music.stop()
-            self._audio_paused = False
+            self.audio.stop()
             
     def seek(self, seconds):
         """Seek to a specific time in seconds."""
-        if not self.cap:
+        if not self.decoder:
             return
-        frame_num = int(seconds * self.fps)
-        frame_num = max(0, min(frame_num, self.total_frames - 1))
-        # Seek video
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+        self._seek_frame(int(seconds * self.fps))
+        self._update_time_display()
         
-        # PRECISION SEEK: Check where we actually landed
-        actual_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+    def _seek_frame(self, frame_num):
+        """Restart decoding at frame_num and move the clock and audio there."""
+        frame_num = max(0, min(frame_num, self.total_frames - 1))
+        # The decoder thread does the (slow) keyframe seek; we show the frame when it arrives
+        self.decoder.seek(frame_num)
+        self.current_frame = frame_num
         
-        # If we landed significantly before target (keyframe snap), forward to target
-        if actual_frame < frame_num:
-            frames_to_skip = min(frame_num - actual_frame, 300) # Limit 300 frames (~10s)
-            for _ in range(frames_to_skip):
-                self.cap.grab()
+        seek_secs = frame_num / self.fps if self.fps > 0 else 0
+        self._start_clock(seek_secs)
         
-        # Update current frame to ACTUAL position
-        self._show_frame()
-        self._update_time_display()
+        # Sync audio to the new position
+        # (streamed audio restarts its decode at the new offset)
+        if self._audio_loaded and self.is_playing:
+            self.audio.play(seek_secs)
         
-        # Sync audio to ACTUAL position
-        if self._audio_loaded:
-            actual_seconds = self.current_frame / self.fps if self.fps > 0 else 0
-            
-            if self.is_playing:
-                pygame.mixer.music.play(start=actual_seconds)
-                pygame.mixer.music.set_volume(self.volume)
-                
-                # Reset sync timers
-                self._audio_start_offset = actual_seconds
-                
-            # Invalidate pause state so next play() restarts from new position
-            self._audio_paused = False
-
+        if not self.is_playing:
+            if self._await_job:
+                self.after_cancel(self._await_job)
+            self._await_frame(frame_num)
 
 
 class SpeakerRenameDialog(ctk.CTkToplevel):
@@ -580,22 +670,36 @@ class TranscriptionApp(ctk.CTk):
         self.minsize(800, 600)
         
         # Application state
-        self.transcript_data = []
+        self.transcript_data = SegmentStore()  # columnar, behaves like a list of segment dicts
         self.speaker_names = {}
         self.video_path = None
         
         # Threading state
+        # Messages from the job worker: (msg_type, job_id, data)
         self.transcription_queue = queue.Queue()
-        self.transcription_thread = None
-        self.is_transcribing = False
-        
-        # Rendering state
-        self.batch_size = 50
-        self.current_render_index = 0
+        self._stage_progress = {}
+        self._speakers_pending = False
+        self._export_cancel = None  # threading.Event of the running export, if any
+        
+        # Job queue: videos are transcribed one after another on the shared models
+        # The transcript panel follows display_job_id; other jobs run in the background
+        self.scheduler = JobScheduler(
+            self._transcription_worker,
+            on_update=lambda job: self.transcription_queue.put(("job_update", job.id, None))
+        )
+        self.display_job_id = None
+        self._job_segments = {}  # job id -> SegmentStore of segments streamed so far (for switching to a running job)
+        self._job_rows = {}      # job id -> widgets of its row in the queue panel
         
         # Following Mode State
         self.following_mode = False
         self._last_highlighted_index = -1
+        self._time_index = SegmentTimeIndex()  # playback time -> segment (bisect)
+        self._search_index = TranscriptSearchIndex()  # word -> segments (inverted index)
+        self._search_hits = []
+        self._search_pos = -1
+        self._search_job = None
+        self._search_source = None  # transcript the hit list belongs to
         
         self.init_ui()
         
@@ -617,6 +721,11 @@ class TranscriptionApp(ctk.CTk):
                                              command=self.start_transcription, state="disabled")
         self.btn_transcribe.pack(side="left", padx=5, pady=10)
         
+        # Queue several videos at once (they run after the current job)
+        self.btn_queue_files = ctk.CTkButton(toolbar, text="➕ Queue Files", width=110,
+                                              command=self.queue_files)
+        self.btn_queue_files.pack(side="left", padx=5, pady=10)
+        
         # Speaker Count Hint
         ctk.CTkLabel(toolbar, text="Speaker Count:").pack(side="left", padx=(10, 2))
         self.entry_speakers = ctk.CTkEntry(toolbar, width=50, placeholder_text="Auto")
@@ -628,7 +737,7 @@ class TranscriptionApp(ctk.CTk):
                                          command=self.rename_speaker_dialog)
         self.btn_rename.pack(side="left", padx=5, pady=10)
         
-        self.btn_export = ctk.CTkButton(toolbar, text="📄 Export PDF", width=120, command=self.export_pdf)
+        self.btn_export = ctk.CTkButton(toolbar, text="📄 Export", width=120, command=self.export_transcript)
         self.btn_export.pack(side="left", padx=5, pady=10)
         
         # Following Mode Toggle
@@ -637,9 +746,43 @@ class TranscriptionApp(ctk.CTk):
                                          command=self.toggle_following_mode)
         self.btn_follow.pack(side="left", padx=5, pady=10)
         
+        # Stats panel toggle (timing breakdown of the last run)
+        self.btn_stats = ctk.CTkButton(toolbar, text="📊 Stats", width=80,
+                                        fg_color="#424242", hover_color="#616161",
+                                        command=self.toggle_stats_panel)
+        self.btn_stats.pack(side="left", padx=5, pady=10)
+        
+        # Job queue panel toggle
+        self.btn_jobs = ctk.CTkButton(toolbar, text="📋 Jobs", width=90,
+                                       fg_color="#424242", hover_color="#616161",
+                                       command=self.toggle_queue_panel)
+        self.btn_jobs.pack(side="left", padx=5, pady=10)
+        
+        # ===== JOB QUEUE PANEL (hidden until toggled) =====
+        self.queue_frame = ctk.CTkFrame(self)
+        queue_header = ctk.CTkFrame(self.queue_frame, fg_color="transparent")
+        queue_header.pack(fill="x", padx=10, pady=(5, 0))
+        ctk.CTkLabel(queue_header, text="Jobs", anchor="w").pack(side="left")
+        ctk.CTkButton(queue_header, text="Clear finished", width=110,
+                      fg_color="#424242", hover_color="#616161",
+                      command=self.clear_finished_jobs).pack(side="right")
+        self.queue_list = ctk.CTkScrollableFrame(self.queue_frame, height=140)
+        self.queue_list.pack(fill="x", padx=10, pady=5)
+        self.lbl_queue_empty = ctk.CTkLabel(self.queue_list, text="No jobs yet.", text_color="#9e9e9e")
+        self.lbl_queue_empty.pack(anchor="w")
+        self.queue_visible = False
+        
+        # ===== STATS PANEL (hidden until toggled) =====
+        self.stats_frame = ctk.CTkFrame(self)
+        self.lbl_stats = ctk.CTkLabel(self.stats_frame, text="No run yet.", anchor="w", justify="left",
+                                       font=("Consolas", 12))
+        self.lbl_stats.pack(fill="x", padx=10, pady=5)
+        self.stats_visible = False
+        
         # ===== MAIN CONTENT (Video + Transcript) =====
         content_frame = ctk.CTkFrame(self, fg_color="transparent")
         content_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.content_frame = content_frame
         
         # Configure grid weights for responsive layout
         content_frame.grid_columnconfigure(0, weight=2)
@@ -653,14 +796,37 @@ class TranscriptionApp(ctk.CTk):
         # Transcript area
         transcript_frame = ctk.CTkFrame(content_frame, corner_radius=10)
         transcript_frame.grid(row=0, column=1, sticky="nsew", padx=(5, 0), pady=0)
-        transcript_frame.grid_rowconfigure(0, weight=1)
+        transcript_frame.grid_rowconfigure(1, weight=1)
         transcript_frame.grid_columnconfigure(0, weight=1)
         
+        # Search bar: Enter / arrows jump between hits and seek the video there
+        search_frame = ctk.CTkFrame(transcript_frame, fg_color="transparent")
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(10, 0))
+        self.entry_search = ctk.CTkEntry(search_frame, placeholder_text='Search transcript (words, "phrase", prefix*)')
+        self.entry_search.pack(side="left", fill="x", expand=True)
+        self.btn_search_next = ctk.CTkButton(search_frame, text="▼", width=30, command=lambda: self.search_step(1))
+        self.btn_search_next.pack(side="right", padx=(5, 0))
+        self.btn_search_prev = ctk.CTkButton(search_frame, text="▲", width=30, command=lambda: self.search_step(-1))
+        self.btn_search_prev.pack(side="right", padx=(5, 0))
+        self.lbl_search = ctk.CTkLabel(search_frame, text="", width=80)
+        self.lbl_search.pack(side="right", padx=(5, 0))
+        self.entry_search.bind("<KeyRelease>", self.on_search_typed)
+        self.entry_search.bind("<Return>", lambda e: self.search_step(1))
+        self.entry_search.bind("<Shift-Return>", lambda e: self.search_step(-1))
+        self.entry_search.bind("<Escape>", lambda e: self.clear_search())
+        
+        # The textbox only holds a window of segments (see transcript_view.py);
+        # the separate scrollbar covers the whole transcript
         self.transcript_box = ctk.CTkTextbox(transcript_frame, wrap="word", font=("Segoe UI", 13),
-                                              state="disabled", cursor="arrow")
-        self.transcript_box.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        
-        # Bind scroll event for infinite loading AND disable following mode
+                                              state="disabled", cursor="arrow", activate_scrollbars=False)
+        self.transcript_box.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=10)
+        self.transcript_scrollbar = ctk.CTkScrollbar(transcript_frame, orientation="vertical")
+        self.transcript_scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 5), pady=10)
+        self.transcript_view = VirtualTranscriptView(self.transcript_box, self._format_segment,
+                                                     scrollbar=self.transcript_scrollbar,
+                                                     speaker_colors=SPEAKER_COLORS)
+        
+        # Bind scroll event to disable following mode
         self.transcript_box.bind("<MouseWheel>", self.on_transcript_scroll)
         self.transcript_box.bind("<Button-1>", self.on_transcript_click)
         self.transcript_box.bind("<Motion>", self.on_transcript_hover)
@@ -673,13 +839,17 @@ class TranscriptionApp(ctk.CTk):
         self.lbl_status = ctk.CTkLabel(status_frame, text="Ready", anchor="w")
         self.lbl_status.pack(side="left", padx=10, pady=5)
         
+        # Transcript cache stats (filled in after the first job)
+        self.lbl_cache = ctk.CTkLabel(status_frame, text="", anchor="e", text_color="#9e9e9e")
+        self.lbl_cache.pack(side="right", padx=10, pady=5)
+        
         self.progress_bar = ctk.CTkProgressBar(status_frame, width=300)
         self.progress_bar.pack(side="right", padx=10, pady=10)
         self.progress_bar.set(0)
         self.progress_bar.pack_forget()
 
-        # Start scroll polling
-        self.check_scroll_position()
+        # Job messages are polled for the lifetime of the window
+        self.after(100, self.poll_transcription)
         
     def open_file(self):
         """Open a video file."""
@@ -695,117 +865,265 @@ class TranscriptionApp(ctk.CTk):
                 self.video_player.load(file_path)
                 self.btn_transcribe.configure(state="normal")
                 log_debug(f"Video loaded: {file_path}")
+                
+                # If this file was already queued or transcribed, show that job
+                for job in self.scheduler.jobs():
+                    if job.video_path == file_path and job.status != CANCELLED:
+                        self.show_job(job)
+                        break
             except Exception as e:
                 log_debug(f"Error loading video: {e}")
                 messagebox.showerror("Error", f"Could not load video: {e}")
             
     def start_transcription(self):
-        """Start the transcription process in a background thread."""
-        if not self.video_path or self.is_transcribing:
+        """Queue the loaded video; its transcript is shown as it comes in."""
+        if not self.video_path:
             return
-            
-        self.is_transcribing = True
-        self.lbl_status.configure(text="Processing... (This may take a minute)")
-        self.progress_bar.pack(side="right", padx=10, pady=10)
-        self.progress_bar.set(0)
-        self.btn_transcribe.configure(state="disabled")
         
-        # Set loading message
-        self.transcript_box.configure(state="normal")
-        self.transcript_box.delete("1.0", "end")
-        self.transcript_box.insert("1.0", "⏳ Transcribing... please wait.")
-        self.transcript_box.configure(state="disabled")
+        # Already queued or running? Just show it
+        for job in self.scheduler.jobs():
+            if job.video_path == self.video_path and job.is_active:
+                self.show_job(job)
+                return
+            
+        job = self.scheduler.submit(self.video_path, num_speakers=self._parse_speaker_count())
+        self.show_job(job)
         
-        # Parse speaker count
-        num_speakers = None
+    def queue_files(self):
+        """Queue several videos; they run in the background after the current job."""
+        file_paths = filedialog.askopenfilenames(
+            title="Queue Videos",
+            filetypes=[("Video Files", "*.mp4 *.mkv *.avi"), ("All Files", "*.*")]
+        )
+        if not file_paths:
+            return
+        num_speakers = self._parse_speaker_count()
+        for path in file_paths:
+            self.scheduler.submit(path, num_speakers=num_speakers)
+        if not self.queue_visible:
+            self.toggle_queue_panel()
+            
+    def _parse_speaker_count(self):
+        """Speaker count hint from the toolbar (None = auto)."""
         try:
             val = self.entry_speakers.get().strip()
             if val:
-                num_speakers = int(val)
+                return int(val)
         except ValueError:
             pass # Use auto
-
-        # Start background thread
-        self.transcription_thread = threading.Thread(
-            target=self._transcription_worker,
-            args=(self.video_path, num_speakers),
-            daemon=True
-        )
-        self.transcription_thread.start()
+        return None
         
-        # Start polling for results
-        self.after(100, self.poll_transcription)
+    def show_job(self, job):
+        """Point the transcript panel (and progress bar) at a job."""
+        self.display_job_id = job.id
+        self._stage_progress = {}
         
-    def _transcription_worker(self, video_path, num_speakers=None):
-        """Background worker for transcription."""
-        try:
-            # Lazy Import Backend (Optimizes Startup Time)
-            from transcribe import VideoTranscriber
-            
-            # Create transcriber and store reference to prevent GC during GUI session
-            # CRITICAL: If transcriber is garbage collected while CUDA resources exist,
-            # it causes a crash in the tkinter mainloop
-            transcriber = VideoTranscriber(model_size="medium", use_cuda=True)
+        if job.status == DONE:
+            self.transcript_view.show_message("")  # start at the top of the other transcript
+            self.on_transcription_finished(job)
+            return
+        
+        # Segments stream in while Whisper runs; speakers arrive with the final result.
+        # A running job's store is shown directly, so streamed segments are kept only once.
+        if job.status in (RUNNING, QUEUED):
+            self.transcript_data = self._job_segments.setdefault(job.id, SegmentStore())
+        else:
+            self.transcript_data = SegmentStore()
+        self._speakers_pending = True
+        self._clear_following_highlight()
+        
+        if job.status == RUNNING:
+            self.transcript_view.show_message("⏳ Transcribing... please wait.")
+            self.lbl_status.configure(text="Processing... (This may take a minute)")
+            self.progress_bar.pack(side="right", padx=10, pady=10)
+            self.progress_bar.set(job.progress / 100.0)
+        elif job.status == QUEUED:
+            self.transcript_view.show_message("🕒 Queued - waiting for the jobs ahead of it.")
+            self.lbl_status.configure(text=f"Queued: {job.name}")
+            self.progress_bar.pack_forget()
+        else:
+            self.transcript_view.show_message(f"Job {job.status}.")
+            self.progress_bar.pack_forget()
+        
+        if self.transcript_data and job.status == RUNNING:
+            self.transcript_view.update(self.transcript_data)
+        self._run_search()
+        
+    def _transcription_worker(self, job):
+        """Runs one job on the scheduler thread; returns (results, transcriber)."""
+        # Lazy Import Backend (Optimizes Startup Time)
+        from transcribe import VideoTranscriber
+        
+        # Create transcriber and store reference to prevent GC during GUI session
+        # CRITICAL: If transcriber is garbage collected while CUDA resources exist,
+        # it causes a crash in the tkinter mainloop
+        # Models come from the process-wide registry, so only the first job pays the load cost
+        transcriber = VideoTranscriber(model_size="medium", use_cuda=True)
+        
+        def progress_callback(percent):
+            job.progress = percent
+            self.transcription_queue.put(("progress", job.id, percent))
             
-            def progress_callback(percent):
-                self.transcription_queue.put(("progress", percent))
-                
-            results = transcriber.process_video(video_path, num_speakers=num_speakers, progress_callback=progress_callback)
+        def stage_callback(stage, percent):
+            self.transcription_queue.put(("stage_progress", job.id, (stage, percent)))
             
-            # Pass transcriber reference along with results to keep it alive
-            self.transcription_queue.put(("finished", (results, transcriber)))
+        def segment_callback(segment):
+            # Copy: the worker fills in the speaker later, the GUI gets the final list on "finished"
+            self.transcription_queue.put(("segment", job.id, dict(segment)))
             
-        except Exception as e:
-            self.transcription_queue.put(("error", str(e)))
+        # cancel_event is checked between segments; cancelling raises JobCancelled out of here
+        results = transcriber.process_video(job.video_path, num_speakers=job.num_speakers,
+                                            progress_callback=progress_callback,
+                                            stage_callback=stage_callback,
+                                            segment_callback=segment_callback,
+                                            cancel_event=job.cancel_event)
+        
+        # Pass transcriber reference along with results to keep it alive
+        return results, transcriber
             
     def poll_transcription(self):
-        """Poll the transcription queue for results."""
+        """Poll the job message queue (runs every 100ms for the lifetime of the window)."""
+        streamed = {}
+        jobs_changed = False
         try:
             while True:
                 try:
-                    msg_type, data = self.transcription_queue.get_nowait()
+                    msg_type, job_id, data = self.transcription_queue.get_nowait()
+                except queue.Empty:
+                    break
+                    
+                is_displayed = job_id == self.display_job_id
+                
+                if msg_type == "segment":
+                    streamed.setdefault(job_id, []).append(data)
                     
-                    if msg_type == "progress":
+                elif msg_type == "progress":
+                    if is_displayed:
                         self.progress_bar.set(data / 100.0)
+                    row = self._job_rows.get(job_id)
+                    if row:
+                        row["progress"].set(data / 100.0)
                         
-                    elif msg_type == "finished":
-                        self.on_transcription_finished(data)
-                        return
+                elif msg_type == "stage_progress":
+                    if is_displayed:
+                        stage, percent = data
+                        self._stage_progress[stage] = percent
+                        self.lbl_status.configure(text=self._format_stage_progress())
                         
-                    elif msg_type == "error":
-                        self.on_transcription_error(data)
-                        return
+                elif msg_type == "export_progress":
+                    done, total = data
+                    if self._export_cancel is not None and not self._export_cancel.is_set():
+                        percent = f" {100 * done // total}%" if total else ""
+                        self.lbl_status.configure(text=f"Exporting...{percent}")
                         
-                except queue.Empty:
-                    break
+                elif msg_type == "export_finished":
+                    self.on_export_finished(*data)
+                        
+                elif msg_type == "job_update":
+                    # Flush segments first so they land before the final result
+                    self._flush_streamed(streamed)
+                    streamed = {}
+                    jobs_changed = True
+                    job = self.scheduler.get(job_id)
+                    if job:
+                        self.on_job_update(job)
+                        
+            self._flush_streamed(streamed)
+            if jobs_changed:
+                self.refresh_queue_panel()
                     
         except Exception as e:
             log_debug(f"Poll error: {e}")
             
-        if self.is_transcribing:
-            self.after(100, self.poll_transcription)
+        self.after(100, self.poll_transcription)
+        
+    def _flush_streamed(self, streamed):
+        for job_id, segments in streamed.items():
+            if job_id == self.display_job_id:
+                # transcript_data is this job's store (see show_job)
+                self.on_segments_streamed(segments)
+            else:
+                self._job_segments.setdefault(job_id, SegmentStore()).extend(segments)
+                
+    def on_job_update(self, job):
+        """A job changed state (started, finished, failed, cancelled, reprioritised)."""
+        is_displayed = job.id == self.display_job_id
+        
+        if job.status == RUNNING:
+            if job.cancel_event.is_set():
+                self.lbl_status.configure(text=f"Cancelling: {job.name}...")
+            elif is_displayed:
+                self.show_job(job)
+            else:
+                self.lbl_status.configure(text=f"Transcribing in background: {job.name}")
             
-    def on_transcription_finished(self, data):
-        """Handle transcription completion."""
+        elif job.status == DONE:
+            self._job_segments.pop(job.id, None)
+            results, transcriber = job.result
+            self._transcriber = transcriber  # Store to keep alive
+            if transcriber.result_cache:
+                self.lbl_cache.configure(text=transcriber.result_cache.stats_text())
+            self.update_stats_panel(transcriber.last_run_stats)
+            if is_displayed:
+                self.on_transcription_finished(job)
+            else:
+                self.lbl_status.configure(text=f"Finished: {job.name}")
+                
+        elif job.status == FAILED:
+            self._job_segments.pop(job.id, None)
+            if is_displayed:
+                self.on_transcription_error(job.error)
+            else:
+                self.lbl_status.configure(text=f"Failed: {job.name} ({job.error})")
+                
+        elif job.status == CANCELLED:
+            self._job_segments.pop(job.id, None)
+            if is_displayed:
+                # Keep whatever was streamed; the checkpoint lets a re-queue resume from here
+                self._speakers_pending = False
+                self.progress_bar.pack_forget()
+            self.lbl_status.configure(text=f"Cancelled: {job.name}")
+            
+    def on_segments_streamed(self, segments):
+        """Show segments as Whisper produces them (speakers are filled in when diarization finishes)."""
+        self.transcript_data.extend(segments)
+        
+        # The first batch replaces the "please wait" message; later ones only fill the
+        # rendered window (the scrollbar grows with the rest)
+        self.transcript_view.update(self.transcript_data)
+        
+        # Index every batch as it arrives (a few ms), so neither a search nor the final
+        # result has to tokenize the whole transcript at once on this thread
+        self._search_index.sync(self.transcript_data)
+        if self.entry_search.get().strip():
+            self._run_search()
+        
+    def _format_stage_progress(self):
+        """Status text for the stages running in parallel, e.g. 'Transcribing 40% | Diarizing 25%'."""
+        labels = {"transcription": "Transcribing", "diarization": "Diarizing"}
+        parts = [f"{labels.get(stage, stage)} {percent}%" for stage, percent in self._stage_progress.items()]
+        return " | ".join(parts)
+        
+    def on_transcription_finished(self, job):
+        """Show a finished job's transcript."""
         try:
             # Unpack results and transcriber reference
             # CRITICAL: Keep transcriber reference to prevent CUDA cleanup crash
-            results, transcriber = data
+            results, transcriber = job.result
             self._transcriber = transcriber  # Store to keep alive
             
             print("Processing finished.")
             flush_log()
             
+            # Same segments as streamed, now with speakers: keep the search index built meanwhile
+            if self._search_index.rebind(results) and self._search_source is self.transcript_data:
+                self._search_source = results
             self.transcript_data = results
-            self.is_transcribing = False
+            self._speakers_pending = False
             
             # Update UI
             self.progress_bar.pack_forget()
-            self.lbl_status.configure(text="Done")
-            self.btn_transcribe.configure(state="normal")
-            
-            # Clean up thread reference
-            self.transcription_thread = None
+            self.lbl_status.configure(text=f"Done: {job.name} ({transcriber.registry.stats_text()})")
             
             # Render transcript
             self.render_transcript()
@@ -822,61 +1140,23 @@ class TranscriptionApp(ctk.CTk):
             
     def on_transcription_error(self, err_msg):
         """Handle transcription error."""
-        self.is_transcribing = False
+        self._speakers_pending = False
         self.progress_bar.pack_forget()
         self.lbl_status.configure(text=f"Error: {err_msg}")
-        self.btn_transcribe.configure(state="normal")
         
-        self.transcript_box.configure(state="normal")
-        self.transcript_box.delete("1.0", "end")
-        self.transcript_box.insert("1.0", f"❌ Error: {err_msg}")
-        self.transcript_box.configure(state="disabled")
+        self.transcript_view.show_message(f"❌ Error: {err_msg}")
         
     def render_transcript(self):
-        """Render the transcript data to the text box."""
-        print("[RENDER] render_transcript START")
-        flush_log()
-        
+        """Render the transcript data to the text box (only the visible window is built)."""
         try:
-            # Capture current state to restore after refresh
-            saved_yview = self.transcript_box.yview()
-            saved_index = self.current_render_index
-            
-            self.transcript_box.configure(state="normal")
-            self.transcript_box.delete("1.0", "end")
-            self.current_render_index = 0
-            
-            # Configure text tags for styling
-            # Timestamps styled to look clickable (cyan, underlined)
-            self.transcript_box.tag_config("timestamp", foreground="#4fc3f7", underline=True)
-            for i, color in enumerate(SPEAKER_COLORS):
-                self.transcript_box.tag_config(f"speaker_{i}", foreground=color)
-            self.transcript_box.tag_config("text", foreground="#ffffff")
-            
             if len(self.transcript_data) == 0:
-                self.transcript_box.insert("1.0", "No transcript data available.")
-                self.transcript_box.configure(state="disabled")
+                self.transcript_view.show_message("No transcript data available.")
                 return
             
-            # Render up to what was previously rendered (or at least one batch)
-            # We temporarily adjust batch_size to render everything in one go for efficiency
-            original_batch_size = self.batch_size
-            target_amount = max(saved_index, original_batch_size)
-            self.batch_size = target_amount
-            
-            self.append_batch()
-            
-            # Restore original batch size
-            self.batch_size = original_batch_size
-            
-            self.transcript_box.configure(state="disabled")
-            
-            # Restore scroll position
-            if saved_yview:
-                self.transcript_box.yview_moveto(saved_yview[0])
-            
-            print("[RENDER] render_transcript END")
-            flush_log()
+            # Keeps the current scroll position (rename, or final result replacing the streamed segments)
+            self.transcript_view.render(self.transcript_data, keep_position=True)
+            if self.entry_search.get().strip():
+                self._run_search()
             
         except Exception as e:
             print(f"[RENDER] EXCEPTION: {e}")
@@ -884,122 +1164,131 @@ class TranscriptionApp(ctk.CTk):
             traceback.print_exc()
             flush_log()
             
-    def append_batch(self):
-        """Append the next batch of transcript items."""
-        if self.current_render_index >= len(self.transcript_data):
-            return
-            
-        start = self.current_render_index
-        end = min(start + self.batch_size, len(self.transcript_data))
+    def _format_segment(self, item):
+        """Display strings for one segment: (timestamp, speaker name, speaker tag, text)."""
+        timestamp_str = self.format_time(item['start'])
+        text_content = item.get('text', '')
         
-        self.transcript_box.configure(state="normal")
-        
-        for item in self.transcript_data[start:end]:
-            timestamp_str = self.format_time(item['start'])
-            raw_speaker = item.get('speaker', 'Unknown')
-            display_name = self.speaker_names.get(raw_speaker, raw_speaker)
-            text_content = item.get('text', '')
-            
-            # Get speaker color index
-            try:
-                speaker_idx = int(raw_speaker.split(" ")[-1]) % len(SPEAKER_COLORS)
-            except:
-                speaker_idx = 0
-                
-            start_ms = int(item['start'] * 1000)
-            
-            # Insert timestamp (clickable - styled to look interactive)
-            ts_tag = f"ts_{start_ms}"
-            self.transcript_box.tag_config(ts_tag, foreground="#4fc3f7", underline=True)
-            self.transcript_box.insert("end", f"[{timestamp_str}] ", ("timestamp", ts_tag))
-            
-            # Insert speaker name
-            self.transcript_box.insert("end", f"{display_name}: ", f"speaker_{speaker_idx}")
-            
-            # Insert text
-            self.transcript_box.insert("end", f"{text_content}\n\n", "text")
-            
-        self.current_render_index = end
-        self.transcript_box.configure(state="disabled")
+        if 'speaker' not in item and self._speakers_pending:
+            # Streamed segment, diarization still running
+            return timestamp_str, "…", "speaker_pending", text_content
         
-        print(f"[BATCH] Rendered items {start} to {end}")
-        flush_log()
+        raw_speaker = item.get('speaker', 'Unknown')
+        display_name = self.speaker_names.get(raw_speaker, raw_speaker)
         
-    def check_scroll_position(self):
-        """Periodically check scroll position for infinite loading (handles scrollbar dragging)."""
+        # Get speaker color index
         try:
-            # If the widget exists and is mapped
-            if self.transcript_box.winfo_exists():
-                bottom_visible = self.transcript_box.yview()[1]
-                # If we are near the bottom and have more data to render
-                if bottom_visible > 0.95 and self.current_render_index < len(self.transcript_data):
-                    self.append_batch()
-                
-                # Check again in 200ms
-                self.after(200, self.check_scroll_position)
-        except Exception:
-            pass
-
+            speaker_idx = int(raw_speaker.split(" ")[-1]) % len(SPEAKER_COLORS)
+        except:
+            speaker_idx = 0
+        return timestamp_str, display_name, f"speaker_{speaker_idx}", text_content
+        
     def on_transcript_scroll(self, event):
-        """Handle scroll event for infinite loading and disable following mode."""
+        """Handle scroll event to disable following mode (the view re-windows itself)."""
         try:
             # Disable following mode when user manually scrolls
             if self.following_mode:
                 self.following_mode = False
                 self.btn_follow.configure(fg_color="#424242")
                 self._clear_following_highlight()
-            
-            bottom_visible = self.transcript_box.yview()[1]
-            if bottom_visible > 0.9 and self.current_render_index < len(self.transcript_data):
-                self.append_batch()
         except:
             pass
             
     def on_transcript_hover(self, event):
         """Handle hover over transcript to show clickable cursor and highlight timestamps."""
         try:
-            index = self.transcript_box.index(f"@{event.x},{event.y}")
-            tags = self.transcript_box.tag_names(index)
-            
-            # Find if hovering over a timestamp tag
-            hovered_ts_tag = None
-            for tag in tags:
-                if tag.startswith("ts_"):
-                    hovered_ts_tag = tag
-                    break
-            
-            # Reset previously hovered tag if different
-            if hasattr(self, '_last_hovered_tag') and self._last_hovered_tag:
-                if self._last_hovered_tag != hovered_ts_tag:
-                    # Reset to normal color
-                    self.transcript_box.tag_config(self._last_hovered_tag, foreground="#4fc3f7")
-            
-            if hovered_ts_tag:
-                # Highlight hovered timestamp with brighter color
-                self.transcript_box.tag_config(hovered_ts_tag, foreground="#ffeb3b")
-                self.transcript_box.configure(cursor="hand2")
-                self._last_hovered_tag = hovered_ts_tag
-            else:
-                self.transcript_box.configure(cursor="arrow")
-                self._last_hovered_tag = None
+            # Position -> segment through the view's line table (no per-segment tags)
+            index = self.transcript_view.timestamp_at(event.x, event.y)
+            self.transcript_view.set_hover(index)
+            self.transcript_box.configure(cursor="hand2" if index >= 0 else "arrow")
         except:
             pass
             
     def on_transcript_click(self, event):
         """Handle click on transcript to seek video."""
         try:
-            index = self.transcript_box.index(f"@{event.x},{event.y}")
-            tags = self.transcript_box.tag_names(index)
-            
-            for tag in tags:
-                if tag.startswith("ts_"):
-                    timestamp_ms = int(tag[3:])
-                    self.video_player.seek(timestamp_ms / 1000)
-                    log_debug(f"Seeking to {timestamp_ms}ms")
-                    break
+            index = self.transcript_view.timestamp_at(event.x, event.y)
+            if index >= 0:
+                seconds = self.transcript_view.segments[index]['start']
+                self.video_player.seek(seconds)
+                log_debug(f"Seeking to {int(seconds * 1000)}ms")
         except Exception as e:
             log_debug(f"Click handling error: {e}")
     
+    def on_search_typed(self, event=None):
+        """Re-run the search shortly after typing stops."""
+        if event is not None and event.keysym in ("Return", "Escape", "Shift_L", "Shift_R"):
+            return
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self._run_search)
+        
+    def _run_search(self):
+        """Query the inverted index (indexing only segments added since the last search)."""
+        self._search_job = None
+        query = self.entry_search.get().strip()
+        current = self._search_hits[self._search_pos] if 0 <= self._search_pos < len(self._search_hits) else -1
+        if self._search_source is not self.transcript_data:
+            # Another job (or the final result) is shown: the old position means nothing there
+            self._search_source = self.transcript_data
+            self.transcript_view.clear_search_hit()
+            current = -1
+        if not query:
+            self._search_hits = []
+            self._search_pos = -1
+            self.lbl_search.configure(text="")
+            self.transcript_view.clear_search_hit()
+            return
+        
+        self._search_index.sync(self.transcript_data)
+        self._search_hits = self._search_index.search(query)  # sorted int64 array
+        # Keep the position on the same segment when the hit list is refreshed
+        pos = bisect.bisect_left(self._search_hits, current)
+        found = pos < len(self._search_hits) and self._search_hits[pos] == current
+        self._search_pos = pos if found else -1
+        self._update_search_label()
+        
+    def _update_search_label(self):
+        count = len(self._search_hits)
+        if count == 0:
+            self.lbl_search.configure(text="No matches")
+        elif self._search_pos < 0:
+            self.lbl_search.configure(text=f"{count} matches")
+        else:
+            self.lbl_search.configure(text=f"{self._search_pos + 1}/{count}")
+            
+    def search_step(self, delta):
+        """Jump to the next (1) or previous (-1) hit and seek the video to it."""
+        if (self._search_job or self._search_source is not self.transcript_data
+                or len(self._search_index) != len(self.transcript_data)):
+            # Typed but not searched yet, or the transcript changed since
+            if self._search_job:
+                self.after_cancel(self._search_job)
+            self._run_search()
+        if len(self._search_hits) == 0:
+            return
+        
+        if self._search_pos < 0:
+            # First jump: forward to the first hit at or after the top of the view,
+            # backward to the last hit before it (wrapping around at either end)
+            pos = bisect.bisect_left(self._search_hits, self.transcript_view.top_segment())
+            if delta > 0:
+                self._search_pos = pos if pos < len(self._search_hits) else 0
+            else:
+                self._search_pos = (pos - 1) % len(self._search_hits)
+        else:
+            self._search_pos = (self._search_pos + delta) % len(self._search_hits)
+        self._update_search_label()
+        
+        index = int(self._search_hits[self._search_pos])
+        self.transcript_view.show_search_hit(index)
+        if self.video_player.decoder:
+            self.video_player.seek(self.transcript_data[index]['start'])
+        
+    def clear_search(self):
+        self.entry_search.delete(0, "end")
+        self._run_search()
+        
     def toggle_following_mode(self):
         """Toggle the following mode on/off."""
         self.following_mode = not self.following_mode
@@ -1021,71 +1310,25 @@ class TranscriptionApp(ctk.CTk):
             
         try:
             # Get current video position in seconds
-            if not self.video_player.cap:
+            if not self.video_player.decoder:
                 self.after(200, self._update_following_highlight)
                 return
                 
             current_time = self.video_player.current_frame / self.video_player.fps if self.video_player.fps > 0 else 0
             
-            # Find the transcript segment that matches current time
-            current_index = -1
-            for i, item in enumerate(self.transcript_data):
-                if item['start'] <= current_time < item.get('end', item['start'] + 10):
-                    current_index = i
-                    break
+            # Find the transcript segment that matches current time (bisect, not a scan)
+            self._time_index.sync(self.transcript_data)
+            current_index = self._time_index.find(current_time)
             
             # Only update if we moved to a different segment
             if current_index != self._last_highlighted_index and current_index >= 0:
-                self._clear_following_highlight()
                 self._last_highlighted_index = current_index
                 
-                # FORCE RENDER if segment hasn't been loaded yet
-                if current_index >= self.current_render_index:
-                    # We need to render up to (and including) this segment
-                    segments_needed = current_index - self.current_render_index + 1
-                    original_batch_size = self.batch_size
-                    self.batch_size = segments_needed
-                    self.append_batch()
-                    self.batch_size = original_batch_size
-                
-                # Calculate the text position for this segment
-                # We need to find the line in the textbox corresponding to this segment
-                start_ms = int(self.transcript_data[current_index]['start'] * 1000)
-                tag_name = f"ts_{start_ms}"
-                
-                # Configure highlight tag
-                self.transcript_box.tag_config("following_highlight", background="#3a3a3a")
-                
-                # Find tag range and highlight the whole line
+                # The view renders the window around the segment if needed and centers it
                 try:
-                    tag_ranges = self.transcript_box.tag_ranges(tag_name)
-                    if tag_ranges:
-                        # Get the line containing this timestamp
-                        line_start = self.transcript_box.index(f"{tag_ranges[0]} linestart")
-                        line_end = self.transcript_box.index(f"{tag_ranges[1]} lineend +1 line")
-                        
-                        self.transcript_box.tag_add("following_highlight", line_start, line_end)
-                        
-                        # Auto-scroll to CENTER the highlighted text
-                        # Get the line number of the highlighted text
-                        line_num = int(line_start.split('.')[0])
-                        
-                        # Get total number of lines in the widget
-                        total_lines = int(self.transcript_box.index('end-1c').split('.')[0])
-                        
-                        # Calculate visible height as fraction of total
-                        visible_fraction = self.transcript_box.yview()[1] - self.transcript_box.yview()[0]
-                        
-                        # Calculate scroll position to center the line
-                        # We want the line to be in the middle of the visible area
-                        line_fraction = line_num / max(total_lines, 1)
-                        center_offset = visible_fraction / 2
-                        scroll_position = max(0, line_fraction - center_offset)
-                        
-                        self.transcript_box.yview_moveto(scroll_position)
+                    self.transcript_view.highlight(current_index, center=True)
                 except Exception as e:
                     log_debug(f"Highlight error: {e}")
-                    pass
                     
         except Exception as e:
             log_debug(f"Following highlight error: {e}")
@@ -1097,19 +1340,126 @@ class TranscriptionApp(ctk.CTk):
     def _clear_following_highlight(self):
         """Clear any existing following highlight."""
         try:
-            self.transcript_box.tag_remove("following_highlight", "1.0", "end")
+            self.transcript_view.clear_highlight()
             self._last_highlighted_index = -1
         except:
             pass
             
             
+    def toggle_stats_panel(self):
+        """Show/hide the per-stage timing breakdown of the last run."""
+        self.stats_visible = not self.stats_visible
+        if self.stats_visible:
+            self.stats_frame.pack(fill="x", padx=10, pady=5, before=self.content_frame)
+            self.btn_stats.configure(fg_color="#1976d2", hover_color="#1565c0")
+        else:
+            self.stats_frame.pack_forget()
+            self.btn_stats.configure(fg_color="#424242", hover_color="#616161")
+            
+    def toggle_queue_panel(self):
+        """Show/hide the job queue."""
+        self.queue_visible = not self.queue_visible
+        if self.queue_visible:
+            self.queue_frame.pack(fill="x", padx=10, pady=5, before=self.content_frame)
+            self.btn_jobs.configure(fg_color="#1976d2", hover_color="#1565c0")
+            self.refresh_queue_panel()
+        else:
+            self.queue_frame.pack_forget()
+            self.btn_jobs.configure(fg_color="#424242", hover_color="#616161")
+            
+    def refresh_queue_panel(self):
+        """Rebuild the job rows (only on state changes; progress updates touch the bars directly)."""
+        jobs = self.scheduler.jobs()
+        active = sum(1 for job in jobs if job.is_active)
+        self.btn_jobs.configure(text=f"📋 Jobs ({active})" if active else "📋 Jobs")
+        if not self.queue_visible:
+            return
+        
+        for row in self._job_rows.values():
+            row["frame"].destroy()
+        self._job_rows = {}
+        
+        if not jobs:
+            self.lbl_queue_empty.pack(anchor="w")
+            return
+        self.lbl_queue_empty.pack_forget()
+        
+        status_colors = {RUNNING: "#4fc3f7", DONE: "#66bb6a", FAILED: "#ef5350", CANCELLED: "#9e9e9e"}
+        for job in jobs:
+            frame = ctk.CTkFrame(self.queue_list, fg_color="transparent")
+            frame.pack(fill="x", pady=2)
+            
+            name = ("⭐ " if job.priority == PRIORITY_HIGH else "") + job.name
+            ctk.CTkLabel(frame, text=name, width=260, anchor="w").pack(side="left", padx=(0, 5))
+            ctk.CTkLabel(frame, text=job.status, width=80, anchor="w",
+                         text_color=status_colors.get(job.status, "#ffffff")).pack(side="left")
+            
+            progress = ctk.CTkProgressBar(frame, width=160)
+            progress.pack(side="left", padx=5)
+            progress.set(job.progress / 100.0)
+            
+            if job.status == QUEUED:
+                ctk.CTkButton(frame, text="▲", width=28,
+                              command=lambda j=job.id: self._move_job(j, -1)).pack(side="left", padx=1)
+                ctk.CTkButton(frame, text="▼", width=28,
+                              command=lambda j=job.id: self._move_job(j, 1)).pack(side="left", padx=1)
+                new_priority = PRIORITY_NORMAL if job.priority == PRIORITY_HIGH else PRIORITY_HIGH
+                ctk.CTkButton(frame, text="⭐", width=28,
+                              command=lambda j=job.id, p=new_priority: self._set_job_priority(j, p)
+                              ).pack(side="left", padx=1)
+            if job.is_active:
+                ctk.CTkButton(frame, text="✕ Cancel", width=70, fg_color="#b71c1c", hover_color="#d32f2f",
+                              command=lambda j=job.id: self.scheduler.cancel(j)).pack(side="left", padx=(5, 1))
+            if job.status in (RUNNING, DONE):
+                ctk.CTkButton(frame, text="Show", width=60,
+                              command=lambda j=job.id: self.open_job(j)).pack(side="left", padx=1)
+                
+            self._job_rows[job.id] = {"frame": frame, "progress": progress}
+            
+    def _move_job(self, job_id, delta):
+        self.scheduler.move(job_id, delta)
+        
+    def _set_job_priority(self, job_id, priority):
+        self.scheduler.set_priority(job_id, priority)
+        
+    def clear_finished_jobs(self):
+        self.scheduler.remove_finished()
+        self.refresh_queue_panel()
+        
+    def open_job(self, job_id):
+        """Load a job's video into the player and show its transcript."""
+        job = self.scheduler.get(job_id)
+        if not job:
+            return
+        if job.video_path != self.video_path:
+            try:
+                self.video_player.load(job.video_path)
+                self.video_path = job.video_path
+                self.speaker_names = {}
+                self.btn_transcribe.configure(state="normal")
+            except Exception as e:
+                log_debug(f"Error loading video: {e}")
+                messagebox.showerror("Error", f"Could not load video: {e}")
+                return
+        self.show_job(job)
+        
+    def update_stats_panel(self, record):
+        """Fill the stats panel from a telemetry record."""
+        if not record:
+            return
+        try:
+            from telemetry import format_record
+            self.lbl_stats.configure(text=format_record(record))
+        except Exception as e:
+            log_debug(f"Stats panel error: {e}")
+            
     def rename_speaker_dialog(self):
         """Show dialog to rename a speaker."""
         if not self.transcript_data:
             return
             
         # Get raw speaker IDs from transcript data
-        raw_speakers = sorted(list(set(x.get('speaker', 'Unknown') for x in self.transcript_data)))
+        raw_speakers = sorted(self.transcript_data.distinct_speakers(missing_label='Unknown'))
         if not raw_speakers:
             return
             
@@ -1138,29 +1488,67 @@ class TranscriptionApp(ctk.CTk):
             
         SpeakerRenameDialog(self, display_options, on_rename)
         
-    def export_pdf(self):
-        """Export transcript to PDF."""
+    def export_transcript(self):
+        """Export the transcript (PDF, SRT, WebVTT, JSONL) on a worker thread; the button cancels a running export."""
+        if self._export_cancel is not None:
+            self._export_cancel.set()
+            self.lbl_status.configure(text="Cancelling export...")
+            return
+            
         if not self.transcript_data:
             messagebox.showwarning("Export", "No transcript data to export.")
             return
-
-        # Lazy Import Export Utils
-        from export_utils import export_to_pdf
             
+        # Lazy Import Export Utils
+        from export_utils import EXPORTERS, exporter_for_path
+        
         file_path = filedialog.asksaveasfilename(
-            title="Save PDF",
+            title="Export Transcript",
             defaultextension=".pdf",
-            filetypes=[("PDF Files", "*.pdf")],
+            filetypes=[(exporter.label, f"*{exporter.extension}") for exporter in EXPORTERS.values()],
             initialfile="transcript.pdf"
         )
         
         if file_path:
-            try:
-                export_to_pdf(file_path, self.transcript_data, self.speaker_names)
-                self.lbl_status.configure(text=f"Saved to {file_path}")
-                log_debug(f"PDF exported to {file_path}")
-            except Exception as e:
-                messagebox.showerror("Export Error", f"Could not save PDF: {e}")
+            exporter = exporter_for_path(file_path)
+            if exporter is None:
+                messagebox.showerror("Export Error", f"Unknown export format: {os.path.basename(file_path)}")
+                return
+
+            # Snapshot: the transcript may still be growing (streaming) or get renamed speakers
+            segments = self.transcript_data.copy()
+            speaker_names = dict(self.speaker_names)
+            self._export_cancel = threading.Event()
+            self.btn_export.configure(text="✖ Cancel Export")
+            self.lbl_status.configure(text=f"Exporting {exporter.label}...")
+            threading.Thread(target=self._export_worker,
+                             args=(exporter, file_path, segments, speaker_names, self._export_cancel),
+                             daemon=True).start()
+            
+    def _export_worker(self, exporter, file_path, segments, speaker_names, cancel_event):
+        try:
+            exporter.export(file_path, segments, speaker_names,
+                          progress_callback=lambda done, total: self.transcription_queue.put(
+                              ("export_progress", None, (done, total))),
+                          cancel_event=cancel_event)
+            result = (file_path, None, False)
+        except JobCancelled:
+            result = (file_path, None, True)
+        except Exception as e:
+            result = (file_path, e, False)
+        self.transcription_queue.put(("export_finished", None, result))
+        
+    def on_export_finished(self, file_path, error, cancelled):
+        self._export_cancel = None
+        self.btn_export.configure(text="📄 Export")
+        if cancelled:
+            self.lbl_status.configure(text="Export cancelled")
+        elif error is not None:
+            self.lbl_status.configure(text="Export failed")
+            messagebox.showerror("Export Error", f"Could not export transcript: {error}")
+        else:
+            self.lbl_status.configure(text=f"Saved to {file_path}")
+            log_debug(f"Transcript exported to {file_path}")
                 
     def format_time(self, seconds):
         """Format seconds as HH:MM:SS or MM:SS."""
@@ -1175,20 +1563,35 @@ class TranscriptionApp(ctk.CTk):
             
             # Stop video playback
             if hasattr(self, 'video_player'):
-                self.video_player.stop()
-                if self.video_player.cap:
-                    self.video_player.cap.release()
+                self.video_player.pause()
+                self.video_player.close()
+            
+            # os._exit below would orphan a running proxy ffmpeg and leave its temp file
+            try:
+                from proxy_media import get_proxy_cache
+                get_proxy_cache().shutdown()
+            except Exception as e:
+                log_debug(f"Proxy shutdown failed: {e}")
             
-            # Stop audio explicitly
+            # Stop audio explicitly (stream threads first, then the mixer)
             try:
+                self.video_player._cleanup_audio()
                 if pygame.mixer.get_init():
                     pygame.mixer.music.stop()
                     pygame.mixer.quit()
             except:
                 pass
                     
-            # Wait for transcription thread if running
-            self.is_transcribing = False
+            # Save progress of a running transcription so it can resume next time
+            if self.scheduler.has_running():
+                try:
+                    from checkpoint import flush_open_checkpoints
+                    flush_open_checkpoints()
+                except Exception as e:
+                    log_debug(f"Checkpoint flush failed: {e}")
+            
+            # Stop the job queue (queued jobs are dropped, the running one is cancelled)
+            self.scheduler.shutdown()
             
             # Helper to delete temp audio file
             if hasattr(self.video_player, '_cleanup_audio'):
@@ -1208,6 +1611,7 @@ class TranscriptionApp(ctk.CTk):
 
 
 if __name__ == "__main__":
+    setup_logging()
     try:
         # Force garbage collection before starting GUI
         import gc
@@ -0,0 +1,129 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Default memory budget for cached models (MB). Can be overridden in .env
+DEFAULT_MEMORY_BUDGET_MB = 8000
+
+# Rough in-memory footprint of Whisper weights at float16 (MB)
+WHISPER_SIZE_MB = {
+    "tiny": 75,
+    "base": 145,
+    "small": 480,
+    "medium": 1500,
+    "large-v1": 3000,
+    "large-v2": 3000,
+    "large-v3": 3000,
+    "large": 3000,
+}
+COMPUTE_TYPE_SCALE = {"float32": 2.0, "float16": 1.0, "int8_float16": 0.6, "int8": 0.5}
+PYANNOTE_SIZE_MB = 250
+
+
+def estimate_whisper_mb(model_size, compute_type):
+    """Best-effort estimate of how much memory a Whisper model takes once loaded."""
+    base = WHISPER_SIZE_MB.get(model_size, WHISPER_SIZE_MB["medium"])
+    return int(base * COMPUTE_TYPE_SCALE.get(compute_type, 1.0))
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+    Each model is loaded once per key and handed out as a shared instance.
+    When the estimated total size goes over the memory budget, the least recently
+    used models are dropped (they are freed once no running job holds them).
+    """
+
+    def __init__(self, memory_budget_mb=None):
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv("MODEL_MEMORY_BUDGET_MB", DEFAULT_MEMORY_BUDGET_MB))
+        self.memory_budget_mb = memory_budget_mb
+
+        self._entries = OrderedDict()  # key -> (model, size_mb)
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> Lock, so one key is never loaded twice concurrently
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, loader, size_mb=0):
+        """
+        Returns the cached model for key, calling loader() to build it on a miss.
+        Exceptions from loader() propagate and nothing is cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have finished loading while we waited
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                self.misses += 1
+
+            model = loader()
+
+            with self._lock:
+                self._entries[key] = (model, size_mb)
+                self._evict_over_budget(keep=key)
+            return model
+
+    def _evict_over_budget(self, keep):
+        """Drop least recently used entries until we are under budget (lock must be held)."""
+        while self.used_mb > self.memory_budget_mb and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            del self._entries[oldest]
+            self.evictions += 1
+            print(f"Model registry: evicted {oldest} (over {self.memory_budget_mb:.0f} MB budget)")
+
+    def evict(self, key):
+        """Remove one model from the registry."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def used_mb(self):
+        return sum(size for _, size in self._entries.values())
+
+    def stats(self):
+        """Returns hit/miss/eviction counts and current memory use."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "loaded": [str(k) for k in self._entries],
+                "used_mb": self.used_mb,
+                "budget_mb": self.memory_budget_mb,
+            }
+
+    def stats_text(self):
+        s = self.stats()
+        return f"Models: {s['hits']} hits / {s['misses']} misses, {s['used_mb']:.0f}/{s['budget_mb']:.0f} MB"
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Returns the process-wide model registry."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+        return _default_registry
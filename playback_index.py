@@ -0,0 +1,73 @@
+import bisect
+
+from segment_store import SegmentStore
+
+# Segments without an end time are assumed to last this long (same as the old linear scan)
+DEFAULT_SEGMENT_SECONDS = 10
+
+
+class SegmentTimeIndex:
+    """
+    Start/end times of the transcript segments for "which segment is playing" lookups
+    in O(log n) instead of a linear scan every 200ms.
+    Whisper emits segments in start order, so the index is appended to as the transcript
+    grows (streaming) and only rebuilt when a different transcript list is shown.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.starts = []
+        self.ends = []
+        # Running max of ends. It is monotone even when segments overlap, so it can be bisected.
+        self._max_end = []
+        self._source = None
+        self._sorted = True
+
+    def __len__(self):
+        return len(self.starts)
+
+    def sync(self, segments):
+        """Makes the index match `segments`. Same list as last time: only new items are indexed."""
+        if segments is not self._source or len(segments) < len(self.starts):
+            self.clear()
+            self._source = segments
+        if len(segments) > len(self.starts):
+            if isinstance(segments, SegmentStore):
+                # Columnar transcript: copy the new part of the time columns in one go
+                done = len(self.starts)
+                self.extend_times(segments.starts[done:].tolist(), segments.ends[done:].tolist())
+            else:
+                self.extend(segments[len(self.starts):])
+
+    def extend(self, segments):
+        starts = [item['start'] for item in segments]
+        ends = [item.get('end', item['start'] + DEFAULT_SEGMENT_SECONDS) for item in segments]
+        self.extend_times(starts, ends)
+
+    def extend_times(self, starts, ends):
+        for start, end in zip(starts, ends):
+            if self.starts and start < self.starts[-1]:
+                self._sorted = False
+            self.starts.append(start)
+            self.ends.append(end)
+            self._max_end.append(max(end, self._max_end[-1]) if self._max_end else end)
+
+    def find(self, t):
+        """
+        Index of the first segment with start <= t < end, or -1 if none is playing.
+        With duplicate start times this is the first of them that still covers t.
+        """
+        if not self._sorted:
+            # Out-of-order input (should not happen with Whisper output): plain scan
+            for i, (start, end) in enumerate(zip(self.starts, self.ends)):
+                if start <= t < end:
+                    return i
+            return -1
+
+        # Every segment before lo ends at or before t; segment lo is the first that ends after t
+        lo = bisect.bisect_right(self._max_end, t)
+        if lo < len(self.starts) and self.starts[lo] <= t:
+            return lo
+        return -1
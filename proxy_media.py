@@ -0,0 +1,214 @@
+import os
+import subprocess
+import tempfile
+import threading
+
+from audio_decode import no_window_flags
+from job_queue import JobCancelled
+from result_cache import media_fingerprint
+
+# Proxy frame height (width follows the aspect ratio); the player canvas is smaller than this anyway
+PROXY_HEIGHT = 540
+
+# Keyframe every N frames: cheap seeks and cheap frame skipping, file size still small
+PROXY_GOP = 12
+
+# Sources get a proxy if they are taller than this or heavier than this bitrate
+DEFAULT_MIN_SOURCE_HEIGHT = 1440
+DEFAULT_MIN_SOURCE_MBPS = 40
+
+# Least recently used proxies are deleted above this total size (PROXY_CACHE_MB)
+DEFAULT_MAX_PROXY_CACHE_MB = 4096
+
+# How often a running transcode checks for cancellation
+CANCEL_POLL_SECONDS = 0.25
+
+
+def default_proxy_dir():
+    return os.path.join(os.getcwd(), "cache", "proxies")
+
+
+def proxy_enabled():
+    return os.getenv("PROXY_PLAYBACK", "1") == "1"
+
+
+def needs_proxy(video_path, frame_height, duration_seconds):
+    """True for sources that are expensive to decode at full size (4K, high-bitrate camera files)."""
+    if not proxy_enabled():
+        return False
+    min_height = int(os.getenv("PROXY_MIN_SOURCE_HEIGHT", DEFAULT_MIN_SOURCE_HEIGHT))
+    if frame_height > min_height:
+        return True
+    if duration_seconds <= 0:
+        return False
+    try:
+        mbps = os.path.getsize(video_path) * 8 / duration_seconds / 1e6
+    except OSError:
+        return False
+    return mbps > float(os.getenv("PROXY_MIN_SOURCE_MBPS", DEFAULT_MIN_SOURCE_MBPS))
+
+
+def transcode_proxy(video_path, output_path, fps, height=PROXY_HEIGHT, cancel_event=None, on_start=None):
+    """
+    Small H.264 copy for playback only: no audio (the player plays audio from the source),
+    short GOP, fast-decode tuning, same constant frame rate as the source so frame
+    numbers keep meaning the same thing after the player switches over.
+    Setting cancel_event kills ffmpeg and raises JobCancelled. on_start(proc) gets the
+    running process (so shutdown can kill it).
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-y", "-v", "error",
+        "-i", video_path,
+        "-an", "-sn", "-dn",
+        "-vf", f"scale=-2:{height}",
+        "-r", f"{fps:.6f}",
+        "-c:v", "libx264", "-preset", "veryfast", "-tune", "fastdecode", "-crf", "26",
+        "-g", str(PROXY_GOP), "-bf", "0",
+        "-pix_fmt", "yuv420p",
+        "-movflags", "+faststart",
+        "-f", "mp4", output_path,
+    ]
+    # stderr goes to a temp file so ffmpeg can never block on a full pipe
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=err,
+                                creationflags=no_window_flags())
+        if on_start:
+            on_start(proc)
+        while True:
+            try:
+                returncode = proc.wait(timeout=CANCEL_POLL_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel_event is not None and cancel_event.is_set():
+                    proc.kill()
+                    proc.wait()
+                    raise JobCancelled()
+        if returncode != 0:
+            err.seek(0)
+            message = err.read().decode(errors="replace")
+            raise RuntimeError(f"Proxy transcode failed for {video_path}: {message}")
+
+
+class ProxyCache:
+    """
+    On-disk cache of playback proxies (cache/proxies/<content hash>_<height>.mp4).
+    Transcodes run one at a time (each already uses every core), and least recently used
+    proxies are deleted once the total size goes over max_bytes.
+    """
+
+    def __init__(self, proxy_dir=None, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("PROXY_CACHE_MB", DEFAULT_MAX_PROXY_CACHE_MB)) * 1024 * 1024)
+        self.proxy_dir = proxy_dir or default_proxy_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._transcode_lock = threading.Lock()  # held by the one running transcode
+        self._active = None      # (ffmpeg process, temp path) of the running transcode
+        self._closed = False
+
+    def get(self, video_path, fps, height=PROXY_HEIGHT, cancel_event=None):
+        """
+        Returns the proxy path, transcoding on first use (blocking; call from a worker thread).
+        Waits while another file's proxy is being built. Setting cancel_event gives up
+        (waiting or transcoding) with JobCancelled.
+        """
+        os.makedirs(self.proxy_dir, exist_ok=True)
+        path = os.path.join(self.proxy_dir, f"{media_fingerprint(video_path)}_{height}.mp4")
+        if self._touch(path):
+            return path
+
+        while not self._transcode_lock.acquire(timeout=CANCEL_POLL_SECONDS):
+            if cancel_event is not None and cancel_event.is_set():
+                raise JobCancelled()
+        try:
+            # Built by the transcode we waited for (same file opened twice)?
+            if self._touch(path):
+                return path
+            if self._closed:
+                raise JobCancelled()
+
+            print(f"Building playback proxy for {video_path}...")
+            tmp_path = path + ".tmp.mp4"
+
+            def started(proc):
+                with self._lock:
+                    self._active = (proc, tmp_path)
+
+            try:
+                transcode_proxy(video_path, tmp_path, fps, height, cancel_event, on_start=started)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            finally:
+                with self._lock:
+                    self._active = None
+            print(f"Playback proxy ready: {path}")
+        finally:
+            self._transcode_lock.release()
+        self.evict(keep=path)
+        return path
+
+    def _touch(self, path):
+        """True if path exists; marks it recently used for eviction."""
+        try:
+            os.utime(path)
+            return True
+        except OSError:
+            return False
+
+    def evict(self, keep=None):
+        """Deletes least recently used proxies until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.proxy_dir):
+            full = os.path.join(self.proxy_dir, name)
+            if not name.endswith(".mp4") or name.endswith(".tmp.mp4") or full == keep:
+                continue
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, full))
+        total = sum(size for _, size, _ in entries)
+        if keep and os.path.exists(keep):
+            total += os.path.getsize(keep)
+        for _, size, full in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(full)
+                total -= size
+            except OSError:
+                pass  # Still open by the player (Windows)
+
+    def shutdown(self):
+        """Kills a running transcode and deletes its partial output (app exit)."""
+        with self._lock:
+            self._closed = True
+            active = self._active
+        if active is None:
+            return
+        proc, tmp_path = active
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+_proxy_cache = None
+_proxy_cache_lock = threading.Lock()
+
+
+def get_proxy_cache():
+    global _proxy_cache
+    with _proxy_cache_lock:
+        if _proxy_cache is None:
+            _proxy_cache = ProxyCache()
+        return _proxy_cache
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+
+# Default size limit for the on-disk transcript cache
+DEFAULT_MAX_CACHE_MB = 500
+
+# Content hash samples this many blocks spread evenly over the file
+FINGERPRINT_BLOCKS = 16
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+CACHE_VERSION = 1
+
+
+def media_fingerprint(path, blocks=FINGERPRINT_BLOCKS, block_size=FINGERPRINT_BLOCK_SIZE):
+    """
+    Fast content hash of a media file.
+    Hashes size + mtime and a fixed number of evenly spaced blocks instead of the whole
+    file, so a multi-GB recording is fingerprinted in milliseconds.
+    """
+    st = os.stat(path)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+
+    with open(path, "rb") as f:
+        if st.st_size <= blocks * block_size:
+            h.update(f.read())
+        else:
+            # First and last block are always included
+            step = (st.st_size - block_size) / (blocks - 1)
+            for i in range(blocks):
+                f.seek(int(i * step))
+                h.update(f.read(block_size))
+    return h.hexdigest()
+
+
+def make_cache_key(fingerprint, config):
+    """Combines a media fingerprint with the settings that affect the transcript."""
+    payload = json.dumps({"v": CACHE_VERSION, "media": fingerprint, "config": config}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of process_video results (one JSON file per key).
+    Least recently used entries are deleted once the total size goes over max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        if cache_dir is None:
+            cache_dir = os.path.join(os.getcwd(), "cache", "transcripts")
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("TRANSCRIPT_CACHE_MB", DEFAULT_MAX_CACHE_MB)) * 1024 * 1024)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Returns cached segments for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                segments = json.load(f)["segments"]
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Touch so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return segments
+
+    def put(self, key, segments, meta=None):
+        """Stores segments under key and evicts old entries if over the size limit."""
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # Segments may be a SegmentStore (dict-like views); JSON needs real dicts
+            json.dump({"meta": meta or {}, "segments": [dict(seg) for seg in segments]}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    total -= size
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            for _, _, name in self._entries():
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def stats_text(self):
+        s = self.stats()
+        return (f"Cache: {s['hits']} hits / {s['misses']} misses, "
+                f"{s['entries']} files, {s['bytes'] / (1024 * 1024):.1f}/{s['max_bytes'] / (1024 * 1024):.0f} MB")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Returns the process-wide transcript result cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
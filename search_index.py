@@ -0,0 +1,243 @@
+import bisect
+import re
+
+import numpy as np
+
+from segment_store import SegmentStore
+
+# Words as the index sees them (Unicode letters/digits, apostrophes inside words kept)
+TOKEN_RE = re.compile(r"\w+(?:'\w+)*")
+
+# Occurrence key = segment number << POSITION_BITS | word position in the segment
+POSITION_BITS = 16
+MAX_POSITION = (1 << POSITION_BITS) - 1
+
+# Smallest posting array allocated for a new token (arrays grow by doubling)
+MIN_POSTING_CAPACITY = 8
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def parse_query(query):
+    """
+    'budget numbers'   -> terms that must all occur, the last one as a prefix (search as you type)
+    '"next quarter"'   -> exact phrase (consecutive words)
+    '"next quar*"'     -> phrase whose last word is a prefix
+    Returns (terms, phrase, last_is_prefix).
+    """
+    query = query.strip()
+    phrase = len(query) >= 2 and query[0] == query[-1] == '"'
+    if phrase:
+        query = query[1:-1].strip()
+    terms = tokenize(query)
+    last_is_prefix = bool(terms) and (query.endswith("*") or not phrase)
+    return terms, phrase, last_is_prefix
+
+
+def _contains_sorted(values, sorted_keys):
+    """Boolean mask: which of values occur in sorted_keys (vectorized binary search)."""
+    if len(sorted_keys) == 0:
+        return np.zeros(len(values), dtype=bool)
+    idx = np.searchsorted(sorted_keys, values)
+    idx[idx == len(sorted_keys)] = 0
+    return sorted_keys[idx] == values
+
+
+def _intersect_segments(small, large, n_segments):
+    """Values of small that are also in large (both sorted segment numbers below n_segments)."""
+    if len(small) * 16 < len(large):
+        # Few candidates: binary search each of them
+        return small[_contains_sorted(small, large)]
+    # Comparable sizes: one pass over each through a presence table of all segments
+    present = np.zeros(n_segments, dtype=bool)
+    present[large] = True
+    return small[present[small]]
+
+
+def _segments_of(keys):
+    """Sorted unique segment numbers of sorted occurrence keys."""
+    segments = keys >> POSITION_BITS
+    if len(segments) > 1:
+        first = np.empty(len(segments), dtype=bool)
+        first[0] = True
+        np.not_equal(segments[1:], segments[:-1], out=first[1:])
+        segments = segments[first]
+    return segments
+
+
+class _Postings:
+    """token -> ascending int64 array with spare capacity (grows by doubling)."""
+
+    def __init__(self):
+        self.arrays = {}
+        self.lengths = {}  # token -> number of values in use
+
+    def __iter__(self):
+        return iter(self.arrays)
+
+    def get(self, token):
+        """The filled part of a token's array: a view, appends never write into it."""
+        array = self.arrays.get(token)
+        if array is None:
+            return np.empty(0, dtype=np.int64)
+        return array[:self.lengths[token]]
+
+    def append(self, token, values):
+        """Appends values (all greater than the stored ones); returns True for a new token."""
+        array = self.arrays.get(token)
+        used = self.lengths.get(token, 0)
+        end = used + len(values)
+        if array is None or end > len(array):
+            grown = np.empty(max(end, 2 * used, MIN_POSTING_CAPACITY), dtype=np.int64)
+            if array is not None:
+                grown[:used] = array[:used]
+            self.arrays[token] = grown
+        self.arrays[token][used:end] = values
+        self.lengths[token] = end
+        return array is None
+
+
+class TranscriptSearchIndex:
+    """
+    Positional inverted index over segment text: token -> occurrence keys
+    (segment number and word position packed in one int64, ascending).
+    Built incrementally like SegmentTimeIndex: syncing with the transcript that is already
+    indexed only tokenizes the segments that arrived since (streaming).
+    Each token has two int64 postings with spare capacity: its occurrence keys (phrases)
+    and the segments it occurs in (word queries). Queries get views of the filled part
+    without copying, and appends never touch the part a view covers.
+    Queries are vectorized binary searches between posting arrays: AND queries intersect
+    segment lists starting from the rarest term, phrases start from the rarest word and
+    check the other words at their offsets from it, and prefixes are resolved with a bisect over the
+    sorted vocabulary.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.postings = _Postings()          # token -> occurrence keys
+        self.segment_postings = _Postings()  # token -> segment numbers
+        self._source = None
+        self._indexed = 0
+        self._vocabulary = None   # sorted tokens, rebuilt lazily when new tokens appear
+        self._prefix_cache = {}   # (prefix, positional) -> (indexed count, postings) of the last lookups
+
+    def __len__(self):
+        return self._indexed
+
+    def sync(self, segments):
+        """Makes the index match `segments`; the same (growing) transcript is indexed incrementally."""
+        if segments is not self._source or len(segments) < self._indexed:
+            self.clear()
+            self._source = segments
+        if len(segments) > self._indexed:
+            self.extend(segments[self._indexed:])
+
+    def rebind(self, segments):
+        """
+        Points the index at another transcript with the same segment texts (the final result
+        replacing the streamed segments, where only speakers changed) instead of rebuilding it.
+        Returns False (index unchanged) if the segments differ.
+        """
+        source = self._source
+        if source is None or len(segments) != self._indexed or len(source) != self._indexed:
+            return False
+        if isinstance(source, SegmentStore) and isinstance(segments, SegmentStore):
+            same = source.same_texts(segments)
+        else:
+            same = all(a['text'] == b['text'] for a, b in zip(source, segments))
+        if same:
+            self._source = segments
+        return same
+
+    def extend(self, segments):
+        added = {}  # token -> (occurrence keys, segment numbers) from these segments
+        number = self._indexed
+        for item in segments:
+            base = number << POSITION_BITS
+            for position, token in enumerate(tokenize(item['text'])[:MAX_POSITION]):
+                entry = added.get(token)
+                if entry is None:
+                    entry = added[token] = ([], [])
+                keys, numbers = entry
+                keys.append(base + position)
+                if not numbers or numbers[-1] != number:
+                    numbers.append(number)
+            number += 1
+        self._indexed = number
+
+        # Append each token's new keys to its postings in one step
+        for token, (keys, numbers) in added.items():
+            if self.postings.append(token, keys):
+                self._vocabulary = None
+            self.segment_postings.append(token, numbers)
+
+    # ----- Queries -----
+
+    def search(self, query, limit=None):
+        """
+        Segment numbers matching query, in transcript order, as an int64 array
+        (see parse_query for the syntax).
+        """
+        terms, phrase, last_is_prefix = parse_query(query)
+        if not terms:
+            return np.empty(0, dtype=np.int64)
+
+        # Postings per query word (the last one: all words with that prefix)
+        postings = self.postings if phrase else self.segment_postings
+        lists = [postings.get(term) for term in (terms[:-1] if last_is_prefix else terms)]
+        if last_is_prefix:
+            lists.append(self._prefix_postings(terms[-1], phrase))
+        if any(len(values) == 0 for values in lists):
+            return np.empty(0, dtype=np.int64)
+
+        if phrase:
+            # Phrase start keys: from the rarest word's occurrences (shifted back by its place
+            # in the phrase), keep those where every other word i sits at start + i.
+            # A start shifted across a segment boundary lands on an impossible position.
+            order = sorted(range(len(lists)), key=lambda i: len(lists[i]))
+            starts = lists[order[0]] - order[0]
+            for i in order[1:]:
+                starts = starts[_contains_sorted(starts + i, lists[i])]
+                if len(starts) == 0:
+                    break
+            result = _segments_of(starts)
+        else:
+            # Segments containing every word, starting from the rarest
+            lists.sort(key=len)
+            result = lists[0]
+            for other in lists[1:]:
+                result = _intersect_segments(result, other, self._indexed)
+                if len(result) == 0:
+                    break
+
+        if limit is not None:
+            result = result[:limit]
+        return result
+
+    def _prefix_postings(self, prefix, positional):
+        """Merged postings of all tokens starting with prefix (cached until the index grows)."""
+        cached = self._prefix_cache.get((prefix, positional))
+        if cached is not None and cached[0] == self._indexed:
+            return cached[1]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        lo = bisect.bisect_left(self._vocabulary, prefix)
+        hi = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        tokens = self._vocabulary[lo:hi]
+        postings = self.postings if positional else self.segment_postings
+        if len(tokens) == 1:
+            values = postings.get(tokens[0])
+        elif tokens:
+            values = np.concatenate([postings.get(t) for t in tokens])
+            # Several words of one segment share a number; keys are unique already
+            values = np.sort(values) if positional else np.unique(values)
+        else:
+            values = np.empty(0, dtype=np.int64)
+        # Only the last prefix of each kind: typing replaces it with a longer one
+        self._prefix_cache = {key: value for key, value in self._prefix_cache.items() if key[1] != positional}
+        self._prefix_cache[(prefix, positional)] = (self._indexed, values)
+        return values
@@ -0,0 +1,304 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+# Speaker id of segments that have no speaker yet (streamed before diarization finished)
+NO_SPEAKER = -1
+
+# Columns every segment has; any other key (e.g. 'words') is kept per segment in a side table
+BASE_FIELDS = ("start", "end", "text")
+
+INITIAL_CAPACITY = 1024
+
+
+class SegmentStore:
+    """
+    Columnar transcript: start/end times in float64 arrays, interned speaker ids in an int32
+    array and all texts in one shared UTF-8 buffer addressed by offset and length.
+    That is ~30 bytes per segment plus its text, instead of a dict with four boxed values
+    (several hundred bytes), which is what dominates memory for very long archives.
+
+    Behaves like a list of segment dicts: len(), iteration, store[i] and store[a:b]
+    return lightweight dict-compatible views (no copies), and appending a dict adds a row.
+    Vectorized code can use the columns directly (starts, ends, speaker_ids).
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        capacity = max(1, capacity)
+        self._n = 0
+        self._start = np.empty(capacity, dtype=np.float64)
+        self._end = np.empty(capacity, dtype=np.float64)
+        self._speaker = np.empty(capacity, dtype=np.int32)
+        self._text_start = np.empty(capacity, dtype=np.int64)
+        self._text_len = np.empty(capacity, dtype=np.int32)
+        self._text = bytearray()
+        self.speakers = []        # speaker id -> label
+        self._speaker_ids = {}    # label -> speaker id
+        self._extras = {}         # row -> {key: value} for keys outside the columns
+
+    @classmethod
+    def from_dicts(cls, segments):
+        """Builds a store from any iterable of segment dicts (or views)."""
+        try:
+            capacity = len(segments)
+        except TypeError:
+            capacity = INITIAL_CAPACITY
+        store = cls(capacity)
+        store.extend(segments)
+        return store
+
+    # ----- List-like access -----
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield SegmentView(self, i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return SegmentSlice(self, range(*key.indices(self._n)))
+        return SegmentView(self, self._row(key))
+
+    def __repr__(self):
+        return f"<SegmentStore {self._n} segments, {len(self.speakers)} speakers>"
+
+    def _row(self, index):
+        index = int(index)
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("segment index out of range")
+        return index
+
+    # ----- Columns -----
+
+    @property
+    def starts(self):
+        return self._start[:self._n]
+
+    @property
+    def ends(self):
+        return self._end[:self._n]
+
+    @property
+    def speaker_ids(self):
+        return self._speaker[:self._n]
+
+    @property
+    def nbytes(self):
+        """Memory held by the columns and the text buffer (allocated capacity)."""
+        columns = (self._start, self._end, self._speaker, self._text_start, self._text_len)
+        return sum(c.nbytes for c in columns) + len(self._text)
+
+    # ----- Adding rows -----
+
+    def append(self, item):
+        if self._n == len(self._start):
+            self._grow(self._n + 1)
+        self._set_row(self._n, item)
+        self._n += 1
+
+    def extend(self, items):
+        """Appends many segments, filling each column in one vectorized step."""
+        items = items if isinstance(items, list) else list(items)
+        count = len(items)
+        if count == 0:
+            return
+        lo, hi = self._n, self._n + count
+        if hi > len(self._start):
+            self._grow(hi)
+
+        self._start[lo:hi] = np.fromiter((item["start"] for item in items), dtype=np.float64, count=count)
+        self._end[lo:hi] = np.fromiter((item["end"] for item in items), dtype=np.float64, count=count)
+        speaker_id = self.speaker_id
+        self._speaker[lo:hi] = np.fromiter((speaker_id(item.get("speaker")) for item in items),
+                                           dtype=np.int32, count=count)
+
+        encoded = [item.get("text", "").encode("utf-8") for item in items]
+        lengths = np.fromiter((len(data) for data in encoded), dtype=np.int64, count=count)
+        self._text_len[lo:hi] = lengths
+        self._text_start[lo:hi] = len(self._text) + np.cumsum(lengths) - lengths
+        self._text += b"".join(encoded)
+
+        for offset, item in enumerate(items):
+            if len(item) > len(BASE_FIELDS) + ("speaker" in item):
+                self._set_extras(lo + offset, item)
+        self._n = hi
+
+    def _grow(self, needed):
+        capacity = max(needed, len(self._start) * 2)
+        for name in ("_start", "_end", "_speaker", "_text_start", "_text_len"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def _set_row(self, row, item):
+        self._start[row] = item["start"]
+        self._end[row] = item["end"]
+        self._speaker[row] = self.speaker_id(item.get("speaker"))
+        self._store_text(row, item.get("text", ""))
+        self._set_extras(row, item)
+
+    def _set_extras(self, row, item):
+        extras = {k: v for k, v in item.items() if k not in BASE_FIELDS and k != "speaker"}
+        if extras:
+            self._extras[row] = extras
+        else:
+            self._extras.pop(row, None)
+
+    def _store_text(self, row, text):
+        data = text.encode("utf-8")
+        self._text_start[row] = len(self._text)
+        self._text_len[row] = len(data)
+        self._text += data
+
+    # ----- Speakers -----
+
+    def speaker_id(self, label):
+        """Interned id of a speaker label (NO_SPEAKER for None)."""
+        if label is None:
+            return NO_SPEAKER
+        speaker = self._speaker_ids.get(label)
+        if speaker is None:
+            speaker = self._speaker_ids[label] = len(self.speakers)
+            self.speakers.append(label)
+        return speaker
+
+    def set_speaker_ids(self, rows, speaker_ids):
+        """Vectorized speaker update (ids from speaker_id())."""
+        self._speaker[:self._n][rows] = speaker_ids
+
+    def distinct_speakers(self, missing_label=None):
+        """Labels of the speakers that occur in the transcript (plus missing_label if some rows have none)."""
+        used = np.unique(self.speaker_ids)
+        labels = [self.speakers[i] for i in used if i != NO_SPEAKER]
+        if missing_label is not None and len(used) and used[0] == NO_SPEAKER and missing_label not in labels:
+            labels.append(missing_label)
+        return labels
+
+    # ----- Fields -----
+
+    def get_field(self, row, key):
+        if key == "start":
+            return float(self._start[row])
+        if key == "end":
+            return float(self._end[row])
+        if key == "text":
+            offset = int(self._text_start[row])
+            return self._text[offset:offset + int(self._text_len[row])].decode("utf-8")
+        if key == "speaker":
+            speaker = int(self._speaker[row])
+            if speaker == NO_SPEAKER:
+                raise KeyError(key)
+            return self.speakers[speaker]
+        extras = self._extras.get(row)
+        if extras is None or key not in extras:
+            raise KeyError(key)
+        return extras[key]
+
+    def set_field(self, row, key, value):
+        if key == "start":
+            self._start[row] = value
+        elif key == "end":
+            self._end[row] = value
+        elif key == "text":
+            # The old bytes stay in the buffer; edits are rare compared to appends
+            self._store_text(row, value)
+        elif key == "speaker":
+            self._speaker[row] = self.speaker_id(value)
+        else:
+            self._extras.setdefault(row, {})[key] = value
+
+    def row_keys(self, row):
+        keys = ["start", "end", "text"]
+        if self._speaker[row] != NO_SPEAKER:
+            keys.append("speaker")
+        extras = self._extras.get(row)
+        if extras:
+            keys.extend(extras)
+        return keys
+
+    def same_texts(self, other):
+        """True if other has the same number of segments with the same texts (speakers/times ignored)."""
+        n = self._n
+        if other._n != n or not np.array_equal(self._text_len[:n], other._text_len[:n]):
+            return False
+        # Rows that were only appended lie back to back in row order: compare the buffers.
+        # (A text edit stores the new bytes at the end, so such a store takes the slow path.)
+        lengths = self._text_len[:n].astype(np.int64)
+        packed = np.cumsum(lengths) - lengths
+        total = int(lengths.sum())
+        if (len(self._text) == total and len(other._text) == total
+                and np.array_equal(self._text_start[:n], packed)
+                and np.array_equal(other._text_start[:n], packed)):
+            return self._text == other._text
+        return all(self.get_field(row, "text") == other.get_field(row, "text") for row in range(n))
+
+    # ----- Copies -----
+
+    def copy(self):
+        """Independent copy (column copies, no per-segment objects)."""
+        store = SegmentStore(max(self._n, 1))
+        for name in ("_start", "_end", "_speaker", "_text_start", "_text_len"):
+            getattr(store, name)[:self._n] = getattr(self, name)[:self._n]
+        store._n = self._n
+        store._text = bytearray(self._text)
+        store.speakers = list(self.speakers)
+        store._speaker_ids = dict(self._speaker_ids)
+        store._extras = {row: dict(extras) for row, extras in self._extras.items()}
+        return store
+
+    def to_dicts(self):
+        """Plain list of dicts (for JSON and other code that needs real dicts)."""
+        return [dict(view) for view in self]
+
+
+class SegmentView(Mapping):
+    """One row of a SegmentStore as a read/write dict-like object (seg['text'], seg.get('speaker'))."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        return self.store.get_field(self.index, key)
+
+    def __setitem__(self, key, value):
+        self.store.set_field(self.index, key, value)
+
+    def __iter__(self):
+        return iter(self.store.row_keys(self.index))
+
+    def __len__(self):
+        return len(self.store.row_keys(self.index))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class SegmentSlice:
+    """A range of rows of a SegmentStore (what store[a:b] returns; shares the store's data)."""
+
+    __slots__ = ("store", "rows")
+
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        store = self.store
+        for row in self.rows:
+            yield SegmentView(store, row)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return SegmentSlice(self.store, self.rows[key])
+        return SegmentView(self.store, self.rows[key])
@@ -0,0 +1,250 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import numpy as np
+
+from audio_decode import SAMPLE_RATE
+
+# Don't bother sharding below this much audio per shard
+MIN_SHARD_SECONDS = 120
+
+# Threads each worker process gives to ctranslate2 when shards="auto"
+THREADS_PER_SHARD = 4
+
+# Extra audio given to each shard on both sides of its cut (cuts are in silence, this is a safety margin)
+SHARD_PADDING_SECONDS = 1.0
+
+
+def auto_shard_count(duration_seconds, cpu_count=None):
+    """How many worker processes to use for a file of this length on this machine."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    by_cores = max(1, cpu_count // THREADS_PER_SHARD)
+    by_length = max(1, int(duration_seconds // MIN_SHARD_SECONDS))
+    return min(by_cores, by_length)
+
+
+def find_split_points(audio, n_shards, vad_parameters=None):
+    """
+    Picks n_shards - 1 cut points (in samples) inside silences found by Silero VAD,
+    as close as possible to an even split. Falls back to even cuts if there are no gaps.
+    """
+    total = len(audio)
+    targets = [total * k // n_shards for k in range(1, n_shards)]
+    if not targets:
+        return []
+
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    speech = get_speech_timestamps(audio, VadOptions(**(vad_parameters or {})))
+
+    # Midpoints of the silences between speech chunks
+    gaps = np.array([(a["end"] + b["start"]) // 2 for a, b in zip(speech, speech[1:])], dtype=np.int64)
+    if len(gaps) == 0:
+        return targets
+
+    cuts = []
+    last = 0
+    for target in targets:
+        # Nearest gap to the even-split target that keeps cuts strictly increasing
+        candidates = gaps[gaps > last]
+        if len(candidates) == 0:
+            break
+        cut = int(candidates[np.argmin(np.abs(candidates - target))])
+        if cut >= total:
+            break
+        cuts.append(cut)
+        last = cut
+    return cuts
+
+
+def plan_shards(total_samples, cuts, padding_seconds=SHARD_PADDING_SECONDS):
+    """
+    Returns (owned_start, owned_end, padded_start, padded_end) sample ranges per shard.
+    Each shard transcribes its padded range but only keeps segments it owns.
+    """
+    pad = int(padding_seconds * SAMPLE_RATE)
+    bounds = [0] + list(cuts) + [total_samples]
+    shards = []
+    for start, end in zip(bounds, bounds[1:]):
+        if end <= start:
+            continue
+        shards.append((start, end, max(0, start - pad), min(total_samples, end + pad)))
+    return shards
+
+
+def stitch_segments(shard_results, merged=None):
+    """
+    Merges per-shard segments (already in absolute time) into one ordered list.
+    Drops duplicates where both neighbours transcribed the same words around a cut.
+    Pass merged to keep extending an existing list; returns the segments that were added.
+    """
+    if merged is None:
+        merged = []
+    added = []
+    for segments in shard_results:
+        for seg in segments:
+            if merged:
+                prev = merged[-1]
+                if seg["text"] == prev["text"] and seg["start"] < prev["end"]:
+                    continue
+            merged.append(seg)
+            added.append(seg)
+    return added
+
+
+# ----- Worker process side -----
+
+_worker_model = None
+_worker_options = None
+
+
+def _init_worker(model_size, compute_type, cpu_threads, transcribe_options):
+    """Runs once per worker process: loads its own Whisper model with a fixed thread count."""
+    global _worker_model, _worker_options
+    from faster_whisper import WhisperModel
+
+    os.environ["HF_HOME"] = os.path.join(os.getcwd(), "models", "huggingface_cache")
+    local_model_path = os.path.join(os.getcwd(), "models", "whisper")
+    _worker_model = WhisperModel(model_size, device="cpu", compute_type=compute_type,
+                                 cpu_threads=cpu_threads, download_root=local_model_path)
+    _worker_options = transcribe_options
+
+
+def _transcribe_shard(audio, offset, owned_start, owned_end):
+    """Transcribes one shard and returns the segments it owns, in absolute time."""
+    segments, _ = _worker_model.transcribe(audio, **_worker_options)
+    result = []
+    for segment in segments:
+        start = segment.start + offset
+        end = segment.end + offset
+        # A segment belongs to the shard that contains its midpoint
+        mid = (start + end) / 2
+        if owned_start <= mid < owned_end:
+            item = {"start": start, "end": end, "text": segment.text.strip()}
+            if _worker_options.get("word_timestamps"):
+                item["words"] = [{"start": w.start + offset, "end": w.end + offset, "word": w.word}
+                                 for w in (segment.words or ())]
+            result.append(item)
+    return result
+
+
+# ----- Pool management -----
+
+class _PoolEntry:
+    def __init__(self, pool):
+        self.pool = pool
+        self.users = 0
+
+
+_pools = {}           # key -> _PoolEntry
+_latest_key = None    # configuration that stays warm once idle
+_pools_lock = threading.Lock()
+
+
+@contextmanager
+def _leased_pool(n_shards, model_size, compute_type, cpu_threads, transcribe_options):
+    """
+    Worker pools are kept warm between files so each process loads its model only once.
+    Files running in parallel (batch --jobs) may need different shard counts, so each
+    configuration gets its own pool. A pool is only shut down when nobody uses it: only
+    the most recently requested configuration is kept idle (each pool holds n_shards models).
+    """
+    global _latest_key
+    key = (n_shards, model_size, compute_type, cpu_threads, repr(sorted(transcribe_options.items())))
+    with _pools_lock:
+        entry = _pools.get(key)
+        if entry is None:
+            entry = _pools[key] = _PoolEntry(ProcessPoolExecutor(
+                max_workers=n_shards,
+                initializer=_init_worker,
+                initargs=(model_size, compute_type, cpu_threads, transcribe_options),
+            ))
+        entry.users += 1
+        _latest_key = key
+        _shutdown_idle_pools()
+    try:
+        yield entry.pool
+    finally:
+        with _pools_lock:
+            entry.users -= 1
+            _shutdown_idle_pools()
+
+
+def _shutdown_idle_pools():
+    """Shuts down unused pools other than the latest configuration (caller holds _pools_lock)."""
+    for key, entry in list(_pools.items()):
+        if entry.users == 0 and key != _latest_key:
+            entry.pool.shutdown(wait=False)
+            del _pools[key]
+
+
+@atexit.register
+def shutdown_pools():
+    with _pools_lock:
+        for entry in _pools.values():
+            entry.pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def transcribe_sharded(audio, n_shards, model_size, compute_type, transcribe_options,
+                       vad_parameters=None, progress_callback=None, segment_callback=None,
+                       time_offset=0.0):
+    """
+    Splits audio at VAD silences into n_shards chunks and transcribes them in a process pool.
+    Each process has its own CPU model and cpu_count // n_shards threads.
+    time_offset is where audio starts in the file (resume); shards return segments in that
+    absolute time, so stitching compares like with like.
+    Returns segments in the same format as VideoTranscriber.transcribe.
+    """
+    total = len(audio)
+    cuts = find_split_points(audio, n_shards, vad_parameters)
+    shards = plan_shards(total, cuts)
+    cpu_threads = max(1, (os.cpu_count() or 1) // len(shards))
+    print(f"Sharded transcription: {len(shards)} shards x {cpu_threads} threads")
+
+    with _leased_pool(len(shards), model_size, compute_type, cpu_threads, transcribe_options) as pool:
+        return _run_shards(pool, audio, shards, progress_callback, segment_callback, time_offset)
+
+
+def _run_shards(pool, audio, shards, progress_callback, segment_callback, time_offset=0.0):
+    total = len(audio)
+    futures = {}
+    for i, (owned_start, owned_end, padded_start, padded_end) in enumerate(shards):
+        future = pool.submit(
+            _transcribe_shard,
+            audio[padded_start:padded_end],
+            padded_start / SAMPLE_RATE + time_offset,
+            owned_start / SAMPLE_RATE + time_offset,
+            owned_end / SAMPLE_RATE + time_offset if owned_end < total else float("inf"),
+        )
+        futures[future] = i
+
+    results = [None] * len(shards)
+    merged = []
+    next_shard = 0
+    done_samples = 0
+    try:
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            done_samples += shards[i][1] - shards[i][0]
+
+            # Shards finish out of order; stitch (and stream) the completed prefix only
+            while next_shard < len(shards) and results[next_shard] is not None:
+                added = stitch_segments([results[next_shard]], merged)
+                if segment_callback:
+                    for seg in added:
+                        segment_callback(seg)
+                next_shard += 1
+
+            if progress_callback and total > 0:
+                progress_callback(int(done_samples / total * 100))
+    except BaseException:
+        # A callback raised (e.g. the job was cancelled): don't leave shards queued in the warm pool
+        for future in futures:
+            future.cancel()
+        raise
+
+    return merged
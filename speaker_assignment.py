@@ -0,0 +1,270 @@
+import numpy as np
+
+from segment_store import SegmentStore
+
+# Turns longer than this are indexed separately. One long turn (e.g. background speech under
+# the whole recording) would otherwise keep the running max end open, and every later query
+# would become a candidate against every turn since that long turn started.
+LONG_TURN_SECONDS = 60.0
+
+# Most (query, turn) candidate pairs materialized at once; best_speakers works in query chunks
+MAX_CANDIDATE_PAIRS = 1 << 21
+
+
+class SpeakerTimeline:
+    """
+    Diarization turns stored as parallel NumPy arrays (start, end, speaker id).
+    Turns are kept sorted by start time so overlap queries can use binary search
+    instead of comparing every Whisper segment against every turn.
+    """
+
+    def __init__(self, starts, ends, speaker_ids, labels):
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        speaker_ids = np.asarray(speaker_ids, dtype=np.int32)
+
+        # Stable sort keeps the original turn order for equal starts (used for tie-breaking)
+        order = np.argsort(starts, kind="mergesort")
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.speaker_ids = speaker_ids[order]
+        self.turn_order = order
+        self.labels = list(labels)
+
+        # Per band (normal turns, long turns): turn indices, their starts and the running max
+        # of their ends. The running max is monotone, so we can binary search it to find
+        # the first turn of the band that could still be "open" at a given time.
+        durations = self.ends - self.starts
+        self._bands = []
+        for in_band in (durations <= LONG_TURN_SECONDS, durations > LONG_TURN_SECONDS):
+            turns = np.flatnonzero(in_band)
+            if len(turns):
+                self._bands.append((turns, self.starts[turns], np.maximum.accumulate(self.ends[turns])))
+
+    @classmethod
+    def from_turns(cls, speaker_turns):
+        """Build from a list of {'start', 'end', 'speaker'} dicts."""
+        labels = []
+        label_ids = {}
+        ids = []
+        for turn in speaker_turns:
+            spk = turn["speaker"]
+            if spk not in label_ids:
+                label_ids[spk] = len(labels)
+                labels.append(spk)
+            ids.append(label_ids[spk])
+        starts = [t["start"] for t in speaker_turns]
+        ends = [t["end"] for t in speaker_turns]
+        return cls(starts, ends, ids, labels)
+
+    @classmethod
+    def from_annotation(cls, diarization):
+        """Build from a Pyannote Annotation (turn: Segment(start, end), track, label)."""
+        return cls.from_turns([
+            {"start": turn.start, "end": turn.end, "speaker": speaker}
+            for turn, _, speaker in diarization.itertracks(yield_label=True)
+        ])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _turn_ranges(self, q_starts, q_ends):
+        """Per band: (turn indices, first candidate position, candidate count per query)."""
+        ranges = []
+        for turns, starts, max_end in self._bands:
+            hi = np.searchsorted(starts, q_ends, side="left")
+            lo = np.searchsorted(max_end, q_starts, side="right")
+            ranges.append((turns, lo, np.maximum(hi - lo, 0)))
+        return ranges
+
+    def candidate_pairs(self, q_starts, q_ends):
+        """
+        Returns (query_idx, turn_idx) arrays for every turn that may overlap each query
+        interval. Only turns with start < q_end and running max end (within their band)
+        > q_start are produced, so the total work stays close to linear for real
+        diarization output, long turns included.
+        """
+        q_starts = np.asarray(q_starts, dtype=np.float64)
+        q_ends = np.asarray(q_ends, dtype=np.float64)
+
+        query_parts = []
+        turn_parts = []
+        for turns, lo, counts in self._turn_ranges(q_starts, q_ends):
+            total = int(counts.sum())
+            query_parts.append(np.repeat(np.arange(len(q_starts)), counts))
+            offsets = np.repeat(np.cumsum(counts) - counts, counts)
+            turn_parts.append(turns[np.arange(total) - offsets + np.repeat(lo, counts)])
+        if not query_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(query_parts), np.concatenate(turn_parts)
+
+    def best_speakers(self, q_starts, q_ends):
+        """
+        For each query interval, returns the index (into self.labels) of the speaker with
+        the largest total overlap, or -1 if nothing overlaps.
+        Ties go to the speaker whose overlapping turn comes first, like the old dict scan.
+        Queries are processed in chunks of at most MAX_CANDIDATE_PAIRS candidate pairs
+        (a single query with more candidates gets a chunk of its own).
+        """
+        q_starts = np.asarray(q_starts, dtype=np.float64)
+        q_ends = np.asarray(q_ends, dtype=np.float64)
+        n = len(q_starts)
+        result = np.full(n, -1, dtype=np.int32)
+        if n == 0 or len(self) == 0:
+            return result
+
+        counts = sum(band_counts for _, _, band_counts in self._turn_ranges(q_starts, q_ends))
+        cumulative = np.cumsum(counts)
+        lo = 0
+        while lo < n:
+            done = int(cumulative[lo - 1]) if lo else 0
+            hi = max(lo + 1, int(np.searchsorted(cumulative, done + MAX_CANDIDATE_PAIRS, side="right")))
+            result[lo:hi] = self._best_speakers_chunk(q_starts[lo:hi], q_ends[lo:hi])
+            lo = hi
+        return result
+
+    def _best_speakers_chunk(self, q_starts, q_ends):
+        result = np.full(len(q_starts), -1, dtype=np.int32)
+        query_idx, turn_idx = self.candidate_pairs(q_starts, q_ends)
+
+        overlap = (np.minimum(q_ends[query_idx], self.ends[turn_idx])
+                   - np.maximum(q_starts[query_idx], self.starts[turn_idx]))
+        keep = overlap > 0
+        if not keep.any():
+            return result
+        query_idx = query_idx[keep]
+        turn_idx = turn_idx[keep]
+        overlap = overlap[keep]
+
+        # Sum overlap per (query, speaker) pair
+        n_speakers = len(self.labels)
+        keys = query_idx.astype(np.int64) * n_speakers + self.speaker_ids[turn_idx]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=overlap)
+        first_seen = np.full(len(unique_keys), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first_seen, inverse, self.turn_order[turn_idx])
+
+        # Pick the max-overlap speaker per query (earliest turn wins on ties)
+        key_query = unique_keys // n_speakers
+        key_speaker = (unique_keys % n_speakers).astype(np.int32)
+        order = np.lexsort((first_seen, -totals, key_query))
+        sorted_query = key_query[order]
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = sorted_query[1:] != sorted_query[:-1]
+        winners = order[is_first]
+        result[key_query[winners]] = key_speaker[winners]
+        return result
+
+
+def assign_speakers(segments, timeline, unknown_label="Unknown"):
+    """
+    Sets seg['speaker'] on each Whisper segment to the speaker with max total overlap.
+    Segments with zero or negative duration are left untouched.
+    """
+    if not segments:
+        return segments
+
+    if isinstance(segments, SegmentStore):
+        # Columnar transcript: read the time columns and write the speaker column directly
+        best = timeline.best_speakers(segments.starts, segments.ends)
+        rows = np.flatnonzero(segments.ends - segments.starts > 0)
+        # Timeline speaker index -> store speaker id (last entry: unknown)
+        ids = np.array([segments.speaker_id(label) for label in timeline.labels]
+                       + [segments.speaker_id(unknown_label)], dtype=np.int32)
+        segments.set_speaker_ids(rows, ids[best[rows]])
+        return segments
+
+    starts = np.fromiter((s["start"] for s in segments), dtype=np.float64, count=len(segments))
+    ends = np.fromiter((s["end"] for s in segments), dtype=np.float64, count=len(segments))
+    best = timeline.best_speakers(starts, ends)
+
+    valid = ends - starts > 0
+    for i in np.flatnonzero(valid):
+        spk = best[i]
+        segments[i]["speaker"] = timeline.labels[spk] if spk >= 0 else unknown_label
+    return segments
+
+
+def _fill_within_groups(values, groups):
+    """
+    Replaces -1 entries with the nearest earlier valid value from the same group
+    (groups must be contiguous runs, e.g. word -> segment index). Vectorized forward fill.
+    """
+    n = len(values)
+    idx = np.where(values >= 0, np.arange(n), -1)
+    np.maximum.accumulate(idx, out=idx)
+    filled = np.full(n, -1, dtype=values.dtype)
+    ok = idx >= 0
+    ok[ok] = groups[idx[ok]] == groups[ok]
+    filled[ok] = values[idx[ok]]
+    return filled
+
+
+def assign_word_speakers(segments, timeline, unknown_label="Unknown"):
+    """
+    Word-level speaker attribution for segments that carry seg['words']
+    (Whisper word timestamps: {'start', 'end', 'word'}).
+    Every word is joined against the diarization turns in one vectorized pass, then each
+    segment is re-split wherever the speaker changes between consecutive words.
+    Words that overlap no turn take the speaker of the nearest word in the same segment.
+    Segments without words fall back to whole-segment assignment.
+    Returns a new list of segments.
+    """
+    if not segments:
+        return segments
+
+    # Flatten all words into parallel arrays (word -> owning segment)
+    counts = np.fromiter((len(s.get("words") or ()) for s in segments), dtype=np.int64, count=len(segments))
+    n_words = int(counts.sum())
+    if n_words == 0:
+        return assign_speakers(segments, timeline, unknown_label)
+
+    word_seg = np.repeat(np.arange(len(segments)), counts)
+    words = [w for s in segments for w in (s.get("words") or ())]
+    w_starts = np.fromiter((w["start"] for w in words), dtype=np.float64, count=n_words)
+    w_ends = np.fromiter((w["end"] for w in words), dtype=np.float64, count=n_words)
+
+    best = timeline.best_speakers(w_starts, w_ends)
+
+    # Words in gaps between turns: forward fill, then backward fill, inside their segment
+    best = _fill_within_groups(best, word_seg)
+    backward = _fill_within_groups(best[::-1], word_seg[::-1])[::-1]
+    best = np.where(best >= 0, best, backward)
+
+    # Segments whose words overlap nothing at all: whole-segment overlap, else unknown
+    missing = best < 0
+    if missing.any():
+        seg_starts = np.fromiter((s["start"] for s in segments), dtype=np.float64, count=len(segments))
+        seg_ends = np.fromiter((s["end"] for s in segments), dtype=np.float64, count=len(segments))
+        seg_best = timeline.best_speakers(seg_starts, seg_ends)
+        best[missing] = seg_best[word_seg[missing]]
+
+    # Run boundaries: a new run starts at each segment start or speaker change
+    new_run = np.ones(n_words, dtype=bool)
+    new_run[1:] = (word_seg[1:] != word_seg[:-1]) | (best[1:] != best[:-1])
+    run_starts = np.flatnonzero(new_run)
+    run_ends = np.append(run_starts[1:], n_words)
+
+    labels = timeline.labels
+    result = []
+    next_seg = 0
+    for lo, hi in zip(run_starts.tolist(), run_ends.tolist()):
+        seg_index = int(word_seg[lo])
+        # Keep segments that have no words (whole-segment speaker) in order
+        if next_seg < seg_index:
+            result.extend(assign_speakers(segments[next_seg:seg_index], timeline, unknown_label))
+        next_seg = seg_index + 1
+
+        run_words = words[lo:hi]
+        spk = int(best[lo])
+        result.append({
+            "start": run_words[0]["start"],
+            "end": run_words[-1]["end"],
+            "text": "".join(w["word"] for w in run_words).strip(),
+            "speaker": labels[spk] if spk >= 0 else unknown_label,
+            "words": run_words,
+        })
+    if next_seg < len(segments):
+        result.extend(assign_speakers(segments[next_seg:], timeline, unknown_label))
+    return result
+
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Where per-run records are appended (one JSON object per line)
+DEFAULT_TELEMETRY_PATH = "telemetry.jsonl"
+
+_write_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if it can't be read."""
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        # Only Windows has the peak here (psutil's rss elsewhere is the current value,
+        # so fall through to getrusage below)
+        if hasattr(info, "peak_wset"):
+            return info.peak_wset / (1024 * 1024)
+    except Exception:
+        pass
+
+    if os.name == "nt":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize / (1024 * 1024)
+        except Exception:
+            return None
+        return None
+
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except Exception:
+        return None
+
+
+class RunTelemetry:
+    """
+    Collects per-stage wall and CPU time for one process_video run.
+    CPU time is process-wide, so stages that run in parallel (Whisper and Pyannote)
+    each include the other's CPU use for the time they overlap.
+    """
+
+    def __init__(self, video_path, config):
+        self.video_path = video_path
+        self.config = config
+        self.stages = {}
+        self.extra = {}
+        self.audio_duration = None
+        self._lock = threading.Lock()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def stage(self, name):
+        """Times a block: `with telemetry.stage("whisper"): ...` (safe to use from several threads)."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def add_stage(self, name, wall_s, cpu_s=None):
+        with self._lock:
+            self.stages[name] = {
+                "wall_s": round(wall_s, 4),
+                "cpu_s": round(cpu_s, 4) if cpu_s is not None else None,
+            }
+
+    def finish(self):
+        """Builds the final record."""
+        total_wall = time.perf_counter() - self._wall_start
+        peak = peak_rss_mb()
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "video": self.video_path,
+            "audio_duration_s": round(self.audio_duration, 3) if self.audio_duration else None,
+            "total_wall_s": round(total_wall, 4),
+            "total_cpu_s": round(time.process_time() - self._cpu_start, 4),
+            "rtf": round(total_wall / self.audio_duration, 4) if self.audio_duration else None,
+            "peak_rss_mb": round(peak, 1) if peak is not None else None,
+            "stages": dict(self.stages),
+            "config": self.config,
+        }
+        record.update(self.extra)
+        return record
+
+
+def write_record(record, path=None):
+    """Appends one record to the telemetry JSONL file."""
+    path = path or os.getenv("TELEMETRY_PATH", DEFAULT_TELEMETRY_PATH)
+    try:
+        with _write_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Could not write telemetry to {path}: {e}")
+
+
+def format_record(record):
+    """Multi-line human readable summary of a record (for the GUI stats panel)."""
+    lines = []
+    duration = record.get("audio_duration_s")
+    if duration:
+        lines.append(f"Audio: {duration / 60:.1f} min   Wall: {record['total_wall_s']:.1f} s   "
+                     f"RTF: {record['rtf']:.3f}")
+    else:
+        lines.append(f"Wall: {record['total_wall_s']:.1f} s")
+    if record.get("cache_hit"):
+        lines.append("Result cache hit")
+    if record.get("diarization_failed"):
+        lines.append("Diarization failed: no speakers, result not cached")
+    for name, stage in record.get("stages", {}).items():
+        cpu = f"{stage['cpu_s']:.1f} s CPU" if stage.get("cpu_s") is not None else ""
+        lines.append(f"  {name:<16} {stage['wall_s']:8.2f} s   {cpu}")
+    if record.get("peak_rss_mb") is not None:
+        lines.append(f"Peak RSS: {record['peak_rss_mb']:.0f} MB")
+    config = record.get("config", {})
+    lines.append(f"Model: {config.get('model_size')} {config.get('device')}/{config.get('compute_type')}")
+    return "\n".join(lines)
@@ -0,0 +1,154 @@
+import io
+import os
+import subprocess
+import threading
+
+import numpy as np
+from PIL import Image
+
+from audio_decode import no_window_flags
+from result_cache import media_fingerprint
+
+# Thumbnail height in pixels (width follows the video's aspect ratio)
+THUMB_HEIGHT = 90
+
+# At least this many seconds between thumbnails, more for long files (keeps the strip ~600 tiles)
+MIN_INTERVAL_SECONDS = 2.0
+MAX_THUMBNAILS = 600
+
+JPEG_QUALITY = 70
+
+# Bump when the stored format changes
+STRIP_VERSION = 1
+
+
+def default_strip_dir():
+    return os.path.join(os.getcwd(), "cache", "thumbnails")
+
+
+def strip_interval(duration_seconds):
+    return max(MIN_INTERVAL_SECONDS, duration_seconds / MAX_THUMBNAILS)
+
+
+class ThumbnailStrip:
+    """
+    Low-resolution preview frames every `interval` seconds, used while scrubbing.
+    Tiles are kept JPEG-compressed (a few KB each) in one blob with an offset table,
+    both in memory and on disk, and only decoded when shown.
+    """
+
+    def __init__(self, interval, blob, offsets):
+        self.interval = float(interval)
+        self.blob = np.asarray(blob, dtype=np.uint8)
+        self.offsets = np.asarray(offsets, dtype=np.int64)  # len(tiles) + 1
+
+    def __len__(self):
+        return max(0, len(self.offsets) - 1)
+
+    def image_at(self, seconds):
+        """PIL image of the thumbnail nearest to a time (None if the strip is empty)."""
+        if len(self) == 0:
+            return None
+        i = min(max(int(round(seconds / self.interval)), 0), len(self) - 1)
+        data = self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+        return Image.open(io.BytesIO(data))
+
+    @classmethod
+    def from_images(cls, interval, images):
+        chunks = []
+        for image in images:
+            out = io.BytesIO()
+            image.save(out, format="JPEG", quality=JPEG_QUALITY)
+            chunks.append(out.getvalue())
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(c) for c in chunks])
+        blob = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+        return cls(interval, blob, offsets)
+
+    def save(self, path):
+        tmp_path = path + ".tmp.npz"
+        # Tiles are already JPEG, so no compression on top
+        np.savez(tmp_path, version=STRIP_VERSION, interval=self.interval, blob=self.blob, offsets=self.offsets)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data["version"]) != STRIP_VERSION:
+                raise ValueError("old thumbnail strip format")
+            return cls(float(data["interval"]), data["blob"], data["offsets"])
+
+
+def extract_thumbnails(video_path, interval, thumb_width, thumb_height=THUMB_HEIGHT):
+    """
+    One ffmpeg run that decodes keyframes only (-skip_frame nokey) and emits a small RGB
+    frame every `interval` seconds through a pipe. Much faster than a full decode; previews
+    snap to the nearest keyframe, which is fine for scrubbing.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-skip_frame", "nokey",
+        "-i", video_path,
+        "-an", "-sn",
+        "-vf", f"fps=1/{interval:.3f},scale={thumb_width}:{thumb_height}",
+        "-f", "rawvideo", "-pix_fmt", "rgb24",
+        "pipe:1",
+    ]
+    frame_bytes = thumb_width * thumb_height * 3
+    images = []
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            creationflags=no_window_flags())
+    try:
+        while True:
+            data = proc.stdout.read(frame_bytes)
+            if len(data) < frame_bytes:
+                break
+            images.append(Image.frombytes("RGB", (thumb_width, thumb_height), data))
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    return images
+
+
+class ThumbnailCache:
+    """On-disk cache of thumbnail strips (cache/thumbnails/<content hash>_<interval>_<height>.npz)."""
+
+    def __init__(self, strip_dir=None):
+        self.strip_dir = strip_dir or default_strip_dir()
+        self._lock = threading.Lock()
+
+    def get(self, video_path, duration_seconds, frame_width, frame_height, thumb_height=THUMB_HEIGHT):
+        """Returns the strip, generating it on first use (blocking; call from a worker thread)."""
+        interval = strip_interval(duration_seconds)
+        # Even width for the scaler, aspect ratio from the source
+        thumb_width = max(2, int(round(thumb_height * frame_width / max(frame_height, 1) / 2)) * 2)
+
+        os.makedirs(self.strip_dir, exist_ok=True)
+        name = f"{media_fingerprint(video_path)}_{interval:.2f}_{thumb_height}.npz"
+        path = os.path.join(self.strip_dir, name)
+        try:
+            return ThumbnailStrip.load(path)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        print(f"Generating thumbnail strip for {video_path} (every {interval:.1f}s)...")
+        strip = ThumbnailStrip.from_images(interval, extract_thumbnails(video_path, interval, thumb_width, thumb_height))
+        if len(strip):
+            with self._lock:
+                try:
+                    strip.save(path)
+                except OSError as e:
+                    print(f"Could not save thumbnail strip {path}: {e}")
+        return strip
+
+
+_thumbnail_cache = None
+_thumbnail_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    global _thumbnail_cache
+    with _thumbnail_cache_lock:
+        if _thumbnail_cache is None:
+            _thumbnail_cache = ThumbnailCache()
+        return _thumbnail_cache
@@ -1,4 +1,8 @@
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load env vars
@@ -13,23 +17,92 @@ os.environ["HF_HUB_DISABLE_SYMLINKS_WARNING"] = "1"
 os.environ["HF_HUB_DISABLE_SYMLINKS"] = "1" 
 
 import ffmpeg
+import numpy as np
 import torch
 from faster_whisper import WhisperModel
 from pyannote.audio import Pipeline
 
+from audio_decode import SAMPLE_RATE, get_audio_cache, to_waveform_dict
+from checkpoint import TranscriptCheckpoint
+from job_queue import JobCancelled
+from model_registry import PYANNOTE_SIZE_MB, estimate_whisper_mb, get_registry
+from result_cache import get_result_cache, make_cache_key, media_fingerprint
+from sharded_transcribe import auto_shard_count, transcribe_sharded
+from segment_store import SegmentStore
+from speaker_assignment import SpeakerTimeline, assign_speakers, assign_word_speakers
+from telemetry import RunTelemetry, write_record
+
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
+
+# Shared Pyannote pipelines must not run two files at once
+_DIARIZATION_LOCK = threading.Lock()
+
+
+def _load_whisper(model_size, device, compute_type, num_workers=1):
+    # Define local model path
+    local_model_path = os.path.join(os.getcwd(), "models", "whisper")
+    os.makedirs(local_model_path, exist_ok=True)
+    print(f"Model storage: {local_model_path}")
+    
+    # num_workers > 1 lets several threads call transcribe() on the same model in parallel
+    return WhisperModel(model_size, device=device, compute_type=compute_type,
+                        download_root=local_model_path, num_workers=num_workers)
+
+
+def _load_diarization_pipeline(device, auth_token):
+    # Fix for PyTorch 2.6+ security change causing "WeightsUnpickler error"
+    # Pyannote checkpoints use TorchVersion, Specifications, Problem, Resolution which are not in the default safe list
+    try:
+        from pyannote.audio.core.task import Problem, Resolution, Specifications
+        torch.serialization.add_safe_globals([torch.torch_version.TorchVersion, Problem, Resolution, Specifications])
+    except Exception:
+        pass # Ignore if this fails, might be old pytorch or other issue
+
+    pipeline = Pipeline.from_pretrained(
+        DIARIZATION_MODEL,
+        use_auth_token=auth_token  # If None, looks for local cache
+    )
+    if device == "cuda":
+        pipeline.to(torch.device("cuda"))
+    return pipeline
+
+
 class VideoTranscriber:
-    def __init__(self, model_size="medium", use_cuda=True):
+    def __init__(self, model_size="medium", use_cuda=True, registry=None,
+                 beam_size=5, vad_parameters=None, result_cache=None, num_workers=1,
+                 cpu_shards=None, word_timestamps=None):
         self.device = "cuda" if use_cuda and torch.cuda.is_available() else "cpu"
         self.compute_type = "float16" if self.device == "cuda" else "int8"
+        self.model_size = model_size
+        self.beam_size = beam_size
+        # VAD filter settings (prevents hallucinations in silence)
+        self.vad_parameters = vad_parameters or dict(min_silence_duration_ms=500)
         
-        print(f"Loading Whisper Model: {model_size} on {self.device}...")
+        # Word timestamps: speakers are attributed per word and segments re-split at speaker changes
+        if word_timestamps is None:
+            word_timestamps = os.getenv("WORD_TIMESTAMPS", "0") == "1"
+        self.word_timestamps = word_timestamps
         
-        # Define local model path
-        local_model_path = os.path.join(os.getcwd(), "models", "whisper")
-        os.makedirs(local_model_path, exist_ok=True)
-        print(f"Model storage: {local_model_path}")
+        # CPU only: split long files across this many worker processes (int or "auto")
+        self.cpu_shards = cpu_shards if cpu_shards is not None else os.getenv("CPU_SHARDS", "1")
         
-        self.whisper_model = WhisperModel(model_size, device=self.device, compute_type=self.compute_type, download_root=local_model_path)
+        # On-disk cache of finished transcripts (skips the whole run on re-transcribe)
+        self.result_cache = result_cache or get_result_cache()
+        
+        # Models are shared process-wide, so repeated jobs skip the 10-40s reload
+        self.registry = registry or get_registry()
+        
+        # Load timings go into the telemetry record of the next run (near zero on a registry hit)
+        self.model_load_stats = {}
+        
+        print(f"Loading Whisper Model: {model_size} on {self.device}...")
+        load_start = time.perf_counter()
+        self.whisper_model = self.registry.get(
+            ("whisper", model_size, self.device, self.compute_type, num_workers),
+            lambda: _load_whisper(model_size, self.device, self.compute_type, num_workers),
+            size_mb=estimate_whisper_mb(model_size, self.compute_type)
+        )
+        self.model_load_stats["whisper_load"] = time.perf_counter() - load_start
         
         print("Loading Speaker Diarization Model (Pyannote)...")
         # Load token from env
@@ -38,38 +111,40 @@ class VideoTranscriber:
         if not self.auth_token:
             print("No API key found. Attempting to load Pyannote from local offline cache...")
         
+        load_start = time.perf_counter()
         try:
-            # Fix for PyTorch 2.6+ security change causing "WeightsUnpickler error"
-            # Pyannote checkpoints use TorchVersion, Specifications, Problem, Resolution which are not in the default safe list
-            try:
-                from pyannote.audio.core.task import Problem, Resolution, Specifications
-                torch.serialization.add_safe_globals([torch.torch_version.TorchVersion, Problem, Resolution, Specifications])
-            except Exception:
-                pass # Ignore if this fails, might be old pytorch or other issue
-
-            self.diarization_pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-3.1",
-                use_auth_token=self.auth_token  # If None, looks for local cache
+            self.diarization_pipeline = self.registry.get(
+                ("pyannote", DIARIZATION_MODEL, self.device),
+                lambda: _load_diarization_pipeline(self.device, self.auth_token),
+                size_mb=PYANNOTE_SIZE_MB
             )
-            if self.device == "cuda":
-                self.diarization_pipeline.to(torch.device("cuda"))
         except Exception as e:
             print(f"Failed to load Pyannote pipeline: {e}")
             self.diarization_pipeline = None
+        self.model_load_stats["pyannote_load"] = time.perf_counter() - load_start
+        
+        # Telemetry record of the most recent process_video run (shown in the GUI stats panel)
+        self.last_run_stats = None
+            
+        print(self.registry.stats_text())
 
-    def extract_audio(self, video_path, output_wav="temp_audio.wav"):
+    def extract_audio(self, video_path, output_wav=None):
         """
         Extracts mono 16kHz audio from video using FFmpeg.
+        Writes a WAV file (unique temp file unless output_wav is given).
         """
         try:
-            if os.path.exists(output_wav):
+            if output_wav is None:
+                fd, output_wav = tempfile.mkstemp(prefix="transcribe_audio_", suffix=".wav")
+                os.close(fd)
+            elif os.path.exists(output_wav):
                 os.remove(output_wav)
             
             print(f"Extracting audio from {video_path}...")
             (
                 ffmpeg
                 .input(video_path)
-                .output(output_wav, ac=1, ar=16000)
+                .output(output_wav, ac=1, ar=SAMPLE_RATE)
                 .run(quiet=True, overwrite_output=True)
             )
             return output_wav
@@ -77,124 +152,377 @@ class VideoTranscriber:
             print("FFmpeg error:", e.stderr.decode() if e.stderr else str(e))
             raise
 
-    def transcribe(self, audio_path, progress_callback=None):
+    def load_audio(self, video_path):
+        """
+        Decodes mono 16kHz float32 PCM straight into a NumPy buffer (no temp file).
+        The same buffer is fed to both Whisper and Pyannote.
+        Goes through the shared decode cache, so if the video player already decoded
+        this file (or is decoding it right now) we reuse that result.
+        """
+        return get_audio_cache().get(video_path).pcm
+
+    def transcribe(self, audio, progress_callback=None, segment_callback=None, time_offset=0.0,
+                   word_timestamps=None):
         """
         Runs Whisper transcription.
-        Returns list of dicts: {'start': 0.0, 'end': 1.0, 'text': 'foo'}
+        audio: path to an audio file or a 16kHz mono float32 NumPy array.
+        progress_callback(percent) reports this stage only (0-100).
+        segment_callback(segment) is called with each segment as soon as it is decoded.
+        time_offset is added to all timestamps (used when resuming part-way into a file).
+        word_timestamps (default: the transcriber setting) adds 'words': [{'start', 'end', 'word'}].
+        Returns a SegmentStore (columnar; iterates like a list of {'start', 'end', 'text'} dicts).
+        segment_callback still receives a plain dict per segment.
         """
+        if word_timestamps is None:
+            word_timestamps = self.word_timestamps
+        n_shards = self._shard_count(audio)
+        if n_shards > 1:
+            # One int8 model per process, so long files use the whole CPU.
+            # Shards shift by time_offset themselves, so segments are stitched in absolute time.
+            return SegmentStore.from_dicts(transcribe_sharded(
+                audio, n_shards, self.model_size, self.compute_type,
+                self._transcribe_options(word_timestamps), vad_parameters=self.vad_parameters,
+                progress_callback=progress_callback, segment_callback=segment_callback,
+                time_offset=time_offset
+            ))
+        
         print("Transcribing audio...")
         # Enable VAD filter to prevent hallucinations in silence
-        segments, info = self.whisper_model.transcribe(
-            audio_path, 
-            beam_size=5,
-            vad_filter=True,
-            vad_parameters=dict(min_silence_duration_ms=500)
-        )
+        segments, info = self.whisper_model.transcribe(audio, **self._transcribe_options(word_timestamps))
         total_duration = info.duration
         
-        result_segments = []
+        result_segments = SegmentStore()
         for segment in segments:
-            result_segments.append({
-                "start": segment.start,
-                "end": segment.end,
+            item = {
+                "start": segment.start + time_offset,
+                "end": segment.end + time_offset,
                 "text": segment.text.strip()
-            })
+            }
+            if word_timestamps:
+                item["words"] = words_to_dicts(segment.words, time_offset)
+            result_segments.append(item)
+            if segment_callback:
+                segment_callback(item)
             if progress_callback and total_duration > 0:
                 # Calculate progress (0-100)
-                # We allocate 80% to transcription (leaves 20% for diarization)
-                percent = int((segment.end / total_duration) * 80)
-                progress_callback(percent)
+                percent = int((segment.end / total_duration) * 100)
+                progress_callback(min(percent, 100))
                 
         return result_segments
 
-    def diarize(self, audio_path, segments, num_speakers=None, progress_callback=None):
+    def _transcribe_options(self, word_timestamps=False):
+        return dict(beam_size=self.beam_size, vad_filter=True, vad_parameters=self.vad_parameters,
+                    word_timestamps=word_timestamps)
+
+    def _shard_count(self, audio):
+        """Number of worker processes for sharded CPU transcription (1 = not sharded)."""
+        if self.device != "cpu" or not isinstance(audio, np.ndarray) or not self.cpu_shards:
+            return 1
+        if self.cpu_shards == "auto":
+            return auto_shard_count(len(audio) / SAMPLE_RATE)
+        return max(1, int(self.cpu_shards))
+
+    def run_diarization(self, audio, num_speakers=None, progress_callback=None, cancel_event=None):
         """
-        Runs Pyannote.audio pipeline and maps speakers to Whisper segments.
+        Runs the Pyannote.audio pipeline on its own (does not need the transcript).
+        Returns a SpeakerTimeline, or None if diarization is unavailable or failed.
+        Setting cancel_event stops the pipeline at its next step (raises JobCancelled).
         """
         if not self.diarization_pipeline:
             print("Diarization pipeline not loaded. Skipping.")
-            return segments
+            return None
 
         print("Running Pyannote Diarization...")
         
         try:
-            # Run pipeline
+            # In-memory audio is passed as a waveform dict (no re-read from disk)
+            if isinstance(audio, np.ndarray):
+                audio = to_waveform_dict(audio, SAMPLE_RATE)
+            
+            kwargs = {}
             # If num_speakers is provided, use it
             if num_speakers:
-                diarization = self.diarization_pipeline(audio_path, num_speakers=num_speakers)
-            else:
-                diarization = self.diarization_pipeline(audio_path)
+                kwargs["num_speakers"] = num_speakers
+            if progress_callback or cancel_event:
+                kwargs["hook"] = _DiarizationProgressHook(progress_callback, cancel_event)
+            
+            # Run pipeline
+            # The pipeline instance is shared between jobs and is not thread-safe
+            with _DIARIZATION_LOCK:
+                diarization = self.diarization_pipeline(audio, **kwargs)
                 
-            # Convert Pyannote annotation to a list of turns
+            # Convert Pyannote annotation to sorted NumPy arrays of turns
             # turn: (Segment(start, end), track, label)
-            speaker_turns = []
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                speaker_turns.append({
-                    "start": turn.start,
-                    "end": turn.end,
-                    "speaker": speaker
-                })
+            timeline = SpeakerTimeline.from_annotation(diarization)
             
-            print(f"Diarization complete. Found {len(speaker_turns)} speaker turns.")
-            
-            # Map speakers to Whisper segments
-            # Strategy: For each Whisper segment, find which speaker overlaps the most
-            for seg in segments:
-                w_start = seg["start"]
-                w_end = seg["end"]
-                w_duration = w_end - w_start
-                
-                # If segment is too short, just assign closest?
-                if w_duration <= 0:
-                    continue
-                    
-                # Calculate overlap with each speaker
-                speaker_overlaps = {}
-                
-                for turn in speaker_turns:
-                    # Intersection of [w_start, w_end] and [t_start, t_end]
-                    start_overlap = max(w_start, turn["start"])
-                    end_overlap = min(w_end, turn["end"])
-                    overlap_duration = max(0, end_overlap - start_overlap)
-                    
-                    if overlap_duration > 0:
-                        spk = turn["speaker"]
-                        if spk not in speaker_overlaps:
-                            speaker_overlaps[spk] = 0
-                        speaker_overlaps[spk] += overlap_duration
-                
-                # Find speaker with max overlap
-                if speaker_overlaps:
-                    best_speaker = max(speaker_overlaps, key=speaker_overlaps.get)
-                    seg["speaker"] = best_speaker
-                else:
-                    seg["speaker"] = "Unknown"
-                    
-            return segments
+            print(f"Diarization complete. Found {len(timeline)} speaker turns.")
+            return timeline
             
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Diarization failed: {e}")
             import traceback
             traceback.print_exc()
-            return segments
+            return None
+
+    def diarize(self, audio, segments, num_speakers=None, progress_callback=None):
+        """
+        Runs Pyannote.audio pipeline and maps speakers to Whisper segments.
+        audio: path to an audio file or a 16kHz mono float32 NumPy array.
+        """
+        timeline = self.run_diarization(audio, num_speakers=num_speakers, progress_callback=progress_callback)
+        if timeline is not None:
+            segments = self.map_speakers(segments, timeline)
+        return segments
+
+    def map_speakers(self, segments, timeline):
+        """
+        Map speakers to Whisper segments.
+        Strategy: For each Whisper segment, find which speaker overlaps the most
+        (sweep over sorted turns instead of comparing every segment with every turn).
+        With word timestamps each word gets its own speaker and segments are split
+        where the speaker changes (returns a new SegmentStore).
+        """
+        if self.word_timestamps:
+            return SegmentStore.from_dicts(assign_word_speakers(segments, timeline))
+        return assign_speakers(segments, timeline)
 
-    def process_video(self, video_path, num_speakers=None, progress_callback=None):
-        # NOTE: We extract to .wav because AI models cannot read .mp4 video files directly.
-        # They need pure audio data. This temporary file is deleted after processing.
-        wav_path = self.extract_audio(video_path)
+    def cache_config(self, num_speakers=None):
+        """Settings that change the transcript; part of the result cache key."""
+        return {
+            "model_size": self.model_size,
+            "compute_type": self.compute_type,
+            "beam_size": self.beam_size,
+            "vad_parameters": self.vad_parameters,
+            "word_timestamps": self.word_timestamps,
+            "num_speakers": num_speakers,
+            "diarization": DIARIZATION_MODEL if self.diarization_pipeline else None,
+        }
+
+    def process_video(self, video_path, num_speakers=None, progress_callback=None, in_memory=True,
+                      stage_callback=None, use_cache=True, segment_callback=None, resume=True,
+                      cancel_event=None):
+        """
+        Full pipeline: audio extraction, then Whisper and Pyannote in parallel, then speaker mapping.
+        progress_callback(percent) gets overall progress (average of both stages).
+        stage_callback(stage, percent) gets per-stage progress ("transcription" / "diarization").
+        segment_callback(segment) streams segments as Whisper produces them (no speaker yet).
+        Results are cached on disk by media content hash + settings; a hit returns immediately.
+        With resume=True, completed segments are checkpointed to a sidecar file and a restarted
+        job only transcribes the audio after the last checkpoint.
+        Each run appends a per-stage timing record to the telemetry JSONL file.
+        Setting cancel_event (a threading.Event) stops the job between segments and raises
+        JobCancelled; the checkpoint is kept, so queuing the file again resumes it.
+        """
+        telemetry = RunTelemetry(video_path, self.telemetry_config(num_speakers))
+        # Model loading happened in __init__; report it with the first run of this transcriber
+        for name, seconds in self.model_load_stats.items():
+            telemetry.add_stage(name, seconds)
+        self.model_load_stats = {}
         
-        segments = self.transcribe(wav_path, progress_callback)
+        try:
+            result = self._process_video(
+                telemetry, video_path, num_speakers, progress_callback, in_memory,
+                stage_callback, use_cache, segment_callback, resume, cancel_event
+            )
+            telemetry.extra["status"] = "ok"
+            telemetry.extra["segments"] = len(result)
+            return result
+        except JobCancelled:
+            telemetry.extra["status"] = "cancelled"
+            raise
+        except Exception:
+            telemetry.extra["status"] = "error"
+            raise
+        finally:
+            if in_memory:
+                # Free the decoded PCM (kept only while a WAV-backend player shares it)
+                get_audio_cache().release(video_path)
+            self.last_run_stats = telemetry.finish()
+            write_record(self.last_run_stats)
+
+    def telemetry_config(self, num_speakers=None):
+        """Model/config identifiers stored with each telemetry record."""
+        config = self.cache_config(num_speakers)
+        config.update({"device": self.device, "cpu_shards": self.cpu_shards})
+        return config
+
+    def _process_video(self, telemetry, video_path, num_speakers, progress_callback, in_memory,
+                       stage_callback, use_cache, segment_callback, resume, cancel_event=None):
+        def check_cancelled():
+            if cancel_event is not None and cancel_event.is_set():
+                raise JobCancelled()
         
-        if progress_callback:
-            progress_callback(80) # Transcription done, starting diarization
-            
-        final_data = self.diarize(wav_path, segments, num_speakers=num_speakers, progress_callback=progress_callback)
+        cache_key = None
+        with telemetry.stage("cache_lookup"):
+            if (use_cache and self.result_cache) or resume:
+                cache_key = make_cache_key(media_fingerprint(video_path), self.cache_config(num_speakers))
+            cached = self.result_cache.get(cache_key) if use_cache and self.result_cache else None
+        if cached is not None:
+            print(f"Transcript cache hit for {video_path}")
+            telemetry.extra["cache_hit"] = True
+            if progress_callback:
+                progress_callback(100)
+            return SegmentStore.from_dicts(cached)
+        telemetry.extra["cache_hit"] = False
         
-        if progress_callback:
-            progress_callback(100)
+        # NOTE: AI models cannot read .mp4 video files directly, they need pure audio data.
+        # By default we decode straight into memory; in_memory=False falls back to a temp .wav
+        # file which is deleted after processing.
+        with telemetry.stage("audio_extract"):
+            if in_memory:
+                audio = self.load_audio(video_path)
+                wav_path = None
+                telemetry.audio_duration = len(audio) / SAMPLE_RATE
+            else:
+                audio = wav_path = self.extract_audio(video_path)
+        check_cancelled()
+        
+        progress = _StageProgress(["transcription", "diarization"], progress_callback, stage_callback)
+        
+        # Resume from a previous run's checkpoint (in-memory audio can be sliced at the offset)
+        checkpoint = None
+        resumed_segments = []
+        whisper_audio = audio
+        time_offset = 0.0
+        if resume:
+            checkpoint = TranscriptCheckpoint(video_path, cache_key)
+            if in_memory and checkpoint.load():
+                resumed_segments = [dict(seg) for seg in checkpoint.segments]
+                time_offset = checkpoint.audio_offset
+                whisper_audio = audio[int(time_offset * SAMPLE_RATE):]
+                print(f"Resuming from checkpoint at {time_offset:.1f}s ({len(resumed_segments)} segments)")
+                if segment_callback:
+                    for seg in resumed_segments:
+                        segment_callback(seg)
+            else:
+                checkpoint.segments = []
+                checkpoint.audio_offset = 0.0
         
-        # Cleanup
-        if os.path.exists(wav_path):
-            os.remove(wav_path)
+        def on_segment(seg):
+            # Cooperative cancellation: Whisper is a generator, so raising here stops decoding
+            check_cancelled()
+            if checkpoint:
+                checkpoint.add(seg)
+            if segment_callback:
+                segment_callback(seg)
+        
+        try:
+            # Diarization only needs the audio, so run it on a second thread while Whisper decodes.
+            # Both ctranslate2 and torch release the GIL during inference.
+            # (Diarization always covers the whole file; only Whisper work is resumable.)
+            def timed_diarization():
+                with telemetry.stage("diarization"):
+                    return self.run_diarization(audio, num_speakers, progress.callback_for("diarization"),
+                                                cancel_event=cancel_event)
+            
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarization") as pool:
+                diarization_future = pool.submit(timed_diarization)
+                with telemetry.stage("whisper"):
+                    segments = SegmentStore.from_dicts(resumed_segments)
+                    segments.extend(self.transcribe(
+                        whisper_audio, progress.callback_for("transcription"),
+                        segment_callback=on_segment, time_offset=time_offset
+                    ))
+                progress.update("transcription", 100)
+                if checkpoint:
+                    checkpoint.save()
+                
+                timeline = diarization_future.result()
+                progress.update("diarization", 100)
+            check_cancelled()
+            
+            # Merge once both stages are done
+            with telemetry.stage("speaker_mapping"):
+                if timeline is not None:
+                    segments = self.map_speakers(segments, timeline)
+            final_data = segments
+            
+            # The cache key says diarization ran; a speakerless result from a failed
+            # (possibly transient) diarization must not be served for it later
+            diarization_failed = timeline is None and self.diarization_pipeline is not None
+            telemetry.extra["diarization_failed"] = diarization_failed
+            if diarization_failed:
+                print("Diarization failed: returning the transcript without speakers (not cached)")
+            elif use_cache and self.result_cache:
+                with telemetry.stage("cache_store"):
+                    self.result_cache.put(cache_key, final_data, meta={"source": os.path.basename(video_path)})
+            # Kept after a failed diarization, so a re-run only repeats that stage
+            if checkpoint and not diarization_failed:
+                checkpoint.remove()
+        except JobCancelled:
+            # Keep what was transcribed so far; the next run resumes from here
+            if checkpoint:
+                checkpoint.save()
+            print(f"Transcription cancelled: {video_path}")
+            raise
+        finally:
+            # Cleanup
+            if wav_path and os.path.exists(wav_path):
+                os.remove(wav_path)
             
         return final_data
+
+
+def words_to_dicts(words, time_offset=0.0):
+    """faster-whisper Word objects -> [{'start', 'end', 'word'}] (word text keeps its leading space)."""
+    return [
+        {"start": w.start + time_offset, "end": w.end + time_offset, "word": w.word}
+        for w in (words or ())
+    ]
+
+
+class _StageProgress:
+    """Tracks progress of stages running in parallel and reports overall + per-stage values."""
+
+    def __init__(self, stages, progress_callback=None, stage_callback=None):
+        self.percents = {stage: 0 for stage in stages}
+        self.progress_callback = progress_callback
+        self.stage_callback = stage_callback
+        self._lock = threading.Lock()
+
+    def update(self, stage, percent):
+        with self._lock:
+            if percent <= self.percents[stage]:
+                return
+            self.percents[stage] = percent
+            overall = int(sum(self.percents.values()) / len(self.percents))
+        if self.stage_callback:
+            self.stage_callback(stage, percent)
+        if self.progress_callback:
+            self.progress_callback(overall)
+
+    def callback_for(self, stage):
+        return lambda percent: self.update(stage, percent)
+
+
+class _DiarizationProgressHook:
+    """
+    Pyannote pipeline hook that turns step callbacks into a 0-100 progress value.
+    Segmentation and embeddings report (completed, total); the other steps are quick.
+    """
+    # (start, end) percent range per pipeline step
+    STEP_RANGES = {
+        "segmentation": (0, 30),
+        "speaker_counting": (30, 35),
+        "embeddings": (35, 95),
+        "discrete_diarization": (95, 100),
+    }
+
+    def __init__(self, progress_callback=None, cancel_event=None):
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+
+    def __call__(self, step_name, step_artifact, file=None, total=None, completed=None):
+        # Raising from the hook aborts the pipeline (checked after every batch)
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise JobCancelled()
+        if not self.progress_callback:
+            return
+        low, high = self.STEP_RANGES.get(step_name, (0, 0))
+        if total and completed is not None:
+            percent = low + (high - low) * completed / total
+        else:
+            percent = high
+        self.progress_callback(int(percent))
@@ -0,0 +1,324 @@
+import bisect
+
+# Segments materialized in the Text widget at a time (the screen shows ~10-30)
+WINDOW_SEGMENTS = 240
+
+# Re-render the window when the view gets this close to one of its edges
+MARGIN_SEGMENTS = 60
+
+
+class VirtualTranscriptView:
+    """
+    Renders a transcript into a Tk Text widget, but only materializes a window of
+    segments around what is on screen. Scrolling near the edge of the window re-renders it
+    around the new position, so widget memory and render cost stay the same for a 500 or a
+    50,000 segment transcript.
+    A separate scrollbar shows the position in the whole transcript (the Text widget's own
+    yview only knows about the window). Text positions are mapped back to segments through
+    the window's line table, so no per-segment tags are needed.
+
+    format_segment(item) -> (timestamp_str, speaker_name, speaker_tag, text) supplies the
+    display strings; it is called only for segments that get materialized.
+    """
+
+    def __init__(self, text, format_segment, scrollbar=None, speaker_colors=(),
+                 window=WINDOW_SEGMENTS, margin=MARGIN_SEGMENTS):
+        # CTkTextbox wraps a tk.Text; talk to the inner widget directly (multi-part insert)
+        self.text = getattr(text, "_textbox", text)
+        self.format_segment = format_segment
+        self.scrollbar = scrollbar
+        self.speaker_colors = list(speaker_colors)
+        self.window = window
+        self.margin = min(margin, window // 4)
+
+        self.segments = []
+        self.first = 0          # index of the first materialized segment
+        self.line_starts = []   # text line of each materialized segment
+        self.line_ends = []     # last line of each (its blank separator line)
+        self.ts_lengths = []    # characters of "[mm:ss]" per materialized segment
+        self.highlighted = -1
+        self._highlight_range = None
+        self.search_hit = -1
+        self._search_range = None
+        self._hover_range = None
+        self._rendered_len = 0
+        self._rendering = False
+        self._recenter_pending = False
+
+        self.text.configure(yscrollcommand=self._on_text_scrolled)
+        if scrollbar is not None:
+            scrollbar.configure(command=self._on_scrollbar)
+        self.configure_tags()
+
+    @property
+    def last(self):
+        """One past the last materialized segment."""
+        return self.first + len(self.line_starts)
+
+    # ----- Content -----
+
+    def configure_tags(self):
+        """Configure text tags for styling."""
+        # Timestamps styled to look clickable (cyan, underlined)
+        self.text.tag_config("timestamp", foreground="#4fc3f7", underline=True)
+        self.text.tag_config("timestamp_hover", foreground="#ffeb3b")
+        for i, color in enumerate(self.speaker_colors):
+            self.text.tag_config(f"speaker_{i}", foreground=color)
+        self.text.tag_config("speaker_pending", foreground="#9e9e9e")
+        self.text.tag_config("text", foreground="#ffffff")
+        self.text.tag_config("following_highlight", background="#3a3a3a")
+        self.text.tag_config("search_hit", background="#5d4a1f")
+
+    def update(self, segments):
+        """
+        Shows `segments`. If it is the list already shown and it only grew (streaming),
+        new segments are added while the window still has room; otherwise re-renders.
+        """
+        if segments is self.segments and len(segments) >= self._rendered_len and self.line_starts:
+            self._rendered_len = len(segments)
+            end = min(len(segments), self.first + self.window)
+            if end > self.last:
+                self._set_state("normal")
+                self._insert_range(self.last, end)
+                self._set_state("disabled")
+            self._update_scrollbar()
+            return
+        self.render(segments, keep_position=segments is self.segments)
+
+    def render(self, segments=None, keep_position=True):
+        """Re-renders the window (new transcript, renamed speakers, speakers arrived)."""
+        if segments is not None:
+            self.segments = segments
+        top = self.top_segment() if keep_position and self.line_starts else 0
+        top = max(0, min(top, len(self.segments) - 1))
+        self._materialize(self._window_start_for(top), top)
+
+    def show_message(self, message):
+        """Replaces the transcript with a status message (e.g. 'Transcribing...')."""
+        self.segments = []
+        self._rendered_len = 0
+        self.first = 0
+        self._clear_lines()
+        self.highlighted = -1
+        self._highlight_range = None
+        self.search_hit = -1
+        self._search_range = None
+        self._hover_range = None
+        self._set_state("normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", message)
+        self._set_state("disabled")
+        self._update_scrollbar()
+
+    def _window_start_for(self, segment_index):
+        """Window start that puts segment_index a third of the way down the window."""
+        start = segment_index - self.window // 3
+        return max(0, min(start, len(self.segments) - self.window))
+
+    def _materialize(self, start, top_segment=None):
+        self._rendering = True
+        try:
+            self._set_state("normal")
+            self.text.delete("1.0", "end")
+            self._clear_lines()
+            self._highlight_range = None
+            self._search_range = None
+            self._hover_range = None
+            self.first = start
+            self._rendered_len = len(self.segments)
+            self._insert_range(start, min(len(self.segments), start + self.window))
+            self._set_state("disabled")
+
+            if top_segment is not None and self.first <= top_segment < self.last:
+                self.text.yview(f"{self.line_starts[top_segment - self.first]}.0")
+            if self.first <= self.highlighted < self.last:
+                self._apply_highlight(self.highlighted)
+            if self.first <= self.search_hit < self.last:
+                self._apply_search_hit(self.search_hit)
+        finally:
+            self._rendering = False
+        self._update_scrollbar()
+
+    def _insert_range(self, start, end):
+        """Appends segments [start, end) with one Tk insert call for the whole range."""
+        if start >= end:
+            return
+        line = int(self.text.index("end-1c").split('.')[0])
+        args = []
+        for item in self.segments[start:end]:
+            timestamp_str, display_name, speaker_tag, text_content = self.format_segment(item)
+            ts = f"[{timestamp_str}]"
+            args += [ts, "timestamp", f" {display_name}: ", speaker_tag, f"{text_content}\n\n", "text"]
+
+            # Segment spans its own line(s) plus the blank separator line
+            last_line = line + text_content.count("\n") + 1
+            self.line_starts.append(line)
+            self.line_ends.append(last_line)
+            self.ts_lengths.append(len(ts))
+            line = last_line + 1
+        self.text.insert("end", *args)
+
+    def _clear_lines(self):
+        self.line_starts = []
+        self.line_ends = []
+        self.ts_lengths = []
+
+    def _set_state(self, state):
+        self.text.configure(state=state)
+
+    # ----- Position mapping -----
+
+    def segment_at(self, text_index):
+        """Segment index for a Text index like '12.4' (or @x,y), -1 outside any segment."""
+        line, col = (int(part) for part in self.text.index(text_index).split('.'))
+        local = bisect.bisect_right(self.line_starts, line) - 1
+        if local < 0 or line > self.line_ends[local]:
+            return -1
+        return self.first + local
+
+    def timestamp_at(self, x, y):
+        """Segment index if (x, y) is over a segment's timestamp, else -1."""
+        line, col = (int(part) for part in self.text.index(f"@{x},{y}").split('.'))
+        local = bisect.bisect_right(self.line_starts, line) - 1
+        if local < 0 or line != self.line_starts[local] or col >= self.ts_lengths[local]:
+            return -1
+        return self.first + local
+
+    def top_segment(self):
+        """First segment visible at the top of the widget."""
+        if not self.line_starts:
+            return self.first
+        index = self.segment_at("@0,0")
+        if index >= 0:
+            return index
+        line = int(self.text.index("@0,0").split('.')[0])
+        return self.first + max(0, bisect.bisect_right(self.line_starts, line) - 1)
+
+    # ----- Hover / highlight -----
+
+    def set_hover(self, segment_index):
+        """Highlights the timestamp under the mouse (-1 clears)."""
+        if self._hover_range:
+            self.text.tag_remove("timestamp_hover", *self._hover_range)
+            self._hover_range = None
+        if self.first <= segment_index < self.last:
+            local = segment_index - self.first
+            line = self.line_starts[local]
+            self._hover_range = (f"{line}.0", f"{line}.{self.ts_lengths[local]}")
+            self.text.tag_add("timestamp_hover", *self._hover_range)
+
+    def highlight(self, segment_index, center=True):
+        """Following-mode highlight; brings the segment into the window and centers it."""
+        self.clear_highlight()
+        self.highlighted = segment_index
+        if not 0 <= segment_index < len(self.segments):
+            return
+        if not (self.first <= segment_index < self.last) or self._near_edge(segment_index, segment_index):
+            self._materialize(self._window_start_for(segment_index))
+        self._apply_highlight(segment_index)
+        if center:
+            self.center_on(segment_index)
+
+    def clear_highlight(self):
+        if self._highlight_range:
+            self.text.tag_remove("following_highlight", *self._highlight_range)
+        self._highlight_range = None
+        self.highlighted = -1
+
+    def _apply_highlight(self, segment_index):
+        local = segment_index - self.first
+        self._highlight_range = (f"{self.line_starts[local]}.0", f"{self.line_ends[local]}.end")
+        self.text.tag_add("following_highlight", *self._highlight_range)
+
+    def show_search_hit(self, segment_index):
+        """Marks a search result and centers it (materializing the window around it)."""
+        self.clear_search_hit()
+        if not 0 <= segment_index < len(self.segments):
+            return
+        self.search_hit = segment_index
+        if not (self.first <= segment_index < self.last) or self._near_edge(segment_index, segment_index):
+            self._materialize(self._window_start_for(segment_index))
+        else:
+            self._apply_search_hit(segment_index)
+        self.center_on(segment_index)
+
+    def clear_search_hit(self):
+        if self._search_range:
+            self.text.tag_remove("search_hit", *self._search_range)
+        self._search_range = None
+        self.search_hit = -1
+
+    def _apply_search_hit(self, segment_index):
+        local = segment_index - self.first
+        self._search_range = (f"{self.line_starts[local]}.0", f"{self.line_ends[local]}.end")
+        self.text.tag_add("search_hit", *self._search_range)
+
+    def scroll_to(self, segment_index):
+        """Puts a segment at the top of the view (materializing the window around it)."""
+        if not 0 <= segment_index < len(self.segments):
+            return
+        if not (self.first <= segment_index < self.last) or self._near_edge(segment_index, segment_index):
+            self._materialize(self._window_start_for(segment_index), segment_index)
+        else:
+            self.text.yview(f"{self.line_starts[segment_index - self.first]}.0")
+
+    def center_on(self, segment_index):
+        if not self.first <= segment_index < self.last:
+            return
+        line = self.line_starts[segment_index - self.first]
+        # Get total number of lines in the widget
+        total_lines = int(self.text.index('end-1c').split('.')[0])
+        # Calculate visible height as fraction of total
+        top, bottom = self.text.yview()
+        # We want the line to be in the middle of the visible area
+        self.text.yview_moveto(max(0, line / max(total_lines, 1) - (bottom - top) / 2))
+
+    # ----- Scrolling -----
+
+    def _near_edge(self, top, bottom):
+        """True if [top, bottom] is within the margin of a window edge that has more segments beyond it."""
+        near_start = self.first > 0 and top - self.first < self.margin
+        near_end = self.last < len(self.segments) and self.last - bottom < self.margin
+        return near_start or near_end
+
+    def _on_text_scrolled(self, lo, hi):
+        """yscrollcommand of the Text widget: update the virtual scrollbar, re-window if needed."""
+        self._update_scrollbar()
+        if self._rendering or self._recenter_pending or not self.line_starts:
+            return
+        top = self.top_segment()
+        bottom = self.segment_at(f"@0,{self.text.winfo_height()}")
+        if bottom < 0:
+            bottom = self.last - 1
+        if self._near_edge(top, bottom):
+            # Not from inside the Tk callback: the widget is still mid-scroll
+            self._recenter_pending = True
+            self.text.after_idle(self._recenter)
+
+    def _recenter(self):
+        self._recenter_pending = False
+        if self.line_starts:
+            top = self.top_segment()
+            self._materialize(self._window_start_for(top), top)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """Virtual scrollbar: 'moveto' jumps anywhere in the transcript, 'scroll' scrolls the Text."""
+        if action == "moveto":
+            if not self.segments:
+                return
+            target = int(float(value) * len(self.segments))
+            self.scroll_to(max(0, min(target, len(self.segments) - 1)))
+        elif action == "scroll":
+            self.text.yview_scroll(int(value), unit or "units")
+
+    def _update_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        total = len(self.segments)
+        if total == 0 or not self.line_starts:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        # Position within the window, scaled to the whole transcript by segment count
+        lo, hi = self.text.yview()
+        count = len(self.line_starts)
+        self.scrollbar.set((self.first + lo * count) / total, (self.first + hi * count) / total)
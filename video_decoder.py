@@ -0,0 +1,224 @@
+import threading
+from collections import deque
+
+import cv2
+from PIL import Image
+
+# Decoded frames kept ahead of the playback position
+PREFETCH_FRAMES = 12
+
+# If the decoder falls this far behind the clock it seeks instead of skipping frame by frame
+MAX_SKIP_SECONDS = 2.0
+
+# Keyframe snap: frames grabbed forward after a seek to reach the exact target
+# (only without a keyframe index; with one we know exactly how many frames to decode)
+MAX_SEEK_GRAB = 300
+
+
+class FrameDecoder:
+    """
+    Decodes a video on a background thread into a bounded ring buffer of RGB frames that
+    are already scaled to the display size, so the Tk thread only has to blit them.
+    The player publishes its clock (the frame that should be on screen now, driven by the
+    audio position). Frames behind the clock are skipped with grab() (no decode, no colour
+    conversion), and if the decoder falls far behind it seeks ahead instead.
+    The VideoCapture is only ever touched by the decoder thread.
+    Seeks use the file's keyframe index (see keyframe_index.py) once it is available.
+    """
+
+    def __init__(self, video_path, target_size=None, prefetch=PREFETCH_FRAMES, use_keyframe_index=True):
+        self.video_path = video_path
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Cannot open video: {video_path}")
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.prefetch = prefetch
+
+        self.buffer = deque()  # (frame_index, PIL image), oldest first
+        self.eof = False
+        self.keyframe_index = None
+
+        self._cond = threading.Condition()
+        self._target_size = target_size
+        self._next_index = 0   # index of the frame the next cap.read() returns
+        self._clock = 0        # frame the player wants on screen now
+        self._seek_to = 0      # pending seek request (start by decoding frame 0)
+        self._generation = 0   # bumped on every seek; frames from older generations are dropped
+        self._playing = False
+        self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="video-decoder", daemon=True)
+        self._thread.start()
+
+        if use_keyframe_index:
+            # ffprobe pass (or disk cache hit) in the background; seeks fall back until it is ready
+            threading.Thread(target=self._load_keyframe_index, name="keyframe-index", daemon=True).start()
+
+    def _load_keyframe_index(self):
+        try:
+            from keyframe_index import get_keyframe_cache
+            index = get_keyframe_cache().get(self.video_path)
+            if len(index) > 0:
+                self.keyframe_index = index
+        except Exception as e:
+            print(f"Keyframe index unavailable for {self.video_path}: {e}")
+
+    # ----- Player side (Tk thread) -----
+
+    def seek(self, frame_index):
+        """Drops the buffer and restarts decoding at frame_index (returns immediately)."""
+        frame_index = max(0, min(int(frame_index), max(self.total_frames - 1, 0)))
+        with self._cond:
+            self._generation += 1
+            self.buffer.clear()
+            self._seek_to = frame_index
+            self._clock = frame_index
+            self.eof = False
+            self._cond.notify_all()
+
+    def set_clock(self, frame_index):
+        with self._cond:
+            self._clock = frame_index
+            self._cond.notify_all()
+
+    def set_playing(self, playing):
+        with self._cond:
+            self._playing = playing
+            self._cond.notify_all()
+
+    def set_target_size(self, size):
+        """(width, height) box frames are scaled into; None keeps the source size."""
+        with self._cond:
+            self._target_size = size
+
+    def take(self, frame_index, allow_ahead=False):
+        """
+        Returns the newest buffered (index, image) at or before frame_index and discards the
+        older ones (late frames are dropped, not shown). With allow_ahead, the first buffered
+        frame is returned even if it is past frame_index (used after a seek while paused).
+        Returns None if nothing is due yet.
+        """
+        with self._cond:
+            item = None
+            while self.buffer and self.buffer[0][0] <= frame_index:
+                item = self.buffer.popleft()
+            if item is None and allow_ahead and self.buffer:
+                item = self.buffer.popleft()
+            if item is not None:
+                self._cond.notify_all()
+            return item
+
+    def finished(self):
+        """True once the last frame was decoded and shown."""
+        with self._cond:
+            return self.eof and not self.buffer
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self.buffer.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    # ----- Decoder thread -----
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while self._running and self._seek_to is None and (
+                            self.eof or len(self.buffer) >= self.prefetch):
+                        self._cond.wait()
+                    if not self._running:
+                        return
+                    seek_to, self._seek_to = self._seek_to, None
+                    generation = self._generation
+                    clock = self._clock
+                    playing = self._playing
+                    target_size = self._target_size
+
+                if seek_to is not None:
+                    self._seek(seek_to)
+                elif playing:
+                    lag = clock - self._next_index
+                    if lag > MAX_SKIP_SECONDS * self.fps:
+                        # Far behind (slow machine, heavy file): jump instead of grabbing every frame.
+                        # Landing on the next keyframe (if close) needs no extra decoding at all.
+                        target = clock
+                        index = self.keyframe_index
+                        if index is not None:
+                            keyframe = index.keyframe_after(clock)
+                            if keyframe is not None and keyframe - clock < self.fps:
+                                target = keyframe
+                        self._seek(target)
+                    elif lag > 0:
+                        # Frame is already late: skip it without decoding the pixels
+                        if not self.cap.grab():
+                            self._set_eof(generation)
+                            continue
+                        self._next_index += 1
+                        continue
+
+                ok, frame = self.cap.read()
+                if not ok:
+                    self._set_eof(generation)
+                    continue
+                index = self._next_index
+                self._next_index += 1
+                image = self._convert(frame, target_size)
+
+                with self._cond:
+                    # A seek arrived while we were decoding: this frame belongs to the old position
+                    if generation == self._generation:
+                        self.buffer.append((index, image))
+                        self._cond.notify_all()
+        except Exception as e:
+            print(f"Video decoder error: {e}")
+        finally:
+            self.cap.release()
+
+    def _seek(self, target):
+        index = self.keyframe_index
+        if index is not None:
+            # Jump to the last keyframe before the target (or just decode forward if we are
+            # already inside that GOP) and decode only the frames in between
+            seek_to, max_grab = index.seek_plan(self._next_index, target)
+            if seek_to is not None:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, seek_to)
+                actual = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            else:
+                actual = self._next_index
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            # PRECISION SEEK: Check where we actually landed
+            actual = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            max_grab = MAX_SEEK_GRAB
+        # If we landed before the target (keyframe snap), forward to it without converting pixels
+        if actual < target:
+            for _ in range(min(target - actual, max_grab)):
+                if not self.cap.grab():
+                    break
+                actual += 1
+        self._next_index = actual
+
+    def _set_eof(self, generation):
+        with self._cond:
+            if generation == self._generation:
+                self.eof = True
+                self._cond.notify_all()
+
+    @staticmethod
+    def _convert(frame, target_size):
+        """BGR frame -> PIL RGB image scaled to fit target_size (resize first: fewer pixels to convert)."""
+        if target_size:
+            box_w, box_h = target_size
+            h, w = frame.shape[:2]
+            scale = min(box_w / w, box_h / h)
+            if scale != 1.0:
+                new_w, new_h = max(1, int(w * scale)), max(1, int(h * scale))
+                interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+                frame = cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+        return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))